@@ -1,14 +1,50 @@
 import os
-from flask import Flask
+import sys
+import threading
+from flask import Flask, jsonify
 from flask_cors import CORS
 
-from routes.router import resume_bp
+from routes.router import metrics_bp, resume_bp
+from job_worker import JOB_WORKERS, JobWorkerPool
+from models.resume import init_database
 
 app = Flask(__name__)
 CORS(app)
 app.config['UPLOAD_FOLDER'] = os.path.abspath(os.path.join(os.path.dirname(__file__), 'pdfs'))
+# Upload job workers run by each API process; 0 when `python job_worker.py` drains the queue instead
+app.config['JOB_WORKERS'] = JOB_WORKERS
 
 app.register_blueprint(resume_bp)
+app.register_blueprint(metrics_bp)
+
+_started = False
+_start_lock = threading.Lock()
+
+
+def start_background():
+    """
+    Migrate the schema and start the upload job workers, once per process.
+    Returns False when the database could not be initialized (retried on the next call).
+    """
+    global _started
+    with _start_lock:
+        if not _started:
+            if not init_database():
+                return False
+            if app.config['JOB_WORKERS'] > 0:
+                JobWorkerPool(workers=app.config['JOB_WORKERS']).start()
+            _started = True
+    return True
+
+
+@app.before_request
+def _ensure_background():
+    # Started by the first request of the serving process, so it works under `python app.py`,
+    # `flask run` (with or without reloader) and WSGI servers alike; the reloader's parent
+    # process serves no request and never starts workers
+    if not _started and not start_background():
+        return jsonify({"status": "error", "message": "Database initialization failed"}), 503
+    return None
 
 
 # @app.route("/")
@@ -17,6 +53,8 @@ app.register_blueprint(resume_bp)
 
 
 if __name__ == "__main__":
+    # Don't wait for the first request to drain jobs queued before a restart;
+    # with the debug reloader only the serving child process does this
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true" and not start_background():
+        sys.exit("database initialization failed, see the log above")
     app.run(debug=True)
-
-
@@ -0,0 +1,102 @@
+"""
+Time city extraction as the gazetteer grows: the former per-candidate
+process.extractOne loop against the CityGazetteer (hash index, then direct
+extractOne calls below direct_max_pairs comparisons or batched cdist above),
+plus the cdist path forced at every size to show where the switch pays off.
+Documents contain no exact city name, so every run takes the fuzzy path.
+
+Usage (from backend/):
+    python benchmarks/bench_city_gazetteer.py [--sizes 40 2000 20000] [--docs 10]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+from rapidfuzz import process
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'parser')))
+from utils.gazetteer import CityGazetteer, normalize_place
+from utils.resources import get_helper
+
+helper = get_helper()
+
+
+def synthetic_cities(rng, size):
+    cities = [c.lower() for c in helper.cities]
+    syllables = "ka lo mi ne ra to su vi ze po da fe gu hi ou al".split()
+    while len(cities) < size:
+        words = ["".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(1, 2))]
+        cities.append(" ".join(words))
+    return cities
+
+
+def synthetic_text(rng, cities, words=300):
+    filler = "developed maintained software team project data pipeline with using tools and the of".split()
+    tokens = [rng.choice(filler) for _ in range(words)]
+    # A misspelled city somewhere in the text
+    city = list(rng.choice(cities))
+    city[rng.randrange(len(city))] = "x"
+    tokens.insert(rng.randrange(len(tokens)), "".join(city))
+    return " ".join(tokens)
+
+
+def candidates_of(text):
+    words = normalize_place(text).split()
+    candidates = []
+    for i in range(len(words)):
+        candidates.append(words[i].strip(",.;:()"))
+        if i + 1 < len(words):
+            candidates.append(f"{words[i]} {words[i+1]}".strip(",.;:()"))
+    return list(dict.fromkeys(c for c in candidates if len(c) >= 3))
+
+
+def legacy_match(candidates, city_map, threshold=88):
+    best_match, best_score = None, 0
+    for candidate in set(candidates):
+        match = process.extractOne(candidate, city_map.keys())
+        if match and match[1] > best_score and match[1] >= threshold:
+            best_score, best_match = match[1], city_map[match[0]]
+    return best_match
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[40, 2000, 20000])
+    arg_parser.add_argument("--docs", type=int, default=10)
+    arg_parser.add_argument("--seed", type=int, default=42)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"CPUs available to cdist: {os.cpu_count()}")
+    print(f"{'cities':>8} {'path':>10} {'extractOne ms/doc':>18} {'gazetteer ms/doc':>17} {'speedup':>8} "
+          f"{'cdist only ms/doc':>18} {'mismatches':>11}")
+    for size in args.sizes:
+        cities = synthetic_cities(rng, size)
+        city_map = {normalize_place(c): c for c in cities}
+        gazetteer = CityGazetteer([(c, []) for c in cities])
+        cdist_only = CityGazetteer([(c, []) for c in cities], direct_max_pairs=0)
+        corpus = [candidates_of(synthetic_text(rng, cities)) for _ in range(args.docs)]
+
+        start = time.perf_counter()
+        expected = [legacy_match(candidates, city_map) for candidates in corpus]
+        legacy = (time.perf_counter() - start) / len(corpus)
+
+        start = time.perf_counter()
+        found = [gazetteer.match(candidates) for candidates in corpus]
+        new = (time.perf_counter() - start) / len(corpus)
+
+        start = time.perf_counter()
+        found_cdist = [cdist_only.match(candidates) for candidates in corpus]
+        batched = (time.perf_counter() - start) / len(corpus)
+
+        direct = sum(len(c) * len(gazetteer) <= gazetteer.direct_max_pairs for c in corpus)
+        path = "direct" if direct == len(corpus) else "cdist" if not direct else "mixed"
+        mismatches = sum(a != b or a != c for a, b, c in zip(expected, found, found_cdist))
+        print(f"{size:>8} {path:>10} {legacy * 1000:>18.2f} {new * 1000:>17.2f} {legacy / new:>7.1f}x "
+              f"{batched * 1000:>18.2f} {mismatches:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Time degree extraction: the former per-line, per-alias token_set_ratio loop
+(run for the education-restricted and the unrestricted pass) against the
+DegreeMatcher (one batched cdist pass + sliding education-window mask).
+
+Usage (from backend/):
+    python benchmarks/bench_degree_matcher.py [--docs 50] [--lines 120]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+from rapidfuzz import fuzz
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'parser')))
+from degree_extraction import score_resume_lines
+from utils.degree_matcher import education_window_mask
+from utils.resources import get_degree_matcher, get_helper
+
+helper = get_helper()
+SKIP = ['email', 'phone', 'linkedin', 'github', 'skills', 'projects', 'languages']
+
+
+def synthetic_lines(rng, count):
+    config = helper.config
+    aliases = [a for aliases in config.get("degree_aliases", {}).values() for a in aliases]
+    headers = config.get("education_headers", []) + ["EXPERIENCE", "Projects", "Skills"]
+    filler = "developed web application using java spring team of five students 2021 2023 rabat".split()
+    lines = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.08:
+            lines.append(rng.choice(headers).upper())
+        elif roll < 0.25:
+            lines.append(f"{rng.choice(aliases)} en {rng.choice(config.get('fields', ['informatique']))} 2019 - 2022")
+        else:
+            lines.append(" ".join(rng.sample(filler, rng.randint(1, 8))))
+    return lines
+
+
+def legacy_match(line, degree_aliases):
+    norm_line = helper.normalize_text(line)
+    best_match, best_score = None, 0
+    for degree, aliases in degree_aliases.items():
+        for alias in aliases:
+            alias = helper.normalize_text(alias)
+            score = fuzz.token_set_ratio(norm_line, alias)
+            if score > 85 and score > best_score:
+                if alias in norm_line or fuzz.partial_ratio(norm_line, alias) > 90:
+                    best_match, best_score = degree, score
+    return best_match, best_score
+
+
+def legacy_scan(lines, restrict_to_edu, degree_aliases):
+    matches = []
+    for idx, line in enumerate(lines):
+        if len(line) < 5:
+            continue
+        if any(x in helper.normalize_text(line) for x in SKIP):
+            continue
+        if restrict_to_edu and not helper.is_education_section(lines, idx):
+            continue
+        degree, score = legacy_match(line, degree_aliases)
+        if degree:
+            matches.append((idx, degree, score))
+    return matches
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--docs", type=int, default=50)
+    arg_parser.add_argument("--lines", type=int, default=120)
+    arg_parser.add_argument("--seed", type=int, default=42)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(args.seed)
+    degree_aliases = helper.config.get("degree_aliases", {})
+    indicators = helper.config.get("education_headers", [])
+    corpus = [synthetic_lines(rng, args.lines) for _ in range(args.docs)]
+    get_degree_matcher()
+
+    start = time.perf_counter()
+    expected = [(legacy_scan(lines, True, degree_aliases), legacy_scan(lines, False, degree_aliases)) for lines in corpus]
+    legacy = (time.perf_counter() - start) / len(corpus)
+
+    start = time.perf_counter()
+    scored = [score_resume_lines(lines) for lines in corpus]
+    new = (time.perf_counter() - start) / len(corpus)
+
+    mismatches = 0
+    for lines, (restricted, unrestricted), scores in zip(corpus, expected, scored):
+        mask = scores["education_mask"]
+        mismatches += mask != [helper.is_education_section(lines, i) for i in range(len(lines))]
+        mismatches += [m for m in scores["matches"] if mask[m[0]]] != restricted
+        mismatches += scores["matches"] != unrestricted
+        mismatches += education_window_mask(lines, indicators) != mask
+
+    print(f"{'docs':>6} {'lines':>6} {'legacy ms/doc':>14} {'matcher ms/doc':>15} {'speedup':>8} {'mismatches':>11}")
+    print(f"{args.docs:>6} {args.lines:>6} {legacy * 1000:>14.2f} {new * 1000:>15.2f} {legacy / new:>7.1f}x {mismatches:>11}")
+
+
+if __name__ == "__main__":
+    main()
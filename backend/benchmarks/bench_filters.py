@@ -0,0 +1,189 @@
+"""
+Filter latency on a synthetic table of 100k resumes: the former query
+(LEFT JOIN degrees and skills, then SELECT DISTINCT) against the EXISTS
+query of build_filter_query, for filters both can express, plus the
+multi-value filters only the new one supports. Results of comparable
+filters are checked to be the same resumes before timing.
+
+Needs a MySQL server (credentials from .env). Runs in a scratch database,
+seeded once and reused while it holds --resumes rows (--reseed to rebuild).
+
+Usage (from backend/):
+    python benchmarks/bench_filters.py [--resumes 100000] [--database cvParser_bench_filters] [--explain]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import mysql.connector
+from dotenv import load_dotenv
+
+from bench_resume_queries import synthetic_resume
+
+load_dotenv()
+
+SEED_BATCH = 5000
+
+
+def legacy_ids(cursor, keyword=None, city=None, degree=None, skill=None, min_exp=None):
+    """Matching resume IDs with the former single-value query, on the current schema"""
+    query = """
+        SELECT DISTINCT r.id
+        FROM resumes r
+        LEFT JOIN degrees d ON r.id = d.resume_id
+        LEFT JOIN resume_skills rs ON r.id = rs.resume_id
+        LEFT JOIN skill_names n ON n.id = rs.skill_id
+        WHERE 1=1
+    """
+    values = []
+    if keyword:
+        query += " AND (LOWER(r.occupation) LIKE LOWER(%s) OR LOWER(r.status) LIKE LOWER(%s) OR LOWER(r.name) LIKE LOWER(%s))"
+        values += [f"%{keyword}%"] * 3
+    if city:
+        query += " AND r.city = %s"
+        values.append(city)
+    if degree:
+        query += " AND (LOWER(d.degree_type) LIKE %s OR LOWER(d.degree_subject) LIKE %s)"
+        values += [f"%{degree}%"] * 2
+    if skill:
+        query += " AND LOWER(n.name) LIKE LOWER(%s)"
+        values.append(f"%{skill}%")
+    if min_exp:
+        query += " AND r.exp_years >= %s"
+        values.append(min_exp)
+    cursor.execute(query + " ORDER BY r.id", tuple(values))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def seed(db, count, rng):
+    """Bulk insert count synthetic resumes (IDs 1..count) with their degrees and skills"""
+    cursor = db.cursor()
+    skill_ids = {}
+    for start in range(0, count, SEED_BATCH):
+        resumes = [synthetic_resume(rng, i) for i in range(start, min(count, start + SEED_BATCH))]
+        cursor.executemany("""
+            INSERT INTO resumes (id, name, email, phone, occupation, exp_years, city, status, pdf_path)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, [(start + i + 1, r["name"], r["email"], r["phone"], r["occupation"], r["exp_years"], r["city"],
+               r["status"], r["pdf_path"]) for i, r in enumerate(resumes)])
+        cursor.executemany("""
+            INSERT INTO degrees (resume_id, degree_type, degree_subject) VALUES (%s, %s, %s)
+        """, [(start + i + 1, degree, None) for i, r in enumerate(resumes) for degree in r["degrees"]])
+        for name in {skill for r in resumes for skill in r["skills"]} - skill_ids.keys():
+            cursor.execute("INSERT INTO skill_names (name) VALUES (%s)", (name,))
+            skill_ids[name] = cursor.lastrowid
+        cursor.executemany("""
+            INSERT INTO resume_skills (resume_id, skill_id, position) VALUES (%s, %s, %s)
+        """, [(start + i + 1, skill_ids[skill], position)
+              for i, r in enumerate(resumes) for position, skill in enumerate(r["skills"])])
+        db.commit()
+        print(f"\rseeded {min(count, start + SEED_BATCH)}/{count}", end="", flush=True)
+    print()
+    cursor.execute("ANALYZE TABLE resumes, degrees, skill_names, resume_skills")
+    cursor.fetchall()
+    cursor.close()
+
+
+def best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--resumes", type=int, default=100000)
+    arg_parser.add_argument("--database", default="cvParser_bench_filters")
+    arg_parser.add_argument("--reseed", action="store_true", help="Drop and rebuild the scratch database")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Runs per query; the fastest is reported")
+    arg_parser.add_argument("--explain", action="store_true", help="Print the EXPLAIN plan of every new query")
+    arg_parser.add_argument("--seed", type=int, default=42)
+    args = arg_parser.parse_args()
+
+    if args.database == "cvParser":
+        sys.exit("refusing to drop the application database; pick another --database")
+    os.environ["DB_NAME"] = args.database
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from models.db import get_pool
+    from models.filters import ResumeFilters, build_filter_query, skill_groups
+    from models.resume import apply_filters, init_database, resolve_skill_ids
+
+    server = mysql.connector.connect(host="localhost", user=os.getenv("user"), password=os.getenv("password"))
+    cursor = server.cursor()
+    if args.reseed:
+        cursor.execute(f"DROP DATABASE IF EXISTS `{args.database}`")
+    cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{args.database}`")
+    server.close()
+    init_database()
+
+    db = get_pool().acquire()
+    try:
+        cursor = db.cursor()
+        cursor.execute("SELECT COUNT(*) FROM resumes")
+        stored = cursor.fetchone()[0]
+        cursor.close()
+        if stored != args.resumes:
+            if stored:
+                sys.exit(f"{args.database} holds {stored} resumes, not {args.resumes}; rerun with --reseed")
+            seed(db, args.resumes, random.Random(args.seed))
+
+        # (label, former query filters or None, new filters)
+        scenarios = [
+            ("one skill", dict(skill="python"), ResumeFilters(skills=["python"])),
+            ("city + min exp", dict(city="Rabat", min_exp=5), ResumeFilters(cities=["Rabat"], min_exp=5)),
+            ("skill + degree", dict(skill="sql", degree="master"), ResumeFilters(skills=["sql"], degree="master")),
+            ("keyword + skill", dict(keyword="data", skill="spark"),
+             ResumeFilters(keyword="data", skills=["spark"])),
+            ("2 skills (all)", None, ResumeFilters(skills=["python", "docker"])),
+            ("3 skills (any), 2 cities, exp 2-6", None,
+             ResumeFilters(skills=["c++", "spark", "tensorflow"], skill_mode="any", cities=["Rabat", "Fès"],
+                           min_exp=2, max_exp=6)),
+            ("2 degree levels + 2 skills", None,
+             ResumeFilters(degree_levels=["Master", "Ingénieur"], skills=["java", "kubernetes"])),
+        ]
+
+        print(f"{args.resumes} resumes, best of {args.repeat}")
+        print(f"{'filters':<36} {'matches':>8} {'former ms':>10} {'EXISTS ms':>10} {'speedup':>8} {'first page ms':>14}")
+        for label, legacy_filters, filters in scenarios:
+            lookup = db.cursor(dictionary=True)
+            groups = skill_groups(filters, [resolve_skill_ids(lookup, skill) for skill in filters.skills])
+            lookup.close()
+            cursor = db.cursor()
+            query, values = build_filter_query(filters, groups)
+
+            def new_ids():
+                cursor.execute(f"SELECT r.id\n{query}\nORDER BY r.id", tuple(values))
+                return [row[0] for row in cursor.fetchall()]
+
+            ids, new_time = best_time(new_ids, args.repeat)
+            former = "-"
+            speedup = "-"
+            if legacy_filters is not None:
+                expected, legacy_time = best_time(lambda: legacy_ids(cursor, **legacy_filters), args.repeat)
+                if expected != ids:
+                    sys.exit(f"{label}: EXISTS query matched {len(ids)} resumes, the former one {len(expected)}")
+                former = f"{legacy_time * 1000:.1f}"
+                speedup = f"{legacy_time / new_time:.1f}x"
+            _, page_time = best_time(lambda: apply_filters(filters), args.repeat)
+            print(f"{label:<36} {len(ids):>8} {former:>10} {new_time * 1000:>10.1f} {speedup:>8} "
+                  f"{page_time * 1000:>14.1f}")
+
+            if args.explain:
+                cursor.execute(f"EXPLAIN SELECT r.id\n{query}\nORDER BY r.id", tuple(values))
+                columns = [c[0] for c in cursor.description]
+                for row in cursor.fetchall():
+                    plan = dict(zip(columns, row))
+                    print(f"    {plan.get('select_type')} {plan.get('table')} type={plan.get('type')} "
+                          f"key={plan.get('key')} rows={plan.get('rows')} {plan.get('Extra') or ''}")
+            cursor.close()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Per-page OCR latency of each available backend on a synthetic scanned CV:
+pytesseract (one tesseract process per page) against tesserocr (engine
+loaded once and reused). Pages are OCR'd one after the other so the numbers
+are per-page costs, not pool throughput.
+
+Usage (from backend/):
+    python benchmarks/bench_ocr_backends.py [--pages 10] [--dpi 300] [--lang eng+fra]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'parser')))
+from utils.ocr import PytesseractBackend, TesserocrBackend, render_page
+
+LINES = [
+    "EXPERIENCE PROFESSIONNELLE",
+    "Ingénieur logiciel - Rabat, 2019 - 2023",
+    "Développement d'applications web avec Java, Spring Boot et Angular",
+    "COMPÉTENCES",
+    "Python, Docker, Kubernetes, PostgreSQL, Git",
+    "FORMATION",
+    "Master en informatique, Université Mohammed V, 2017 - 2019",
+]
+
+
+def scanned_pdf(path, pages):
+    """PDF whose pages are images only (a rasterized text page), like a scan"""
+    source = fitz.open()
+    page = source.new_page()
+    for i, line in enumerate(LINES * 4):
+        page.insert_text((50, 60 + i * 24), line, fontsize=12)
+    scan = page.get_pixmap(dpi=200, colorspace=fitz.csGRAY)
+
+    doc = fitz.open()
+    for _ in range(pages):
+        doc.new_page().insert_image(fitz.Rect(0, 0, 595, 842), pixmap=scan)
+    doc.save(path)
+
+
+def backends():
+    found = [PytesseractBackend()]
+    try:
+        found.append(TesserocrBackend())
+    except ImportError:
+        print("tesserocr not installed, skipping it")
+    return found
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--pages", type=int, default=10)
+    arg_parser.add_argument("--dpi", type=int, default=300)
+    arg_parser.add_argument("--lang", default="eng+fra")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scan.pdf")
+        scanned_pdf(path, args.pages)
+        with fitz.open(path) as doc:
+            images = [render_page(page, args.dpi, "gray") for page in doc]
+
+    print(f"{'backend':<12} {'first ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8}")
+    for backend in backends():
+        latencies = []
+        for image in images:
+            start = time.perf_counter()
+            backend.image_to_string(image, args.lang)
+            latencies.append((time.perf_counter() - start) * 1000)
+        ordered = sorted(latencies)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        print(f"{backend.name:<12} {latencies[0]:>9.0f} {statistics.median(latencies):>8.0f} "
+              f"{p95:>8.0f} {statistics.mean(latencies):>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Compare the precompiled pattern bank against the former per-pattern regex loops
+for status, occupation and level extraction. Checks that both give the same
+results on a synthetic corpus, then reports the speedup.
+
+Usage (from backend/):
+    python benchmarks/bench_pattern_bank.py [--docs 200] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'parser')))
+from status_occupation_extraction import (
+    OccupationLevel, StatusType, _extract_level, education_levels, extract_occupation,
+    extract_status, occupation_patterns, scan_status_occupation, status_patterns,
+)
+from utils.resources import registry
+
+
+# --- Reference implementation: one re.findall / re.search per pattern string ---
+
+def legacy_extract_status(text, language):
+    matches, confidence_scores = {}, {}
+    for status_key, patterns in status_patterns.items():
+        try:
+            status_type = StatusType(status_key)
+        except ValueError:
+            continue
+        if language in patterns:
+            status_matches = []
+            for pattern in patterns[language]:
+                status_matches.extend(re.findall(pattern, text, re.IGNORECASE))
+            if status_matches:
+                matches[status_type] = status_matches
+                confidence_scores[status_type] = len(status_matches) * 0.3
+    if not matches:
+        return StatusType.UNKNOWN, 0.0, []
+    best_status = max(confidence_scores, key=confidence_scores.get)
+    return best_status, min(confidence_scores[best_status], 1.0), matches.get(best_status, [])
+
+
+def legacy_extract_level(text, occupation):
+    if occupation not in occupation_patterns:
+        return OccupationLevel.UNKNOWN
+    for level_name, patterns in occupation_patterns[occupation].get('levels', {}).items():
+        for pattern in patterns:
+            if re.search(pattern, text, re.IGNORECASE):
+                try:
+                    return OccupationLevel(level_name)
+                except ValueError:
+                    continue
+    for level_name, patterns in education_levels.items():
+        for pattern in patterns:
+            if re.search(pattern, text, re.IGNORECASE):
+                if level_name in ['bachelor', 'master']:
+                    return OccupationLevel.STUDENT
+    return OccupationLevel.UNKNOWN
+
+
+def legacy_extract_occupation(text, language):
+    occupation_matches, occupation_scores = {}, {}
+    for occupation, config in occupation_patterns.items():
+        if language in config['patterns']:
+            matches = []
+            for pattern in config['patterns'][language]:
+                matches.extend(re.findall(pattern, text, re.IGNORECASE))
+            if matches:
+                occupation_matches[occupation] = matches
+                occupation_scores[occupation] = len(matches)
+    if not occupation_matches:
+        return "unknown", OccupationLevel.UNKNOWN, 0.0, {}
+    best_occupation = max(occupation_scores, key=occupation_scores.get)
+    level = legacy_extract_level(text, best_occupation)
+    return best_occupation, level, min(occupation_scores[best_occupation] * 0.4, 1.0), occupation_matches
+
+
+# --- Synthetic corpus ---
+
+VOCABULARY = {
+    "english": ("student engineer software developer data scientist analyst internship looking seeking "
+                "position full time junior senior lead principal computer science industrial manufacturing "
+                "machine learning artificial intelligence bachelor master university project team python").split(),
+    "french": ("étudiant ingénieur développeur logiciel données analyste stage recherche professionnel "
+               "entreprise mois informatique génie industriel intelligence artificielle licence master "
+               "débutant expérimenté université projet équipe compétences").split(),
+}
+
+
+FILLER = ("the of and to in for with on at by from as our we during within across including over "
+          "le la les des du de et pour avec sur dans par une un au aux en"
+          ).split() + [f"word{i}" for i in range(200)]
+
+
+def make_document(rng, language, lines=60, keyword_ratio=0.1):
+    words = VOCABULARY[language]
+
+    def word():
+        return rng.choice(words) if rng.random() < keyword_ratio else rng.choice(FILLER)
+
+    return "\n".join(" ".join(word() for _ in range(rng.randint(3, 14))) for _ in range(lines))
+
+
+def run_new(text, language):
+    hits = scan_status_occupation(text, language)
+    return extract_status(text, language, hits), extract_occupation(text, language, hits)
+
+
+def run_legacy(text, language):
+    return legacy_extract_status(text, language), legacy_extract_occupation(text, language)
+
+
+def time_it(fn, corpus, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text, language in corpus:
+            fn(text, language)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--docs", type=int, default=200)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--seed", type=int, default=42)
+    arg_parser.add_argument("--keyword-ratio", type=float, default=0.1,
+                            help="Share of words drawn from the status/occupation vocabulary")
+    args = arg_parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [(make_document(rng, language, keyword_ratio=args.keyword_ratio), language)
+              for language in ("english", "french") for _ in range(args.docs // 2)]
+
+    registry.get("pattern_banks")  # build outside the timed region
+    mismatches = sum(run_new(text, language) != run_legacy(text, language) for text, language in corpus)
+    print(f"Documents: {len(corpus)}, mismatching results: {mismatches}")
+
+    legacy = time_it(run_legacy, corpus, args.repeat)
+    new = time_it(run_new, corpus, args.repeat)
+    print(f"Per-pattern loops: {legacy / len(corpus) * 1000:.3f} ms/doc")
+    print(f"Pattern bank:      {new / len(corpus) * 1000:.3f} ms/doc")
+    print(f"Speedup:           {legacy / new:.1f}x")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
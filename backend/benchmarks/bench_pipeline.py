@@ -0,0 +1,207 @@
+"""
+Per-document, per-stage timings of the whole parser on the synthetic corpus
+(see synthetic_corpus.py): layout, ocr, preprocess, name, email_phone, city,
+degrees, status_occupation, skills, experience and parse_pdf_to_data end to
+end, plus how often name / email / phone / city come out as expected.
+
+Results are saved as JSON; pass an earlier file with --compare to flag stages
+whose median got slower than --threshold (exit status 1 on a regression).
+"ocr" is the summed OCR time of the pages, which runs in the OCR pool while
+"layout" waits for it, so the two overlap.
+
+The parse cache and the persistent OCR cache are disabled before the parser is
+imported: otherwise every run after the first would time cache hits.
+
+Usage (from backend/):
+    python benchmarks/bench_pipeline.py [--docs 24] [--seed 42] [--runs 3]
+        [--corpus DIR] [--output results.json] [--compare baseline.json] [--threshold 0.2]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List
+
+# Read when the caches are first created, so set before importing the parser (inherited by the OCR pool)
+DISABLED_CACHES = {"PARSE_CACHE_ENABLED": "parse cache", "OCR_CACHE_ENABLED": "OCR cache"}
+os.environ.update({name: "0" for name in DISABLED_CACHES})
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from parser.cv_parser import PARSER_VERSION, parse_pdf_to_data
+from utils.resources import warm_up
+
+from synthetic_corpus import CorpusDocument, build_corpus
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+END_TO_END = "parse_pdf_to_data"
+
+
+def _field_ok(field: str, expected: str, actual) -> bool:
+    if not actual:
+        return False
+    if field == "phone":
+        return re.sub(r"\D", "", expected) == re.sub(r"\D", "", str(actual))
+    if field == "city":
+        return expected.lower() in str(actual).lower() or str(actual).lower() in expected.lower()
+    return str(actual).strip().lower() == expected.lower()
+
+
+def run_document(doc: CorpusDocument, runs: int, verbose: bool) -> Dict:
+    """Fastest of runs parses of one document (parse and OCR caches off), with its stage timings"""
+    best = None
+    for _ in range(runs):
+        timings: Dict[str, float] = {}
+        output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        start = time.perf_counter()
+        try:
+            with output:
+                data = parse_pdf_to_data(doc.path, timings=timings, use_cache=False)
+            error = None
+        except Exception as e:
+            data, error = None, f"{type(e).__name__}: {e}"
+        timings[END_TO_END] = time.perf_counter() - start
+        if best is None or timings[END_TO_END] < best[0][END_TO_END]:
+            best = (timings, data, error)
+
+    timings, data, error = best
+    result = {
+        "file": os.path.basename(doc.path),
+        "layout": doc.layout, "lang": doc.lang, "kind": doc.kind, "pages": doc.pages,
+        "ms": {stage: round(seconds * 1000, 3) for stage, seconds in timings.items()},
+        "error": error,
+    }
+    if data is not None:
+        result["fields"] = {field: _field_ok(field, expected, data.get(field))
+                            for field, expected in doc.expected.items()}
+    return result
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def summarize(documents: List[Dict]) -> Dict:
+    per_stage = defaultdict(list)
+    per_group = defaultdict(list)
+    accuracy = defaultdict(list)
+    for doc in documents:
+        for stage, ms in doc["ms"].items():
+            per_stage[stage].append(ms)
+        if doc["error"] is None:
+            for key in ("layout", "lang", "kind", "pages"):
+                per_group[f"{key}={doc[key]}"].append(doc["ms"][END_TO_END])
+        for field, ok in doc.get("fields", {}).items():
+            accuracy[field].append(ok)
+
+    return {
+        "stages": {
+            stage: {
+                "p50_ms": round(statistics.median(values), 3),
+                "p95_ms": round(_percentile(values, 0.95), 3),
+                "mean_ms": round(statistics.mean(values), 3),
+                "total_ms": round(sum(values), 3),
+            }
+            for stage, values in sorted(per_stage.items())
+        },
+        "groups": {group: round(statistics.mean(values), 3) for group, values in sorted(per_group.items())},
+        "accuracy": {field: round(sum(oks) / len(oks), 3) for field, oks in sorted(accuracy.items())},
+        "errors": sum(1 for doc in documents if doc["error"]),
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float, min_delta_ms: float = 1.0) -> List[str]:
+    """Stages whose median got slower than threshold, and fields whose accuracy dropped"""
+    regressions = []
+    print(f"\n{'stage':<20} {'baseline p50':>13} {'current p50':>12} {'change':>8}")
+    for stage, stats in current["stages"].items():
+        old = baseline.get("stages", {}).get(stage)
+        if old is None:
+            continue
+        before, after = old["p50_ms"], stats["p50_ms"]
+        change = (after - before) / before if before else 0.0
+        slower = change > threshold and after - before > min_delta_ms
+        print(f"{stage:<20} {before:>13.1f} {after:>12.1f} {change:>+7.0%}{'  REGRESSION' if slower else ''}")
+        if slower:
+            regressions.append(f"{stage}: p50 {before:.1f} -> {after:.1f} ms")
+    for field, ratio in current["accuracy"].items():
+        before = baseline.get("accuracy", {}).get(field)
+        if before is not None and ratio < before:
+            regressions.append(f"{field} accuracy: {before:.0%} -> {ratio:.0%}")
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--docs", type=int, default=24)
+    arg_parser.add_argument("--seed", type=int, default=42)
+    arg_parser.add_argument("--runs", type=int, default=3, help="Parses per document, the fastest is kept")
+    arg_parser.add_argument("--corpus", help="Directory to write the corpus to (default: a temporary one)")
+    arg_parser.add_argument("--output", help="Results file (default: benchmarks/results/pipeline_<time>.json)")
+    arg_parser.add_argument("--compare", help="Earlier results file to check for regressions")
+    arg_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown of a stage median")
+    arg_parser.add_argument("--verbose", action="store_true", help="Keep the parser's own output")
+    args = arg_parser.parse_args()
+
+    # Models and lookup tables load once here, not inside the first document's timings
+    warm_up()
+    disabled = list(DISABLED_CACHES.values())
+    print(f"Caches disabled: {', '.join(disabled)} (the in-process skill fuzzy memo stays on, "
+          f"as in a long-lived worker)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = build_corpus(args.corpus or tmp, args.docs, args.seed)
+        documents = []
+        for doc in corpus:
+            result = run_document(doc, args.runs, args.verbose)
+            documents.append(result)
+            status = result["error"] or f"{result['ms'][END_TO_END]:.0f} ms"
+            print(f"{result['file']:<45} {status}")
+
+    summary = summarize(documents)
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "parser_version": PARSER_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "seed": args.seed,
+        "runs": args.runs,
+        "caches_disabled": disabled,
+        **summary,
+        "documents": documents,
+    }
+
+    print(f"\n{'stage':<20} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9}")
+    for stage, stats in summary["stages"].items():
+        print(f"{stage:<20} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['mean_ms']:>9.1f}")
+    print("\nMean end to end ms by " + ", ".join(f"{g}: {ms:.0f}" for g, ms in summary["groups"].items()))
+    print("Accuracy: " + ", ".join(f"{field} {ratio:.0%}" for field, ratio in summary["accuracy"].items()))
+    if summary["errors"]:
+        print(f"{summary['errors']} document(s) failed, see 'error' in the results")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"pipeline_{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
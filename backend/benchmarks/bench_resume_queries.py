@@ -0,0 +1,175 @@
+"""
+Query count and latency of listing resumes with their degrees and skills as
+the table grows: the former per-resume fetch (1 + 2N queries) against the
+batched IN (...) lookups of attach_details (1 + 2 * ceil(N / DETAIL_BATCH_SIZE)),
+and the latency of the first and last keyset pages of DEFAULT_PAGE_SIZE resumes,
+which should stay flat as the table grows.
+
+Needs a MySQL server (credentials from .env). Runs in a scratch database that
+is dropped and recreated first.
+
+Usage (from backend/):
+    python benchmarks/bench_resume_queries.py [--sizes 100 1000 5000] [--database cvParser_bench]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import mysql.connector
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEGREES = ["Master", "Licence", "Bachelor", "Ingénieur", "DUT", "BTS", "Doctorat"]
+SKILLS = ["Python", "Java", "SQL", "React", "Docker", "Kubernetes", "Flask", "Django", "Git", "Linux",
+          "AWS", "TypeScript", "Spark", "TensorFlow", "Excel", "Communication", "Leadership", "C++"]
+CITIES = ["Casablanca", "Rabat", "Marrakech", "Fès", "Tanger", "Agadir", "Oujda", "Meknès"]
+
+
+class CountingCursor:
+    """Cursor wrapper counting the statements sent to the server"""
+
+    def __init__(self, cursor, counter):
+        self._cursor = cursor
+        self._counter = counter
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def execute(self, *args, **kwargs):
+        self._counter[0] += 1
+        return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        self._counter[0] += 1
+        return self._cursor.executemany(*args, **kwargs)
+
+
+class CountingConnection:
+    def __init__(self, connection, counter):
+        self._connection = connection
+        self._counter = counter
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs):
+        return CountingCursor(self._connection.cursor(*args, **kwargs), self._counter)
+
+
+def synthetic_resume(rng, index):
+    return {
+        "name": f"Candidate {index}",
+        "email": f"candidate{index}@example.com",
+        "phone": f"+2126{index:08d}",
+        "occupation": rng.choice(["Data Scientist", "Développeur Full Stack", "DevOps Engineer", None]),
+        "exp_years": rng.randint(0, 20),
+        "city": rng.choice(CITIES),
+        "status": rng.choice(["Étudiant", "Employé", None]),
+        "pdf_path": f"candidate{index}.pdf",
+        "degrees": rng.sample(DEGREES, rng.randint(0, 3)),
+        "skills": rng.sample(SKILLS, rng.randint(3, 10)),
+    }
+
+
+def legacy_get_all(cursor):
+    """The former read path (on the current schema): two queries per resume"""
+    cursor.execute("SELECT * FROM resumes")
+    resumes = cursor.fetchall()
+    for resume in resumes:
+        cursor.execute("SELECT DISTINCT degree_type, degree_subject FROM degrees WHERE resume_id = %s",
+                       (resume['id'],))
+        resume['degrees'] = cursor.fetchall()
+        cursor.execute("""
+            SELECT n.name AS skill_name FROM resume_skills rs JOIN skill_names n ON n.id = rs.skill_id
+            WHERE rs.resume_id = %s ORDER BY rs.position
+        """, (resume['id'],))
+        resume['skills'] = [row['skill_name'] for row in cursor.fetchall()]
+    return resumes
+
+
+def canonical(resumes):
+    """Order-insensitive view of degrees (the former query had no ORDER BY)"""
+    return [
+        {**r, "degrees": sorted((d['degree_type'] or "", d['degree_subject'] or "") for d in r['degrees'])}
+        for r in resumes
+    ]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    arg_parser.add_argument("--database", default="cvParser_bench")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Runs per size; the fastest is reported")
+    arg_parser.add_argument("--seed", type=int, default=42)
+    args = arg_parser.parse_args()
+
+    if args.database == "cvParser":
+        sys.exit("refusing to drop the application database; pick another --database")
+    os.environ["DB_NAME"] = args.database
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import models.db
+    from models.db import ConnectionPool, _connect
+    from models.resume import (DEFAULT_PAGE_SIZE, DETAIL_BATCH_SIZE, add_resumes, get_all_resumes,
+                               init_database)
+
+    server = mysql.connector.connect(host="localhost", user=os.getenv("user"), password=os.getenv("password"))
+    server.cursor().execute(f"DROP DATABASE IF EXISTS `{args.database}`")
+    server.cursor().execute(f"CREATE DATABASE `{args.database}`")
+    server.close()
+
+    counter = [0]
+    models.db._pool = ConnectionPool(connect=lambda: CountingConnection(_connect(), counter))
+    init_database()
+
+    rng = random.Random(args.seed)
+    stored = 0
+    print(f"IN (...) batch size: {DETAIL_BATCH_SIZE}")
+    print(f"{'resumes':>8} {'per-resume queries':>19} {'ms':>9} {'batched queries':>16} {'ms':>9} {'speedup':>8} "
+          f"{'first page ms':>14} {'last page ms':>13}")
+    for size in sorted(args.sizes):
+        while stored < size:
+            batch = [synthetic_resume(rng, i) for i in range(stored, min(size, stored + 1000))]
+            if None in add_resumes(batch):
+                sys.exit("seeding failed, see the log above")
+            stored += len(batch)
+
+        legacy_time = batched_time = first_page_time = last_page_time = float("inf")
+        for _ in range(args.repeat):
+            db = models.db.get_pool().acquire()
+            try:
+                cursor = db.cursor(dictionary=True)
+                counter[0] = 0
+                start = time.perf_counter()
+                legacy = legacy_get_all(cursor)
+                legacy_time = min(legacy_time, time.perf_counter() - start)
+                legacy_queries = counter[0]
+                cursor.close()
+            finally:
+                db.close()
+
+            counter[0] = 0
+            start = time.perf_counter()
+            result = get_all_resumes(limit=size)
+            batched_time = min(batched_time, time.perf_counter() - start)
+            batched_queries = counter[0]
+
+            start = time.perf_counter()
+            get_all_resumes()
+            first_page_time = min(first_page_time, time.perf_counter() - start)
+            # IDs run from 1 to size in the fresh database
+            start = time.perf_counter()
+            get_all_resumes(after=max(0, size - DEFAULT_PAGE_SIZE))
+            last_page_time = min(last_page_time, time.perf_counter() - start)
+
+        if result["status"] != "success" or canonical(result["data"]) != canonical(legacy):
+            sys.exit(f"batched results differ from the per-resume ones at {size} resumes")
+        print(f"{size:>8} {legacy_queries:>19} {legacy_time * 1000:>9.1f} {batched_queries:>16} "
+              f"{batched_time * 1000:>9.1f} {legacy_time / batched_time:>7.1f}x "
+              f"{first_page_time * 1000:>14.1f} {last_page_time * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Time skill extraction as the taxonomy grows: the former per-token
+process.extractOne loop against the SkillMatcher (trie + batched cdist).
+
+Usage (from backend/):
+    python benchmarks/bench_skill_matcher.py [--sizes 140 1000 5000] [--docs 20]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+from rapidfuzz import process
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'parser')))
+from utils.resources import get_helper
+from utils.skill_matcher import SkillMatcher
+
+helper = get_helper()
+
+
+def synthetic_taxonomy(rng, size):
+    skills = list(helper.skills)
+    syllables = "ka lo mi ne ra to su vi ze po da fe gu hi".split()
+    while len(skills) < size:
+        words = ["".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(1, 3))]
+        skills.append(" ".join(words))
+    return skills
+
+
+def synthetic_tokens(rng, skills, skill_ratio, lines=40):
+    filler = "team project worked with using tools environment and the of data".split()
+    tokens = []
+    for _ in range(lines):
+        line = ", ".join(
+            rng.choice(skills) if rng.random() < skill_ratio else " ".join(rng.sample(filler, 3))
+            for _ in range(rng.randint(2, 6))
+        )
+        tokens.extend(helper.normalize_token(t) for t in re.split(r'[:,•·\-\|;/]', line))
+    return tokens
+
+
+def legacy_match(tokens, normalized_skills, threshold=85):
+    found = set()
+    for token in tokens:
+        match = process.extractOne(token, normalized_skills.keys(), score_cutoff=threshold)
+        if match:
+            found.add(normalized_skills[match[0]])
+    return found
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[140, 1000, 5000])
+    arg_parser.add_argument("--docs", type=int, default=20)
+    arg_parser.add_argument("--seed", type=int, default=42)
+    arg_parser.add_argument("--skill-ratio", type=float, default=0.7,
+                            help="Share of list items that are known skills (the rest is filler)")
+    args = arg_parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"CPUs available to cdist: {os.cpu_count()}")
+    print(f"{'skills':>8} {'extractOne ms/doc':>18} {'matcher ms/doc':>15} {'speedup':>8}")
+    for size in args.sizes:
+        skills = synthetic_taxonomy(rng, size)
+        normalized_skills = {helper.normalize_token(s): s for s in skills}
+        matcher = SkillMatcher(skills, normalize=helper.normalize_token)
+        corpus = [synthetic_tokens(rng, skills, args.skill_ratio) for _ in range(args.docs)]
+
+        start = time.perf_counter()
+        for tokens in corpus:
+            legacy_match(tokens, normalized_skills)
+        legacy = (time.perf_counter() - start) / len(corpus)
+
+        start = time.perf_counter()
+        for tokens in corpus:
+            matcher.match(tokens)
+        new = (time.perf_counter() - start) / len(corpus)
+
+        print(f"{size:>8} {legacy * 1000:>18.2f} {new * 1000:>15.2f} {legacy / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
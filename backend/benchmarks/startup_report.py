@@ -0,0 +1,93 @@
+"""
+Cold-start import report: imports each entry point in a fresh interpreter with
+`python -X importtime`, prints its import time and heaviest direct imports,
+and checks it against the startup budget below. spaCy must never be loaded at
+import time (models load on first use / warm_up).
+
+Usage (from backend/):
+    python benchmarks/startup_report.py [--runs 3] [--top 8] [module ...]
+
+Exits with status 1 when a module is over budget.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Cold-start budget per entry point, in milliseconds of import time
+BUDGETS_MS = {
+    "app": 300,
+    "routes.router": 300,
+    "parser.email_phone_extraction": 50,
+    "parser.cv_parser": 400,
+    "bulk_ingest": 450,
+}
+
+# Never imported as a side effect of importing an entry point
+LAZY_MODULES = ("spacy",)
+
+
+def import_times(module: str) -> List[Tuple[int, int, int, str]]:
+    """(self us, cumulative us, depth, name) per imported module, in import order"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def report(module: str, runs: int, top: int) -> Dict:
+    best = None
+    for _ in range(runs):
+        rows = import_times(module)
+        total = next(cum for _, cum, depth, name in rows if depth == 0 and name == module)
+        if best is None or total < best[0]:
+            best = (total, rows)
+    total, rows = best
+    direct = sorted(((cum, name) for _, cum, depth, name in rows if depth == 1), reverse=True)[:top]
+    loaded = {name for *_, name in rows}
+    return {
+        "module": module,
+        "ms": total / 1000,
+        "direct": [(name, cum / 1000) for cum, name in direct],
+        "eager_heavy": [m for m in LAZY_MODULES if m in loaded],
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("modules", nargs="*", default=list(BUDGETS_MS))
+    arg_parser.add_argument("--runs", type=int, default=3, help="Best of N fresh interpreters")
+    arg_parser.add_argument("--top", type=int, default=8, help="Heaviest direct imports to list")
+    args = arg_parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        result = report(module, args.runs, args.top)
+        budget = BUDGETS_MS.get(module)
+        over = budget is not None and result["ms"] > budget
+        failed |= over or bool(result["eager_heavy"])
+
+        verdict = "" if budget is None else (f" OVER budget of {budget} ms" if over else f" (budget {budget} ms)")
+        print(f"{module}: {result['ms']:.0f} ms{verdict}")
+        for name, ms in result["direct"]:
+            print(f"    {ms:>8.1f} ms  {name}")
+        if result["eager_heavy"]:
+            print(f"    eagerly imports {', '.join(result['eager_heavy'])}, should be lazy")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
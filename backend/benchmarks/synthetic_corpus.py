@@ -0,0 +1,286 @@
+"""
+Reproducible synthetic CV corpus, generated locally with PyMuPDF.
+
+Every document is one combination of layout (single / two columns), language
+(en / fr) and kind (text; scanned: image-only pages; mixed: a text page with
+an embedded scanned part, then alternating image-only and text pages), with
+1 to 10 pages. The same seed always gives the same PDFs, and the manifest
+records the expected name, email, phone and city of each one.
+
+Usage (from backend/):
+    python benchmarks/synthetic_corpus.py OUT_DIR [--docs 24] [--seed 42]
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Tuple
+
+import fitz  # PyMuPDF
+
+LAYOUTS = ("single", "two_column")
+LANGS = ("en", "fr")
+KINDS = ("text", "scanned", "mixed")
+PAGE_COUNTS = (1, 2, 3, 5, 10)
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+MARGIN = 40
+SIDEBAR_WIDTH = 170
+LINE_HEIGHT = 15
+SCAN_DPI = 150
+
+FIRST_NAMES = ["Youssef", "Amina", "Nizar", "Salma", "Karim", "Leila", "Omar", "Sara", "Mehdi", "Imane"]
+LAST_NAMES = ["Alaoui", "Bennani", "Kourti", "El Idrissi", "Tazi", "Berrada", "Chraibi", "Fassi", "Amrani", "Naciri"]
+CITIES = ["Casablanca", "Rabat", "Marrakech", "Agadir", "Tanger", "Oujda", "Meknès", "Kénitra"]
+COMPANIES = ["OCP Group", "Capgemini", "CGI", "Atos", "Inwi", "Maroc Telecom", "Attijariwafa Bank", "Sopra Banking"]
+SKILLS = ["Python", "Java", "Docker", "Kubernetes", "SQL", "React", "Angular", "Spring Boot", "Git", "Linux",
+          "TensorFlow", "Pandas", "AWS", "Azure", "Jenkins", "MongoDB", "Node.js", "Flask"]
+SCHOOLS = ["Université Mohammed V", "ENSIAS", "EMI", "INPT", "Université Hassan II", "ENSA Tanger"]
+
+TEXT = {
+    "en": {
+        "title": ["Software Engineer", "Data Scientist", "Full Stack Developer", "DevOps Engineer"],
+        "profile": "PROFILE",
+        "summary": ["Engineer with several years of experience building web platforms.",
+                    "Interested in distributed systems, data pipelines and clean code."],
+        "experience": "WORK EXPERIENCE",
+        "job": "{title} - {company}, {city}, {start} - {end}",
+        "bullets": ["Designed and delivered REST APIs used by internal teams",
+                    "Migrated legacy services to containers and CI/CD pipelines",
+                    "Mentored two junior developers and reviewed pull requests",
+                    "Reduced report generation time by caching expensive queries",
+                    "Worked with product owners on requirements and estimates"],
+        "education": "EDUCATION",
+        "degrees": ["Master in Computer Science", "Engineering degree in Software Engineering",
+                    "Licence in Mathematics", "Baccalaureate in Sciences"],
+        "skills": "SKILLS",
+        "projects": "PROJECTS",
+        "project": "Project {n}: internal tool for {topic}",
+        "topics": ["invoicing", "monitoring", "recruitment", "inventory", "analytics"],
+        "languages": "LANGUAGES",
+        "spoken": ["Arabic: native", "French: fluent", "English: fluent"],
+    },
+    "fr": {
+        "title": ["Ingénieur Logiciel", "Data Scientist", "Développeur Full Stack", "Ingénieur DevOps"],
+        "profile": "PROFIL",
+        "summary": ["Ingénieur avec plusieurs années d'expérience en développement web.",
+                    "Intéressé par les systèmes distribués et la qualité du code."],
+        "experience": "EXPÉRIENCE PROFESSIONNELLE",
+        "job": "{title} - {company}, {city}, {start} - {end}",
+        "bullets": ["Conception et développement d'API REST pour les équipes internes",
+                    "Migration des services existants vers des conteneurs",
+                    "Encadrement de deux développeurs juniors",
+                    "Optimisation des requêtes et mise en cache des rapports",
+                    "Recueil des besoins avec les responsables produit"],
+        "education": "FORMATION",
+        "degrees": ["Master en Informatique", "Diplôme d'ingénieur en Génie Logiciel",
+                    "Licence en Mathématiques", "Baccalauréat Sciences Mathématiques"],
+        "skills": "COMPÉTENCES",
+        "projects": "PROJETS",
+        "project": "Projet {n} : outil interne de {topic}",
+        "topics": ["facturation", "supervision", "recrutement", "gestion de stock", "reporting"],
+        "languages": "LANGUES",
+        "spoken": ["Arabe : langue maternelle", "Français : courant", "Anglais : courant"],
+    },
+}
+
+
+@dataclass
+class CorpusDocument:
+    path: str
+    layout: str
+    lang: str
+    kind: str
+    pages: int
+    expected: Dict[str, str]
+
+
+class _Writer:
+    """Writes lines top to bottom in a column, adding pages as they fill up"""
+
+    def __init__(self, doc: fitz.Document, x0: float, x1: float, max_pages: int):
+        self.doc = doc
+        self.x0, self.x1 = x0, x1
+        self.max_pages = max_pages
+        self.page_index = 0
+        self.y = MARGIN + 20
+
+    @property
+    def full(self) -> bool:
+        return self.page_index >= self.max_pages
+
+    def _page(self) -> fitz.Page:
+        while len(self.doc) <= self.page_index:
+            self.doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        return self.doc[self.page_index]
+
+    def line(self, text: str, size: float = 10, gap: float = 0) -> bool:
+        """Write one line; False once every page is full"""
+        if self.y + size + gap > PAGE_HEIGHT - MARGIN:
+            self.page_index += 1
+            self.y = MARGIN + 20
+        if self.full:
+            return False
+        self.y += gap
+        self._page().insert_text((self.x0, self.y), text, fontsize=size)
+        self.y += max(LINE_HEIGHT, size + 5)
+        return True
+
+
+def _profile(rng: random.Random, lang: str) -> Dict:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        "name": f"{first} {last}",
+        "email": f"{first}.{last}".lower().replace(" ", "") + "@example.com",
+        "phone": f"+212 6{rng.randint(10, 99)} {rng.randint(100, 999)} {rng.randint(100, 999)}",
+        "city": rng.choice(CITIES),
+        "title": rng.choice(TEXT[lang]["title"]),
+        "skills": rng.sample(SKILLS, rng.randint(5, 10)),
+    }
+
+
+def _experience_lines(rng: random.Random, lang: str, profile: Dict, count: int) -> List[Tuple[str, float, float]]:
+    """(text, font size, gap before) of the experience entries"""
+    t = TEXT[lang]
+    lines = []
+    end = 2024
+    for _ in range(count):
+        start = end - rng.randint(1, 3)
+        lines.append((t["job"].format(title=profile["title"], company=rng.choice(COMPANIES),
+                                      city=rng.choice(CITIES), start=start, end=end), 11, 6))
+        for bullet in rng.sample(t["bullets"], 3):
+            lines.append((f"- {bullet}", 10, 0))
+        end = start
+    return lines
+
+
+def _write_cv(doc: fitz.Document, rng: random.Random, layout: str, lang: str, pages: int, profile: Dict):
+    t = TEXT[lang]
+    header = MARGIN + 20
+    doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    first = doc[0]
+    first.insert_text((MARGIN, header), profile["name"].upper(), fontsize=22)
+    first.insert_text((MARGIN, header + 24), profile["title"], fontsize=13)
+
+    if layout == "two_column":
+        sidebar = _Writer(doc, MARGIN, MARGIN + SIDEBAR_WIDTH, 1)
+        sidebar.y = header + 60
+        for text in (profile["email"], profile["phone"], profile["city"]):
+            sidebar.line(text, 9)
+        sidebar.line(t["skills"], 12, 12)
+        for skill in profile["skills"]:
+            sidebar.line(skill, 9)
+        sidebar.line(t["languages"], 12, 12)
+        for spoken in t["spoken"]:
+            sidebar.line(spoken, 9)
+        main = _Writer(doc, MARGIN + SIDEBAR_WIDTH + 20, PAGE_WIDTH - MARGIN, pages)
+        main.y = header + 60
+    else:
+        main = _Writer(doc, MARGIN, PAGE_WIDTH - MARGIN, pages)
+        main.y = header + 44
+        main.line(f"{profile['email']} | {profile['phone']} | {profile['city']}", 10)
+
+    main.line(t["profile"], 12, 12)
+    for sentence in t["summary"]:
+        main.line(sentence, 10)
+    main.line(t["experience"], 12, 12)
+    for text, size, gap in _experience_lines(rng, lang, profile, 2):
+        main.line(text, size, gap)
+    main.line(t["education"], 12, 12)
+    main.line(f"{rng.choice(t['degrees'])}, {rng.choice(SCHOOLS)}, 2015 - 2018", 10, 4)
+    if layout == "single":
+        main.line(t["skills"], 12, 12)
+        main.line(", ".join(profile["skills"]), 10)
+        main.line(t["languages"], 12, 12)
+        main.line(", ".join(t["spoken"]), 10)
+
+    # Fill the remaining pages with projects
+    if pages > 1:
+        main.line(t["projects"], 12, 12)
+        n = 1
+        while not main.full:
+            if not main.line(t["project"].format(n=n, topic=rng.choice(t["topics"])), 11, 6):
+                break
+            for bullet in rng.sample(t["bullets"], 2):
+                main.line(f"- {bullet}", 10)
+            n += 1
+    while len(doc) < pages:
+        doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+
+
+def _rasterize_region(page: fitz.Page, clip: fitz.Rect):
+    """Replace the text inside clip by an image of it: a page mixing a text layer and a scanned part"""
+    pix = page.get_pixmap(dpi=SCAN_DPI, colorspace=fitz.csGRAY, clip=clip)
+    page.add_redact_annot(clip)
+    page.apply_redactions()
+    page.insert_image(clip, pixmap=pix)
+
+
+def _rasterize(doc: fitz.Document, page_indices: List[int]) -> fitz.Document:
+    """Copy of doc where the given pages are replaced by a grayscale image of themselves, like scans"""
+    out = fitz.open()
+    for i, page in enumerate(doc):
+        if i in page_indices:
+            pix = page.get_pixmap(dpi=SCAN_DPI, colorspace=fitz.csGRAY)
+            new_page = out.new_page(width=page.rect.width, height=page.rect.height)
+            new_page.insert_image(new_page.rect, pixmap=pix)
+        else:
+            out.insert_pdf(doc, from_page=i, to_page=i)
+    return out
+
+
+def build_document(path: str, seed: int, layout: str, lang: str, kind: str, pages: int) -> CorpusDocument:
+    rng = random.Random(f"{seed}:{layout}:{lang}:{kind}:{pages}")
+    profile = _profile(rng, lang)
+    doc = fitz.open()
+    _write_cv(doc, rng, layout, lang, pages, profile)
+
+    if kind == "scanned":
+        doc = _rasterize(doc, list(range(len(doc))))
+    elif kind == "mixed":
+        # Lower part of the first page embedded as an image, every other following page scanned
+        _rasterize_region(doc[0], fitz.Rect(0, PAGE_HEIGHT * 0.6, PAGE_WIDTH, PAGE_HEIGHT - MARGIN))
+        doc = _rasterize(doc, list(range(1, len(doc), 2)))
+    # Fixed metadata dates so the same seed gives byte-identical files
+    doc.set_metadata({"creationDate": "D:20240101000000", "modDate": "D:20240101000000"})
+    doc.save(path, garbage=3, deflate=True, no_new_id=True)
+
+    expected = {key: profile[key] for key in ("name", "email", "phone", "city")}
+    return CorpusDocument(path=path, layout=layout, lang=lang, kind=kind, pages=pages, expected=expected)
+
+
+def build_corpus(out_dir: str, docs: int = 24, seed: int = 42) -> List[CorpusDocument]:
+    """
+    docs PDFs cycling through every layout x language x kind combination, with
+    page counts cycling through PAGE_COUNTS; writes manifest.json next to them.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    combinations = itertools.cycle(itertools.product(LAYOUTS, LANGS, KINDS))
+    page_counts = itertools.cycle(PAGE_COUNTS)
+    corpus = []
+    for i in range(docs):
+        layout, lang, kind = next(combinations)
+        pages = next(page_counts)
+        path = os.path.join(out_dir, f"cv_{i:03d}_{layout}_{lang}_{kind}_{pages}p.pdf")
+        corpus.append(build_document(path, seed, layout, lang, kind, pages))
+
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"seed": seed, "documents": [asdict(d) for d in corpus]}, f, indent=2, ensure_ascii=False)
+    return corpus
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("out_dir")
+    arg_parser.add_argument("--docs", type=int, default=24)
+    arg_parser.add_argument("--seed", type=int, default=42)
+    args = arg_parser.parse_args()
+
+    corpus = build_corpus(args.out_dir, args.docs, args.seed)
+    print(f"Wrote {len(corpus)} PDFs and manifest.json to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
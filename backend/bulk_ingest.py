@@ -0,0 +1,333 @@
+"""
+Bulk ingestion of a directory of PDF resumes.
+
+Parses every PDF under a directory across a pool of worker processes (each
+worker loads the spaCy models and lookup tables once), inserts the results into
+MySQL in batches and records progress in a state file so that an interrupted
+run can be resumed without re-parsing finished files.
+
+Usage:
+    python bulk_ingest.py /path/to/cvs --workers 8 --batch-size 200
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from parser.cv_parser import parse_pdf_to_data, warm_up
+from utils.logs import get_logger, log_fields
+from utils.ocr import configure_ocr_pool
+from utils.profiling import PROFILE_DIR, PROFILE_SAMPLE_RATE, PROFILE_TOP_N, profile_call, profile_reason
+from models.resume import add_resumes, init_database
+
+logger = get_logger("bulk_ingest")
+
+STATE_FILENAME = ".bulk_ingest_state.jsonl"
+# Recorded for the documents in flight when a worker process died; --retry-failed parses them again
+WORKER_CRASHED = "worker process crashed"
+
+
+def find_pdfs(directory: str) -> Iterator[str]:
+    for root, _, files in os.walk(directory):
+        for filename in sorted(files):
+            if filename.lower().endswith(".pdf"):
+                yield os.path.abspath(os.path.join(root, filename))
+
+
+def _file_key(path: str) -> str:
+    """Identify a file by path, size and mtime so modified files are parsed again"""
+    stat = os.stat(path)
+    return f"{path}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def load_state(state_path: str) -> Dict[str, dict]:
+    """Last recorded outcome per file key (later lines win)"""
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line after a crash
+                state[entry["key"]] = entry
+    return state
+
+
+def _init_worker(verbose: bool):
+    # Per-document parser logs are DEBUG records; show them only when asked to
+    if verbose:
+        logging.getLogger("cvparser").setLevel(logging.DEBUG)
+    # Documents are already spread over processes: OCR their pages inline
+    configure_ocr_pool(1)
+    warm_up()
+
+
+def _parse_one(path: str, profile: bool = False, profile_sample: float = 0.0
+               ) -> Tuple[str, Optional[dict], Optional[str], Dict[str, float], Optional[dict]]:
+    """(path, data, error, stage timings, profile summary or None)"""
+    timings: Dict[str, float] = {}
+    reason = profile_reason(profile, profile_sample)
+    try:
+        if reason is None:
+            return path, parse_pdf_to_data(path, timings=timings), None, timings, None
+        data, summary = profile_call(parse_pdf_to_data, path, timings=timings, use_cache=reason != "requested",
+                                     pdf_path=path, reason=reason)
+        return path, data, None, timings, summary
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}", timings, None
+
+
+class IngestStats:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.parsed = 0
+        self.stored = 0
+        self.failed = 0
+        self.skipped = 0
+        self.profiled = 0
+        self.stage_totals: Dict[str, float] = {}
+        # Per function, over the profiled documents: [self seconds, calls, documents where it was in the top]
+        self.function_totals: Dict[str, List[float]] = {}
+
+    def add_timings(self, timings: Dict[str, float]):
+        for stage, seconds in timings.items():
+            self.stage_totals[stage] = self.stage_totals.get(stage, 0.0) + seconds
+
+    def add_profile(self, top: List[dict]):
+        self.profiled += 1
+        for row in top:
+            totals = self.function_totals.setdefault(row["function"], [0.0, 0, 0])
+            totals[0] += row["self_seconds"]
+            totals[1] += row["calls"]
+            totals[2] += 1
+
+    def hottest_functions(self, n: int = PROFILE_TOP_N) -> List[Tuple[str, List[float]]]:
+        return sorted(self.function_totals.items(), key=lambda kv: -kv[1][0])[:n]
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    @property
+    def throughput(self) -> float:
+        return self.parsed / self.elapsed if self.elapsed > 0 else 0.0
+
+    def progress(self, total: int) -> str:
+        return (f"[{self.parsed + self.failed + self.skipped}/{total}] parsed={self.parsed} stored={self.stored} "
+                f"failed={self.failed} skipped={self.skipped} ({self.throughput:.2f} docs/sec)")
+
+    def summary(self) -> str:
+        lines = [
+            f"Elapsed: {self.elapsed:.1f}s, throughput: {self.throughput:.2f} docs/sec",
+            f"Parsed: {self.parsed}, stored: {self.stored}, failed: {self.failed}, skipped: {self.skipped}",
+        ]
+        if self.parsed:
+            lines.append("Mean time per stage (per document, worker time):")
+            for stage, seconds in sorted(self.stage_totals.items(), key=lambda kv: -kv[1]):
+                lines.append(f"  {stage:<18} {seconds / self.parsed * 1000:>10.1f} ms")
+        if self.profiled:
+            lines.append(f"Profiled: {self.profiled} document(s), profiles in {PROFILE_DIR}")
+            lines.append("Hottest functions (self time summed over the per-document top lists):")
+            lines.append(f"  {'self s':>9} {'calls':>10} {'docs':>5}  function")
+            for function, (self_seconds, calls, documents) in self.hottest_functions():
+                lines.append(f"  {self_seconds:>9.3f} {calls:>10} {documents:>5}  {function}")
+        return "\n".join(lines)
+
+
+class BulkIngest:
+    def __init__(self, directory: str, state_path: str, workers: int, batch_size: int,
+                 store: bool = True, retry_failed: bool = False, verbose: bool = False,
+                 profile: bool = False, profile_sample: float = 0.0,
+                 target=_parse_one, initializer=_init_worker):
+        self.directory = directory
+        self.state_path = state_path
+        self.workers = workers
+        self.batch_size = batch_size
+        self.store = store
+        self.retry_failed = retry_failed
+        self.verbose = verbose
+        self.profile = profile
+        self.profile_sample = profile_sample
+        # Run in the worker processes (module-level functions, picklable)
+        self.target = target
+        self.initializer = initializer
+        self.stats = IngestStats()
+        # (file key, parsed data, profile summary or None)
+        self._batch: List[Tuple[str, dict, Optional[dict]]] = []
+        self._state_file = None
+
+    def _pending_files(self) -> Tuple[List[Tuple[str, str]], int]:
+        state = load_state(self.state_path)
+        pending = []
+        total = 0
+        for path in find_pdfs(self.directory):
+            total += 1
+            key = _file_key(path)
+            entry = state.get(key)
+            if entry and (entry["status"] == "done" or (entry["status"] == "failed" and not self.retry_failed)):
+                self.stats.skipped += 1
+                continue
+            pending.append((key, path))
+        return pending, total
+
+    def _record(self, key: str, path: str, status: str, profile: Optional[dict] = None, **extra):
+        entry = {"key": key, "path": path, "status": status, **extra}
+        if profile is not None:
+            entry["profile"] = profile["artifact"]
+            entry["top_functions"] = profile["top"]
+        self._state_file.write(json.dumps(entry) + "\n")
+
+    def _flush(self):
+        """Store the current batch, then checkpoint it: a crash before this point re-parses the batch"""
+        if not self._batch:
+            return
+        resumes = [data for _, data, _ in self._batch]
+        ids = add_resumes(resumes) if self.store else [None] * len(resumes)
+        for (key, data, profile), resume_id in zip(self._batch, ids):
+            if self.store and resume_id is None:
+                self.stats.failed += 1
+                self._record(key, data["pdf_path"], "failed", profile, error="database insert failed")
+            else:
+                self.stats.stored += int(resume_id is not None)
+                self._record(key, data["pdf_path"], "done", profile, id=resume_id)
+        self._state_file.flush()
+        os.fsync(self._state_file.fileno())
+        self._batch = []
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=self.initializer,
+                                   initargs=(self.verbose,))
+
+    def _collect(self, key: str, future: Future) -> bool:
+        """Record the outcome of one document; False when its worker process died"""
+        try:
+            path, data, error, timings, profile = future.result()
+        except BrokenProcessPool:
+            return False
+        self.stats.add_timings(timings)
+        if profile is not None:
+            self.stats.add_profile(profile["top"])
+        if error:
+            self.stats.failed += 1
+            self._record(key, path, "failed", error=error)
+            logger.warning("failed to parse", extra=log_fields(file=path, error=error))
+            return True
+        self.stats.parsed += 1
+        self._batch.append((key, data, profile))
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+        return True
+
+    def run(self) -> IngestStats:
+        pending, total = self._pending_files()
+        logger.info("PDFs found", extra=log_fields(total=total, pending=len(pending), done=self.stats.skipped))
+        if not pending:
+            return self.stats
+
+        keys = {path: key for key, path in pending}
+        queue = iter(path for _, path in pending)
+        max_in_flight = self.workers * 4
+        last_report = time.perf_counter()
+
+        with open(self.state_path, "a", encoding="utf-8") as self._state_file:
+            executor = self._new_executor()
+            # future -> path, to know which documents a crashed worker took down with the pool
+            in_flight: Dict[Future, str] = {}
+            try:
+                while True:
+                    broken = False
+                    # Keep a bounded number of submitted documents
+                    for path in queue:
+                        try:
+                            future = executor.submit(self.target, path, self.profile, self.profile_sample)
+                        except BrokenProcessPool:
+                            # A worker died since the last wait: this one goes to the next pool
+                            queue = itertools.chain([path], queue)
+                            broken = True
+                            break
+                        in_flight[future] = path
+                        if len(in_flight) >= max_in_flight:
+                            break
+                    if not in_flight and not broken:
+                        break
+
+                    crashed = []
+                    done = wait(in_flight, return_when=FIRST_COMPLETED)[0] if in_flight else set()
+                    for future in done:
+                        path = in_flight.pop(future)
+                        if not self._collect(keys[path], future):
+                            crashed.append(path)
+
+                    if crashed or broken:
+                        # A dead worker breaks the whole pool: every pending document fails with it.
+                        # Which one killed it is unknown, so they are all recorded as failed.
+                        for future in wait(in_flight)[0]:
+                            path = in_flight.pop(future)
+                            if not self._collect(keys[path], future):
+                                crashed.append(path)
+                        for path in crashed:
+                            self.stats.failed += 1
+                            self._record(keys[path], path, "failed", error=WORKER_CRASHED)
+                        logger.warning("worker process crashed, restarting the pool",
+                                       extra=log_fields(failed=len(crashed), files=crashed))
+                        executor.shutdown()
+                        executor = self._new_executor()
+
+                    if time.perf_counter() - last_report >= 5:
+                        print(self.stats.progress(total))
+                        last_report = time.perf_counter()
+            finally:
+                executor.shutdown()
+
+            self._flush()
+
+        print(self.stats.progress(total))
+        return self.stats
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Parse and store every PDF resume in a directory.")
+    arg_parser.add_argument("directory", help="Directory to scan (recursively) for PDF files")
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of parser processes")
+    arg_parser.add_argument("--batch-size", type=int, default=100, help="Resumes per database transaction")
+    arg_parser.add_argument("--state", default=None,
+                            help=f"Progress file used to resume a run (default: <directory>/{STATE_FILENAME})")
+    arg_parser.add_argument("--retry-failed", action="store_true", help="Parse files that failed in a previous run again")
+    arg_parser.add_argument("--no-db", action="store_true", help="Parse only, do not insert into the database")
+    arg_parser.add_argument("--verbose", action="store_true", help="Keep the parser's per-document output")
+    arg_parser.add_argument("--profile", action="store_true",
+                            help="Parse every document under cProfile (profiles saved to PROFILE_DIR)")
+    arg_parser.add_argument("--profile-sample", type=float, default=PROFILE_SAMPLE_RATE,
+                            help="Share of documents to profile, e.g. 0.01 (default: PROFILE_SAMPLE_RATE)")
+    args = arg_parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        arg_parser.error(f"'{args.directory}' is not a directory")
+    if not args.no_db and not init_database():
+        return "database initialization failed, see the log above"
+
+    ingest = BulkIngest(
+        directory=args.directory,
+        state_path=args.state or os.path.join(args.directory, STATE_FILENAME),
+        workers=max(1, args.workers),
+        batch_size=max(1, args.batch_size),
+        store=not args.no_db,
+        retry_failed=args.retry_failed,
+        verbose=args.verbose,
+        profile=args.profile,
+        profile_sample=args.profile_sample,
+    )
+    stats = ingest.run()
+    print(stats.summary())
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
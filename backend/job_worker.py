@@ -0,0 +1,136 @@
+"""
+Background workers draining the upload job queue (models/jobs.py).
+
+The API only enqueues uploaded PDFs; these processes parse and store them.
+Workers are started by app.py with its first request (JOB_WORKERS, default 2;
+0 leaves the queue to a separate process) or standalone:
+
+    python job_worker.py --workers 4
+
+A supervisor thread replaces workers that die and requeues their jobs, and the
+jobs of any worker stuck past JOB_TIMEOUT.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+from models.jobs import claim_next_job, complete_job, fail_job, requeue_stale_jobs, requeue_worker_jobs
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'parser')))
+from utils.logs import get_logger, log_fields
+
+logger = get_logger("job_worker")
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+JOB_TIMEOUT = int(os.getenv("JOB_TIMEOUT", 600))
+# Seconds between two supervisor checks for dead workers and stale jobs
+JOB_SUPERVISE_INTERVAL = float(os.getenv("JOB_SUPERVISE_INTERVAL", 5))
+
+# Workers are spawned, not forked: the API starts them from a request thread,
+# and a fresh interpreter inherits no locks or sockets from it
+_mp = multiprocessing.get_context("spawn")
+
+
+def run_job(job):
+    from parser.cv_parser import process_and_store_resume
+    try:
+        data = process_and_store_resume(job["pdf_path"], profile=bool(job.get("profile")))
+        complete_job(job["id"], data)
+    except Exception as e:
+        logger.exception("job failed", extra=log_fields(job=job["id"]))
+        fail_job(job["id"], f"{type(e).__name__}: {e}")
+
+
+def _worker_loop(poll_interval):
+    # The parser is only imported in the worker processes, not by the API importing this module
+    from parser.cv_parser import warm_up
+    warm_up()
+    while True:
+        job = claim_next_job()
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+        logger.debug("running job", extra=log_fields(worker=os.getpid(), job=job["id"]))
+        run_job(job)
+
+
+class JobWorkerPool:
+    def __init__(self, workers=JOB_WORKERS, poll_interval=0.5, timeout=JOB_TIMEOUT,
+                 supervise_interval=JOB_SUPERVISE_INTERVAL, target=_worker_loop):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.supervise_interval = supervise_interval
+        self.target = target
+        self.processes = []
+        self._stopping = threading.Event()
+        self._supervisor = None
+
+    def _spawn(self):
+        process = _mp.Process(target=self.target, args=(self.poll_interval,), daemon=True)
+        process.start()
+        return process
+
+    def _requeue_stale(self):
+        requeued, failed = requeue_stale_jobs(self.timeout)
+        if requeued or failed:
+            logger.warning("requeued stale jobs", extra=log_fields(jobs=requeued, failed=failed))
+
+    def start(self):
+        self._requeue_stale()
+        self.processes = [self._spawn() for _ in range(self.workers)]
+        self._supervisor = threading.Thread(target=self._supervise, name="job-supervisor", daemon=True)
+        self._supervisor.start()
+        logger.info("job workers started", extra=log_fields(workers=self.workers))
+
+    def supervise_once(self):
+        """Replace dead workers, putting their jobs back in the queue, then requeue stale jobs"""
+        for i, process in enumerate(self.processes):
+            if process.is_alive() or self._stopping.is_set():
+                continue
+            requeued, failed = requeue_worker_jobs(process.pid)
+            logger.warning("job worker died, restarting it", extra=log_fields(
+                worker=process.pid, exitcode=process.exitcode, requeued=requeued, failed=failed))
+            process.close()
+            self.processes[i] = self._spawn()
+        self._requeue_stale()
+
+    def _supervise(self):
+        while not self._stopping.wait(self.supervise_interval):
+            try:
+                self.supervise_once()
+            except Exception:
+                logger.exception("job supervisor check failed")
+
+    def stop(self):
+        self._stopping.set()
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join()
+        self.processes = []
+
+    def join(self):
+        """Wait until stop(); the supervisor keeps the workers running meanwhile"""
+        while not self._stopping.wait(1):
+            pass
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Run resume parsing workers for the upload queue.")
+    arg_parser.add_argument("--workers", type=int, default=JOB_WORKERS)
+    arg_parser.add_argument("--poll-interval", type=float, default=0.5)
+    args = arg_parser.parse_args()
+
+    from models.resume import init_database
+    if not init_database():
+        sys.exit("database initialization failed, see the log above")
+    pool = JobWorkerPool(workers=args.workers, poll_interval=args.poll_interval)
+    pool.start()
+    try:
+        pool.join()
+    except KeyboardInterrupt:
+        pool.stop()
@@ -0,0 +1,230 @@
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import mysql.connector
+from dotenv import load_dotenv
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'parser')))
+from utils.logs import get_logger, log_fields
+from utils.metrics import metrics
+
+load_dotenv()
+
+logger = get_logger("models.db")
+
+DB_NAME = os.getenv("DB_NAME", "cvParser")
+# Connections kept open per process (API, job workers and bulk ingest each have their own pool)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+# Seconds a query function waits for a free connection before giving up
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 5))
+# Connections idle for longer are pinged (and reopened if dead) before being handed out
+DB_POOL_VALIDATE_IDLE = float(os.getenv("DB_POOL_VALIDATE_IDLE", 30))
+# Connections older than this are closed and replaced, ahead of MySQL's wait_timeout
+DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", 3600))
+
+
+class PoolTimeout(mysql.connector.Error):
+    """No connection was released within the checkout timeout"""
+
+
+def _connect():
+    return mysql.connector.connect(
+        host="localhost",
+        user=os.getenv("user"),
+        password=os.getenv("password"),
+        database=DB_NAME
+    )
+
+
+class _Slot:
+    """An open MySQL connection and when it was opened / last returned to the pool"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.opened_at = time.monotonic()
+        self.released_at = self.opened_at
+
+
+class PooledConnection:
+    """
+    A connection borrowed from the pool. It behaves like the underlying MySQL
+    connection, except that close() gives it back to the pool instead of
+    closing the socket, so existing `finally: db.close()` blocks release it.
+    """
+
+    def __init__(self, pool: "ConnectionPool", slot: _Slot):
+        self._pool = pool
+        self._slot = slot
+
+    def __getattr__(self, name):
+        if self._slot is None:
+            raise mysql.connector.InterfaceError("connection already returned to the pool")
+        return getattr(self._slot.connection, name)
+
+    def close(self):
+        if self._slot is not None:
+            slot, self._slot = self._slot, None
+            self._pool.release(slot)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Fixed-size pool of MySQL connections, shared by the threads of one process.
+
+    Connections are opened on demand up to size. A checkout waits up to
+    timeout seconds for one to be released, then raises PoolTimeout (a
+    mysql.connector.Error, so query functions report it like any MySQL error).
+    Connections idle for validate_idle seconds are pinged before use and
+    reopened when the server dropped them; connections past max_lifetime are
+    replaced. Uncommitted work is rolled back on release, which also ends the
+    read snapshot so the next borrower sees fresh rows.
+    """
+
+    def __init__(self, size: int = DB_POOL_SIZE, timeout: float = DB_POOL_TIMEOUT,
+                 validate_idle: float = DB_POOL_VALIDATE_IDLE, max_lifetime: float = DB_POOL_MAX_LIFETIME,
+                 connect=_connect):
+        self.size = size
+        self.timeout = timeout
+        self.validate_idle = validate_idle
+        self.max_lifetime = max_lifetime
+        self._connect = connect
+        # Most recently released last: warm connections are reused first, extra ones age out
+        self._idle: List[_Slot] = []
+        self._available = threading.Condition()
+        self._open = 0
+        self._in_use = 0
+
+    def _close_slot(self, slot: _Slot):
+        """Close a connection whose place in the pool was already given up"""
+        metrics.inc("cvparser_db_pool_connections_total", event="closed")
+        try:
+            slot.connection.close()
+        except Exception:
+            pass
+
+    def _reserve(self, deadline: float) -> Tuple[Optional[_Slot], bool]:
+        """
+        An idle connection, or (None, ...) when a new one may be opened in its
+        place, waiting for one to be released while the pool is full.
+        Also tells whether the caller had to wait.
+        """
+        waited = False
+        with self._available:
+            while True:
+                if self._idle:
+                    return self._idle.pop(), waited
+                if self._open < self.size:
+                    self._open += 1
+                    return None, waited
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(msg=f"no MySQL connection available within {self.timeout}s "
+                                          f"(pool size {self.size})")
+                waited = True
+                self._available.wait(remaining)
+
+    def _give_up_slot(self):
+        with self._available:
+            self._open -= 1
+            self._available.notify()
+
+    def _checkout(self, slot: Optional[_Slot]) -> _Slot:
+        """slot when still usable, else a new connection (opened in its place)"""
+        if slot is not None:
+            now = time.monotonic()
+            if now - slot.opened_at > self.max_lifetime:
+                self._close_slot(slot)
+                slot = None
+            elif now - slot.released_at > self.validate_idle:
+                try:
+                    slot.connection.ping(reconnect=False)
+                except mysql.connector.Error as e:
+                    logger.info("dropped stale connection", extra=log_fields(
+                        idle_seconds=round(now - slot.released_at, 1), error=str(e)))
+                    self._close_slot(slot)
+                    metrics.inc("cvparser_db_pool_connections_total", event="reconnected")
+                    slot = None
+        if slot is None:
+            try:
+                slot = _Slot(self._connect())
+            except Exception:
+                self._give_up_slot()
+                raise
+            metrics.inc("cvparser_db_pool_connections_total", event="opened")
+        return slot
+
+    def acquire(self) -> PooledConnection:
+        start = time.perf_counter()
+        try:
+            slot, waited = self._reserve(time.monotonic() + self.timeout)
+        except PoolTimeout:
+            metrics.inc("cvparser_db_pool_checkouts_total", result="timeout")
+            metrics.observe("cvparser_db_pool_wait_seconds", time.perf_counter() - start)
+            logger.warning("connection pool exhausted", extra=log_fields(size=self.size, timeout=self.timeout))
+            raise
+        try:
+            slot = self._checkout(slot)
+        except Exception:
+            metrics.inc("cvparser_db_pool_checkouts_total", result="error")
+            raise
+        with self._available:
+            self._in_use += 1
+        metrics.inc("cvparser_db_pool_checkouts_total", result="waited" if waited else "immediate")
+        metrics.observe("cvparser_db_pool_wait_seconds", time.perf_counter() - start)
+        return PooledConnection(self, slot)
+
+    def release(self, slot: _Slot):
+        try:
+            slot.connection.rollback()
+            healthy = True
+        except Exception:
+            # Broken mid-query: don't hand it out again
+            healthy = False
+        with self._available:
+            self._in_use -= 1
+            if healthy:
+                slot.released_at = time.monotonic()
+                self._idle.append(slot)
+            else:
+                self._open -= 1
+            self._available.notify()
+        if not healthy:
+            self._close_slot(slot)
+
+    def status(self) -> Dict[str, int]:
+        """Connections of this process's pool: open, in use and idle"""
+        with self._available:
+            return {"size": self.size, "open": self._open, "in_use": self._in_use, "idle": len(self._idle)}
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """The process-wide pool, created on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+
+def _reset_after_fork():
+    # Sockets inherited from the parent belong to its sessions: a forked worker starts its own pool
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,99 @@
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+SKILL_MODES = ("all", "any")
+
+
+@dataclass
+class ResumeFilters:
+    """
+    Filters of GET /resumes/filter. Values within a list are alternatives
+    (a resume in any of cities), except skills and skill_ids under
+    skill_mode="all", where a resume must have every one of them.
+    """
+    keyword: Optional[str] = None            # substring of occupation, status or name
+    cities: List[str] = field(default_factory=list)
+    degree: Optional[str] = None             # substring of a degree type or subject
+    degree_levels: List[str] = field(default_factory=list)  # "Master", "Licence"...: start of a degree type
+    skills: List[str] = field(default_factory=list)         # resolved to skill IDs (see resolve_skill_ids)
+    skill_ids: List[int] = field(default_factory=list)
+    skill_mode: str = "all"
+    min_exp: Optional[int] = None
+    max_exp: Optional[int] = None
+
+    def __post_init__(self):
+        if self.skill_mode not in SKILL_MODES:
+            raise ValueError(f"'skill_mode' must be one of {', '.join(SKILL_MODES)}")
+        if self.min_exp is not None and self.max_exp is not None and self.min_exp > self.max_exp:
+            raise ValueError("'min_exp' is greater than 'max_exp'")
+
+
+def _placeholders(values: Sequence) -> str:
+    return ", ".join(["%s"] * len(values))
+
+
+def skill_groups(filters: ResumeFilters, resolved: List[List[int]]) -> List[List[int]]:
+    """
+    Skill IDs a resume must match, one EXISTS per group. resolved holds the IDs
+    of each name in filters.skills. With skill_mode="all" every name and every
+    ID is its own group; with "any" they form a single group. An empty group
+    matches nothing.
+    """
+    groups = resolved + [[skill_id] for skill_id in filters.skill_ids]
+    if filters.skill_mode == "any" and groups:
+        return [sorted({skill_id for group in groups for skill_id in group})]
+    return groups
+
+
+def build_filter_query(filters: ResumeFilters, groups: List[List[int]]) -> Tuple[str, List]:
+    """
+    FROM/WHERE clause (SQL, values) selecting the resumes r that match filters.
+
+    Resume columns are compared directly (city and exp_years through their
+    indexes); degrees and skills are checked with one correlated EXISTS per
+    condition, a semi-join that stops at the first matching row, so no
+    DISTINCT is needed and a resume never turns into degrees x skills rows.
+    Comparisons rely on the case-insensitive default collation. Each
+    predicate is on its own line to keep EXPLAIN output easy to map back.
+    """
+    clauses = ["FROM resumes r", "WHERE 1=1"]
+    values: List = []
+
+    if filters.cities:
+        clauses.append(f"AND r.city IN ({_placeholders(filters.cities)})")
+        values += filters.cities
+
+    if filters.min_exp is not None and filters.max_exp is not None:
+        clauses.append("AND r.exp_years BETWEEN %s AND %s")
+        values += [filters.min_exp, filters.max_exp]
+    elif filters.min_exp is not None:
+        clauses.append("AND r.exp_years >= %s")
+        values.append(filters.min_exp)
+    elif filters.max_exp is not None:
+        clauses.append("AND r.exp_years <= %s")
+        values.append(filters.max_exp)
+
+    if filters.keyword:
+        clauses.append("AND (r.occupation LIKE %s OR r.status LIKE %s OR r.name LIKE %s)")
+        values += [f"%{filters.keyword}%"] * 3
+
+    if filters.degree_levels:
+        # Prefix matches: a range scan of degrees(degree_type, resume_id)
+        levels = " OR ".join(["d.degree_type LIKE %s"] * len(filters.degree_levels))
+        clauses.append(f"AND EXISTS (SELECT 1 FROM degrees d WHERE d.resume_id = r.id AND ({levels}))")
+        values += [f"{level}%" for level in filters.degree_levels]
+
+    if filters.degree:
+        clauses.append("AND EXISTS (SELECT 1 FROM degrees d WHERE d.resume_id = r.id "
+                       "AND (d.degree_type LIKE %s OR d.degree_subject LIKE %s))")
+        values += [f"%{filters.degree}%"] * 2
+
+    for group in groups:
+        if not group:
+            clauses.append("AND 1=0")  # unknown skill: nothing can match
+            continue
+        clauses.append("AND EXISTS (SELECT 1 FROM resume_skills rs WHERE rs.resume_id = r.id "
+                       f"AND rs.skill_id IN ({_placeholders(group)}))")
+        values += group
+
+    return "\n".join(clauses), values
@@ -0,0 +1,196 @@
+import json
+import os
+import sqlite3
+import time
+import uuid
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Persistent local queue of upload jobs, shared by the API and the parser workers
+JOB_DB_PATH = os.getenv("JOB_QUEUE_PATH", os.path.join(os.path.dirname(__file__), "..", "jobs.sqlite3"))
+JOB_QUEUE_MAX_DEPTH = int(os.getenv("JOB_QUEUE_MAX_DEPTH", 100))
+# Runs of a job whose worker died or timed out before it is failed instead of requeued
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 2))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_initialized = False
+
+
+def get_connection():
+    global _initialized
+    # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+    db = sqlite3.connect(JOB_DB_PATH, timeout=30, isolation_level=None)
+    db.row_factory = sqlite3.Row
+    if not _initialized:
+        init_jobs_table(db)
+        _initialized = True
+    return db
+
+
+def init_jobs_table(db):
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            pdf_path TEXT NOT NULL,
+            state TEXT NOT NULL,
+            result TEXT,
+            error TEXT,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL
+        )
+    """)
+    db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs (state, created_at)")
+    # Added after the first release: queues created before have no profile column
+    columns = {row[1] for row in db.execute("PRAGMA table_info(jobs)")}
+    if "profile" not in columns:
+        db.execute("ALTER TABLE jobs ADD COLUMN profile INTEGER NOT NULL DEFAULT 0")
+    if "attempts" not in columns:
+        db.execute("ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+    if "worker" not in columns:
+        db.execute("ALTER TABLE jobs ADD COLUMN worker INTEGER")  # PID of the process running it
+
+
+def _job_to_dict(row):
+    job = dict(row)
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+
+def new_job_id():
+    return uuid.uuid4().hex
+
+
+def enqueue_job(pdf_path, max_depth=JOB_QUEUE_MAX_DEPTH, profile=False, job_id=None):
+    """
+    Queue a PDF for parsing (under the profiler with profile); refused when max_depth jobs are already waiting.
+    job_id (default: a new one) lets the caller name the upload after its job.
+    """
+    db = None
+    try:
+        db = get_connection()
+        db.execute("BEGIN IMMEDIATE")
+        depth = db.execute("SELECT COUNT(*) FROM jobs WHERE state = ?", (QUEUED,)).fetchone()[0]
+        if max_depth and depth >= max_depth:
+            db.execute("ROLLBACK")
+            return {"status": "queue_full", "message": f"Job queue is full ({depth} waiting), retry later"}
+
+        job_id = job_id or new_job_id()
+        db.execute(
+            "INSERT INTO jobs (id, pdf_path, state, created_at, profile) VALUES (?, ?, ?, ?, ?)",
+            (job_id, pdf_path, QUEUED, time.time(), int(profile))
+        )
+        db.execute("COMMIT")
+        return {"status": "success", "data": {"job_id": job_id, "state": QUEUED, "queue_depth": depth + 1}}
+    except sqlite3.Error as e:
+        return {"status": "error", "message": f"Job queue error: {e}"}
+    finally:
+        if db:
+            db.close()
+
+
+def claim_next_job(worker=None):
+    """
+    Atomically move the oldest queued job to running and return it (None if the queue is empty).
+    worker (default: this process's PID) is recorded so the job can be requeued if it dies.
+    """
+    db = get_connection()
+    try:
+        db.execute("BEGIN IMMEDIATE")
+        row = db.execute(
+            "SELECT id, pdf_path, profile FROM jobs WHERE state = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+        ).fetchone()
+        if row is None:
+            db.execute("ROLLBACK")
+            return None
+        db.execute("UPDATE jobs SET state = ?, started_at = ?, worker = ?, attempts = attempts + 1 WHERE id = ?",
+                   (RUNNING, time.time(), worker or os.getpid(), row["id"]))
+        db.execute("COMMIT")
+        return dict(row)
+    finally:
+        db.close()
+
+
+def complete_job(job_id, result):
+    db = get_connection()
+    try:
+        db.execute(
+            "UPDATE jobs SET state = ?, result = ?, finished_at = ? WHERE id = ?",
+            (DONE, json.dumps(result, default=str), time.time(), job_id)
+        )
+    finally:
+        db.close()
+
+
+def fail_job(job_id, error):
+    db = get_connection()
+    try:
+        db.execute(
+            "UPDATE jobs SET state = ?, error = ?, finished_at = ? WHERE id = ?",
+            (FAILED, str(error), time.time(), job_id)
+        )
+    finally:
+        db.close()
+
+
+def _requeue_running(condition, values, reason, max_attempts):
+    """
+    Put running jobs matching condition back in the queue, or fail them once
+    they used max_attempts runs (a PDF that keeps killing its worker).
+    Returns (requeued, failed).
+    """
+    db = get_connection()
+    try:
+        db.execute("BEGIN IMMEDIATE")
+        failed = db.execute(
+            f"UPDATE jobs SET state = ?, error = ?, finished_at = ?, worker = NULL "
+            f"WHERE state = ? AND attempts >= ? AND {condition}",
+            (FAILED, f"{reason} in all {max_attempts} attempts", time.time(), RUNNING, max_attempts, *values)
+        ).rowcount
+        requeued = db.execute(
+            f"UPDATE jobs SET state = ?, started_at = NULL, worker = NULL WHERE state = ? AND {condition}",
+            (QUEUED, RUNNING, *values)
+        ).rowcount
+        db.execute("COMMIT")
+        return requeued, failed
+    finally:
+        db.close()
+
+
+def requeue_stale_jobs(timeout, max_attempts=JOB_MAX_ATTEMPTS):
+    """Put back jobs left running for more than timeout seconds (e.g. by a crashed worker): (requeued, failed)"""
+    return _requeue_running("started_at < ?", (time.time() - timeout,), "Job timed out", max_attempts)
+
+
+def requeue_worker_jobs(worker, max_attempts=JOB_MAX_ATTEMPTS):
+    """Put back the jobs of a worker process that died: (requeued, failed)"""
+    return _requeue_running("worker = ?", (worker,), "Worker process died", max_attempts)
+
+
+def get_job(job_id):
+    db = None
+    try:
+        db = get_connection()
+        row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row:
+            return {"status": "success", "data": _job_to_dict(row)}
+        return {"status": "not_found", "message": f"No job with ID {job_id}"}
+    except sqlite3.Error as e:
+        return {"status": "error", "message": str(e)}
+    finally:
+        if db:
+            db.close()
+
+
+def get_queue_depth():
+    db = get_connection()
+    try:
+        return db.execute("SELECT COUNT(*) FROM jobs WHERE state = ?", (QUEUED,)).fetchone()[0]
+    finally:
+        db.close()
@@ -1,21 +1,254 @@
 import mysql.connector
 from dotenv import load_dotenv
+import base64
+import functools
+import json
 import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'parser')))
+from models.db import DB_NAME, get_pool
+from models.filters import build_filter_query, skill_groups
+from utils.logs import get_logger, log_fields
+from utils.metrics import metrics
 
 load_dotenv()
 
+logger = get_logger("models.resume")
+
 PDF_DIR = os.path.join(os.path.dirname(__file__), "..", "pdfs")
+# Resume IDs per IN (...) list when loading degrees and skills of a result set
+DETAIL_BATCH_SIZE = int(os.getenv("DETAIL_BATCH_SIZE", 1000))
+# Resumes per page of the list and filter endpoints, unless the caller asks for a limit (up to MAX_PAGE_SIZE)
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", 50))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 500))
+
+RESUME_COLUMNS = ("id", "name", "email", "phone", "occupation", "exp_years", "city", "status", "pdf_path")
+DETAIL_FIELDS = ("degrees", "skills")
+
+
+def timed_query(func):
+    """
+    Record the duration of a query function in cvparser_db_query_seconds, and
+    count it in cvparser_db_errors_total when it raises or reports a failure
+    (None or an "error" status, as the functions below return on MySQL errors).
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = func(*args, **kwargs)
+            failed = result is None or (isinstance(result, dict) and result.get("status") == "error")
+            return result
+        finally:
+            metrics.observe("cvparser_db_query_seconds", time.perf_counter() - start, query=func.__name__)
+            if failed:
+                metrics.inc("cvparser_db_errors_total", query=func.__name__)
+    return wrapper
+
 
 def get_connection():
-    return mysql.connector.connect(
-        host="localhost",
-        user=os.getenv("user"),
-        password=os.getenv("password"),
-        database="cvParser"
-    )
+    """A connection borrowed from the process's pool; db.close() gives it back"""
+    return get_pool().acquire()
+
+def encode_cursor(last_id):
+    """Opaque cursor for the page after the resume with ID last_id"""
+    return base64.urlsafe_b64encode(json.dumps({"after": last_id}).encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Resume ID a cursor from encode_cursor() resumes after; ValueError when it is malformed"""
+    try:
+        after = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))["after"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+    if not isinstance(after, int):
+        raise ValueError(f"Invalid cursor: {token!r}")
+    return after
+
+
+def parse_fields(value):
+    """
+    Validated projection from a comma-separated fields list (None: every field).
+    id is always included, since pages are keyed on it.
+    """
+    if not value:
+        return None
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in RESUME_COLUMNS + DETAIL_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return ["id"] + [field for field in fields if field != "id"]
+
+
+def _select_list(fields, alias="r"):
+    columns = RESUME_COLUMNS if fields is None else [f for f in fields if f in RESUME_COLUMNS]
+    return ", ".join(f"{alias}.{column}" for column in columns)
+
+
+def _page(cursor, rows, limit, fields):
+    """
+    Trim the limit + 1 rows fetched for a page to limit, embed the requested
+    details and build the pagination part of the response
+    """
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    attach_details(cursor, rows,
+                   degrees=fields is None or "degrees" in fields,
+                   skills=fields is None or "skills" in fields)
+    return rows, encode_cursor(rows[-1]["id"]) if has_more else None
+
+
+# (table, index name, columns) of the secondary indexes used by lookups and filters
+INDEXES = (
+    ("resumes", "idx_resumes_email", "email"),
+    ("resumes", "idx_resumes_city", "city"),
+    ("resumes", "idx_resumes_exp_years", "exp_years"),
+    ("degrees", "idx_degrees_type", "degree_type, resume_id"),
+)
+
+
+def _table_exists(cursor, table):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, (table,))
+    return cursor.fetchone()[0] > 0
+
+
+def _ensure_index(cursor, table, name, columns):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+    """, (table, name))
+    if cursor.fetchone()[0] == 0:
+        cursor.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+        logger.info("index created", extra=log_fields(table=table, index=name))
+
+
+class MigrationError(Exception):
+    """A migration check failed; the transaction was rolled back and the old data kept"""
+
+
+def _migration_applied(cursor, name):
+    cursor.execute("SELECT COUNT(*) FROM schema_migrations WHERE name = %s", (name,))
+    return cursor.fetchone()[0] > 0
+
+
+def _migrate_skills(cursor):
+    """
+    Copy the former per-resume skills table (resume_id, skill_name) into
+    skill_names + resume_skills. The old table is renamed to skills_legacy
+    first and kept; the copy runs in one transaction that is only committed
+    when every old row is accounted for.
+    """
+    if _table_exists(cursor, "skills") and not _table_exists(cursor, "skills_legacy"):
+        cursor.execute("RENAME TABLE skills TO skills_legacy")
+    if not _table_exists(cursor, "skills_legacy"):
+        return
+
+    cursor.execute("START TRANSACTION")
+    # Names equal under the collation (case, accents) become one canonical skill
+    cursor.execute("""
+        INSERT INTO skill_names (name)
+        SELECT MIN(s.skill_name) FROM skills_legacy s
+        WHERE NOT EXISTS (SELECT 1 FROM skill_names n WHERE n.name = s.skill_name)
+        GROUP BY s.skill_name
+    """)
+    cursor.execute("""
+        INSERT INTO resume_skills (resume_id, skill_id, position)
+        SELECT s.resume_id, n.id, MIN(s.id)
+        FROM skills_legacy s
+        JOIN skill_names n ON n.name = s.skill_name
+        GROUP BY s.resume_id, n.id
+    """)
+    copied = cursor.rowcount
+
+    cursor.execute("SELECT COUNT(*) FROM skills_legacy")
+    legacy_rows = cursor.fetchone()[0]
+    cursor.execute("""
+        SELECT COUNT(*) FROM skills_legacy s
+        WHERE NOT EXISTS (SELECT 1 FROM skill_names n WHERE n.name = s.skill_name)
+    """)
+    unmatched = cursor.fetchone()[0]
+    cursor.execute("""
+        SELECT COUNT(DISTINCT s.resume_id, n.id)
+        FROM skills_legacy s
+        JOIN skill_names n ON n.name = s.skill_name
+    """)
+    expected = cursor.fetchone()[0]
+    if unmatched or copied != expected:
+        cursor.execute("ROLLBACK")
+        raise MigrationError(f"skills migration: {legacy_rows} old rows, {unmatched} without a canonical name, "
+                             f"{copied} links copied for {expected} expected; skills_legacy left untouched")
+
+    cursor.execute("INSERT INTO schema_migrations (name) VALUES (%s)", ("skills_to_resume_skills",))
+    cursor.execute("COMMIT")
+    logger.info("skills migrated to skill_names and resume_skills, old rows kept in skills_legacy",
+                extra=log_fields(legacy_rows=legacy_rows, links=copied))
+
+
+def migrate_schema(cursor):
+    """
+    Bring an existing database up to the current schema; safe to run again and
+    from several processes at once (a MySQL named lock serializes them).
+    """
+    cursor.execute("SELECT GET_LOCK('cvparser_migrate_schema', 60)")
+    if cursor.fetchone()[0] != 1:
+        raise MigrationError("another process held the schema migration lock for 60s")
+    try:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                name VARCHAR(100) PRIMARY KEY,
+                applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        if not _migration_applied(cursor, "skills_to_resume_skills"):
+            _migrate_skills(cursor)
+
+        for table, name, columns in INDEXES:
+            _ensure_index(cursor, table, name, columns)
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK('cvparser_migrate_schema')")
+        cursor.fetchone()
+
+
+def _skill_rows(skills):
+    """Derived table (SQL, values) of (name, position) rows for the skills of one resume"""
+    sql = " UNION ALL ".join(["SELECT %s AS name, %s AS position"] * len(skills))
+    values = [value for position, skill in enumerate(skills) for value in (skill, position)]
+    return sql, values
+
+
+def insert_resume_skills(cursor, resume_id, skills):
+    """
+    Link a resume to its skills in two statements, adding the names missing
+    from skill_names. Names are matched by the column collation, so a skill
+    spelled differently in case or accents reuses the existing ID.
+    """
+    if not skills:
+        return
+    rows, values = _skill_rows(skills)
+    cursor.execute(f"""
+        INSERT IGNORE INTO skill_names (name)
+        SELECT DISTINCT v.name FROM ({rows}) v
+        WHERE NOT EXISTS (SELECT 1 FROM skill_names n WHERE n.name = v.name)
+    """, tuple(values))
+    cursor.execute(f"""
+        INSERT IGNORE INTO resume_skills (resume_id, skill_id, position)
+        SELECT %s, n.id, v.position FROM ({rows}) v
+        JOIN skill_names n ON n.name = v.name
+        ORDER BY v.position
+    """, (resume_id, *values))
+
 
 def init_database():
-    """Initialize database and create tables"""
+    """
+    Create the tables and migrate an existing database (see migrate_schema).
+    Run at startup by app.py, job_worker.py and bulk_ingest.py; returns False on failure.
+    """
     db = None
     cursor = None
 
@@ -23,8 +256,8 @@ def init_database():
         db = get_connection()
         cursor = db.cursor()
 
-        cursor.execute("CREATE DATABASE IF NOT EXISTS cvParser")
-        cursor.execute("USE cvParser")
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{DB_NAME}`")
+        cursor.execute(f"USE `{DB_NAME}`")
 
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS resumes (
@@ -50,30 +283,51 @@ def init_database():
             )
         """)
 
+        # Canonical skill names: UNIQUE under the default case- and accent-insensitive
+        # collation, so "python" and "Python" share one ID
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS skills (
+            CREATE TABLE IF NOT EXISTS skill_names (
                 id INT AUTO_INCREMENT PRIMARY KEY,
+                name VARCHAR(100) NOT NULL,
+                UNIQUE KEY uq_skill_names_name (name)
+            )
+        """)
+
+        # position keeps each resume's skills in extraction order
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS resume_skills (
                 resume_id INT NOT NULL,
-                skill_name VARCHAR(100) NOT NULL,
-                FOREIGN KEY (resume_id) REFERENCES resumes(id) ON DELETE CASCADE
+                skill_id INT NOT NULL,
+                position INT NOT NULL,
+                PRIMARY KEY (resume_id, skill_id),
+                KEY idx_resume_skills_skill (skill_id, resume_id),
+                FOREIGN KEY (resume_id) REFERENCES resumes(id) ON DELETE CASCADE,
+                FOREIGN KEY (skill_id) REFERENCES skill_names(id)
             )
         """)
 
-        print("[✓] Tables created successfully.")
+        migrate_schema(cursor)
+        db.commit()
+        logger.info("tables created")
+        return True
 
-    except mysql.connector.Error as e:
-        print(f"[!] MySQL Error: {e}")
+    except (mysql.connector.Error, MigrationError) as e:
+        logger.error("database initialization failed", extra=log_fields(error=str(e)))
     except Exception as e:
-        print(f"[!] Unexpected Error: {e}")
+        logger.exception("unexpected error", extra=log_fields(error=str(e)))
     finally:
         if cursor:
             cursor.close()
         if db:
             db.close()
+    return False
 
 
+@timed_query
 def add_resume(data):
     resume_id = None
+    db = None
+    cursor = None
     try:
         db = get_connection()
         cursor = db.cursor()
@@ -105,22 +359,18 @@ def add_resume(data):
             """, (resume_id, degree_type, degree_subject))
 
 
-        for skill in data.get('skills', []):
-            cursor.execute("""
-                INSERT INTO skills (resume_id, skill_name)
-                VALUES (%s, %s)
-            """, (resume_id, skill))
+        insert_resume_skills(cursor, resume_id, data.get('skills', []))
 
         db.commit()
-        print(f"[+] Resume '{data['name']}' inserted with ID {resume_id}.")
+        logger.info("resume inserted", extra=log_fields(id=resume_id))
         return resume_id
 
     except mysql.connector.IntegrityError as e:
-        print(f"[!] Integrity Error: {e}")
+        logger.error("integrity error", extra=log_fields(error=str(e)))
     except mysql.connector.Error as e:
-        print(f"[!] MySQL Error: {e}")
+        logger.error("MySQL error", extra=log_fields(error=str(e)))
     except Exception as e:
-        print(f"[!] Unexpected Error: {e}")
+        logger.exception("unexpected error", extra=log_fields(error=str(e)))
     finally:
         try:
             if cursor:
@@ -132,7 +382,72 @@ def add_resume(data):
     return None
 
 
+@timed_query
+def add_resumes(resumes):
+    """
+    Insert a batch of parsed resumes in a single transaction.
+    A resume that fails (e.g. duplicate phone) is rolled back on its own and
+    reported as None; the rest of the batch is still committed.
+    Returns the list of new IDs, aligned with the input.
+    """
+    resume_ids = []
+    db = None
+    cursor = None
+    try:
+        db = get_connection()
+        cursor = db.cursor()
+
+        for data in resumes:
+            cursor.execute("SAVEPOINT resume_insert")
+            try:
+                pdf_filename = os.path.basename(data['pdf_path']) if data.get('pdf_path') else None
+                cursor.execute("""
+                    INSERT INTO resumes (name, email, phone, occupation, exp_years, city, status, pdf_path)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                """, (
+                    data['name'], data['email'], data['phone'], data.get('occupation'),
+                    data.get('exp_years'), data.get('city'), data.get('status'), pdf_filename
+                ))
+                resume_id = cursor.lastrowid
+
+                degrees = [(resume_id, degree, None) for degree in data.get('degrees', [])]
+                if degrees:
+                    cursor.executemany("""
+                        INSERT INTO degrees (resume_id, degree_type, degree_subject)
+                        VALUES (%s, %s, %s)
+                    """, degrees)
+
+                insert_resume_skills(cursor, resume_id, data.get('skills', []))
+
+                resume_ids.append(resume_id)
+            except mysql.connector.Error as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT resume_insert")
+                logger.error("MySQL error, resume skipped", extra=log_fields(file=data.get('pdf_path'), error=str(e)))
+                resume_ids.append(None)
+
+        db.commit()
+        logger.info("resume batch inserted", extra=log_fields(resumes=len(resumes), failed=resume_ids.count(None)))
+        return resume_ids
+
+    except mysql.connector.Error as e:
+        logger.error("MySQL error", extra=log_fields(error=str(e)))
+    except Exception as e:
+        logger.exception("unexpected error", extra=log_fields(error=str(e)))
+    finally:
+        try:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+        except:
+            pass
+    return [None] * len(resumes)
+
+
+@timed_query
 def delete_resume(resume_id):
+    db = None
+    cursor = None
     try:
         db = get_connection()
         cursor = db.cursor()
@@ -153,7 +468,7 @@ def delete_resume(resume_id):
 
         if os.path.exists(pdf_full_path):
             os.remove(pdf_full_path)
-            print(f"[Debug] Deleted resume with ID {resume_id} and removed PDF file {pdf_filename}.")
+            logger.debug("resume deleted", extra=log_fields(id=resume_id, file=pdf_filename))
 
         
         return {"status": "success", "message": f"Resume with ID {resume_id} deleted."}
@@ -172,32 +487,52 @@ def delete_resume(resume_id):
             pass
 
 
-def get_all_resumes():
+@timed_query
+def get_all_resumes(limit=DEFAULT_PAGE_SIZE, after=None, fields=None, include_total=False):
+    """
+    One page of resumes in ID order: at most limit resumes with an ID above
+    after (see decode_cursor), restricted to fields when given.
+    The result carries next_cursor (None on the last page) and, with
+    include_total, the number of resumes over all pages.
+    """
+    db = None
+    cursor = None
     try:
         db = get_connection()
         cursor = db.cursor(dictionary=True)
 
-        cursor.execute("SELECT * FROM resumes")
-        resumes = cursor.fetchall()
-
-        for resume in resumes:
-            resume_id = resume['id']
-            resume['degrees'] = fetch_degrees(cursor, resume_id)
-            resume['skills'] = fetch_skills(cursor, resume_id)
+        cursor.execute(f"""
+            SELECT {_select_list(fields)}
+            FROM resumes r
+            WHERE r.id > %s
+            ORDER BY r.id
+            LIMIT %s
+        """, (after if after is not None else 0, limit + 1))
+        resumes, next_cursor = _page(cursor, cursor.fetchall(), limit, fields)
 
-        return {
+        result = {
             "status": "success",
             "data": resumes,
+            "next_cursor": next_cursor,
             "message": "Resumes retrieved." if resumes else "No resumes found."
         }
+        if include_total:
+            cursor.execute("SELECT COUNT(*) AS total FROM resumes")
+            result["total"] = cursor.fetchone()["total"]
+        return result
     except mysql.connector.Error as e:
         return {"status": "error", "message": str(e)}
     finally:
-        cursor.close()
-        db.close()
+        if cursor:
+            cursor.close()
+        if db:
+            db.close()
 
 
+@timed_query
 def get_resume_by_id(resume_id):
+    db = None
+    cursor = None
     try:
         db = get_connection()
         cursor = db.cursor(dictionary=True)
@@ -206,19 +541,23 @@ def get_resume_by_id(resume_id):
         resume = cursor.fetchone()
 
         if resume:
-            resume['degrees'] = fetch_degrees(cursor, resume_id)
-            resume['skills'] = fetch_skills(cursor, resume_id)
+            attach_details(cursor, [resume])
             return {"status": "success", "data": resume}
         else:
             return {"status": "not_found", "message": f"No resume with ID {resume_id}"}
     except mysql.connector.Error as e:
         return {"status": "error", "message": str(e)}
     finally:
-        cursor.close()
-        db.close()
+        if cursor:
+            cursor.close()
+        if db:
+            db.close()
 
 
+@timed_query
 def get_resume_by_email(email):
+    db = None
+    cursor = None
     try:
         db = get_connection()
         cursor = db.cursor(dictionary=True)
@@ -227,20 +566,23 @@ def get_resume_by_email(email):
         resume = cursor.fetchone()
 
         if resume:
-            resume_id = resume['id']
-            resume['degrees'] = fetch_degrees(cursor, resume_id)
-            resume['skills'] = fetch_skills(cursor, resume_id)
+            attach_details(cursor, [resume])
             return {"status": "success", "data": resume}
         else:
             return {"status": "not_found", "message": f"No resume found for email {email}"}
     except mysql.connector.Error as e:
         return {"status": "error", "message": str(e)}
     finally:
-        cursor.close()
-        db.close()
+        if cursor:
+            cursor.close()
+        if db:
+            db.close()
 
 
+@timed_query
 def get_resumes_by_name(name):
+    db = None
+    cursor = None
     try:
         db = get_connection()
         cursor = db.cursor(dictionary=True)
@@ -248,79 +590,155 @@ def get_resumes_by_name(name):
         resume = cursor.fetchone()
 
         if resume:
-            resume_id = resume['id']
-            resume['degrees'] = fetch_degrees(cursor, resume_id)
-            resume['skills'] = fetch_skills(cursor, resume_id)
+            attach_details(cursor, [resume])
             return {"status": "success", "data": resume}
         else:
             return {"status": "not_found", "message": f"No resumes found with name like '{name}'"}
     except mysql.connector.Error as e:
         return {"status": "error", "message": str(e)}
     finally:
-        cursor.close()
-        db.close()
+        if cursor:
+            cursor.close()
+        if db:
+            db.close()
 
-def apply_filters(keyword=None, city=None, degree=None, skill=None, min_exp=None):
+@timed_query
+def apply_filters(filters, limit=DEFAULT_PAGE_SIZE, after=None, fields=None, include_total=False):
+    """
+    One page of the resumes matching filters (a ResumeFilters), paginated
+    like get_all_resumes. Skill names are resolved to skill IDs first, then
+    the query is built by build_filter_query.
+    """
+    db = None
+    cursor = None
     try:
         db = get_connection()
         cursor = db.cursor(dictionary=True)
 
-        query = """
-        SELECT DISTINCT r.*
-        FROM resumes r
-        LEFT JOIN degrees d ON r.id = d.resume_id
-        LEFT JOIN skills s ON r.id = s.resume_id
-        WHERE 1=1
-        """
-        values = []
-
-        if keyword:
-            query += " AND (LOWER(r.occupation) LIKE LOWER(%s) OR LOWER(r.status) LIKE LOWER(%s) OR LOWER(r.name) LIKE LOWER(%s))"
-            values += [f"%{keyword}%", f"%{keyword}%", f"%{keyword}%"]
-
-        if city:
-            query += " AND r.city = %s"
-            values.append(city)
+        groups = skill_groups(filters, [resolve_skill_ids(cursor, skill) for skill in filters.skills])
+        query, values = build_filter_query(filters, groups)
 
-        if degree:
-            query += " AND (LOWER(d.degree_type) LIKE %s OR LOWER(d.degree_subject) LIKE %s)"
-            values += [f"%{degree}%", f"%{degree}%"]
+        cursor.execute(f"SELECT {_select_list(fields)}\n{query}\nAND r.id > %s\nORDER BY r.id\nLIMIT %s",
+                       tuple(values) + (after if after is not None else 0, limit + 1))
+        # Embed degrees and skills, with two queries for the whole page
+        results, next_cursor = _page(cursor, cursor.fetchall(), limit, fields)
 
-        if skill:
-            query += " AND LOWER(s.skill_name) LIKE LOWER(%s)"
-            values.append(f"%{skill}%")
+        result = {
+            "status": "success",
+            "data": results,
+            "next_cursor": next_cursor,
+            "message": f"{len(results)} resume(s) matched filters" if results else "No results"
+        }
+        if include_total:
+            cursor.execute(f"SELECT COUNT(*) AS total\n{query}", tuple(values))
+            result["total"] = cursor.fetchone()["total"]
+        return result
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+    finally:
+        if cursor:
+            cursor.close()
+        if db:
+            db.close()
 
-        if min_exp:
-            query += " AND r.exp_years >= %s"
-            values.append(int(min_exp))
 
-        cursor.execute(query, tuple(values))
-        results = cursor.fetchall()
+@timed_query
+def resolve_skill_ids(cursor, skill):
+    """
+    IDs of the canonical skills whose name contains skill (case-insensitive).
+    Only the skill_names dictionary is scanned; resumes are then matched by ID.
+    """
+    cursor.execute("SELECT id FROM skill_names WHERE name LIKE %s", (f"%{skill}%",))
+    return [row['id'] for row in cursor.fetchall()]
 
-        # Embed degrees and skills for each result
-        for resume in results:
-            resume_id = resume['id']
-            resume['degrees'] = fetch_degrees(cursor, resume_id)
-            resume['skills'] = fetch_skills(cursor, resume_id)
 
+@timed_query
+def get_skill_names(query=None, limit=DEFAULT_PAGE_SIZE):
+    """Canonical skills (id, name, number of resumes), most common first, optionally containing query"""
+    db = None
+    cursor = None
+    try:
+        db = get_connection()
+        cursor = db.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT n.id, n.name, COUNT(rs.resume_id) AS resumes
+            FROM skill_names n
+            LEFT JOIN resume_skills rs ON rs.skill_id = n.id
+            WHERE n.name LIKE %s
+            GROUP BY n.id, n.name
+            ORDER BY resumes DESC, n.name
+            LIMIT %s
+        """, (f"%{query or ''}%", limit))
+        skills = cursor.fetchall()
         return {
             "status": "success",
-            "data": results,
-            "message": f"{len(results)} resume(s) matched filters" if results else "No results"
+            "data": skills,
+            "message": f"{len(skills)} skill(s) found" if skills else "No skills found"
         }
-    except Exception as e:
+    except mysql.connector.Error as e:
         return {"status": "error", "message": str(e)}
     finally:
-        cursor.close()
-        db.close()
-
+        if cursor:
+            cursor.close()
+        if db:
+            db.close()
 
-def fetch_degrees(cursor, resume_id):
-    cursor.execute("SELECT DISTINCT degree_type, degree_subject FROM degrees WHERE resume_id = %s", (resume_id,))
-    return cursor.fetchall()
 
-def fetch_skills(cursor, resume_id):
-    cursor.execute("SELECT skill_name FROM skills WHERE resume_id = %s", (resume_id,))
-    return [row['skill_name'] for row in cursor.fetchall()]
+def _chunks(ids, size=DETAIL_BATCH_SIZE):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+@timed_query
+def fetch_degrees(cursor, resume_ids):
+    """resume ID -> its distinct degrees, in insertion order, with one query per DETAIL_BATCH_SIZE resumes"""
+    degrees = {resume_id: [] for resume_id in resume_ids}
+    for chunk in _chunks(list(degrees)):
+        placeholders = ", ".join(["%s"] * len(chunk))
+        cursor.execute(f"""
+            SELECT resume_id, degree_type, degree_subject
+            FROM degrees
+            WHERE resume_id IN ({placeholders})
+            GROUP BY resume_id, degree_type, degree_subject
+            ORDER BY resume_id, MIN(id)
+        """, tuple(chunk))
+        for row in cursor.fetchall():
+            degrees[row['resume_id']].append(
+                {'degree_type': row['degree_type'], 'degree_subject': row['degree_subject']})
+    return degrees
+
+
+@timed_query
+def fetch_skills(cursor, resume_ids):
+    """resume ID -> its skill names, in insertion order, with one query per DETAIL_BATCH_SIZE resumes"""
+    skills = {resume_id: [] for resume_id in resume_ids}
+    for chunk in _chunks(list(skills)):
+        placeholders = ", ".join(["%s"] * len(chunk))
+        cursor.execute(f"""
+            SELECT rs.resume_id, n.name AS skill_name
+            FROM resume_skills rs
+            JOIN skill_names n ON n.id = rs.skill_id
+            WHERE rs.resume_id IN ({placeholders})
+            ORDER BY rs.resume_id, rs.position
+        """, tuple(chunk))
+        for row in cursor.fetchall():
+            skills[row['resume_id']].append(row['skill_name'])
+    return skills
+
+
+def attach_details(cursor, resumes, degrees=True, skills=True):
+    """Embed 'degrees' and/or 'skills' in each resume row (a dictionary cursor is expected)"""
+    resume_ids = [resume['id'] for resume in resumes]
+    if not resume_ids:
+        return resumes
+    if degrees:
+        by_resume = fetch_degrees(cursor, resume_ids)
+        for resume in resumes:
+            resume['degrees'] = by_resume[resume['id']]
+    if skills:
+        by_resume = fetch_skills(cursor, resume_ids)
+        for resume in resumes:
+            resume['skills'] = by_resume[resume['id']]
+    return resumes
 
 # todo: add update_resume method if needed
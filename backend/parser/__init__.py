@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Modules of this package import each other as top-level modules
+# (layout_analyser, utils.helper, utils.resources); make that resolvable
+# however the package is entered so that every module is loaded only once.
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
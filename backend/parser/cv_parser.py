@@ -1,81 +1,345 @@
 import sys
 import os
 import pprint
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from parser.name_city_extraction import extract_name, extract_city
 from parser.email_phone_extraction import extract_email, extract_phone_number
 from parser.degree_extraction import extract_degrees
-from parser.status_occupation_extraction import extract_occupation, extract_status
+from parser.status_occupation_extraction import extract_occupation, extract_status, scan_status_occupation
 from parser.skills_experience_extraction import extract_skills, extract_experience_years
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from layout_analyser import PyMuPDFLayoutAnalyzer
-from utils.helper import Helper
+from utils.resources import get_helper, registry, warm_up
+from utils.parse_cache import cache_key, get_parse_cache
+from utils.ocr_cache import get_ocr_cache
+from utils.logs import get_logger, log_fields
+from utils.metrics import metrics
+from utils.profiling import profile_call, profile_reason
 from models.resume import add_resume
-helper = Helper()
+helper = get_helper()
+logger = get_logger("cv_parser")
 
+# Part of the parse cache key: bump whenever extraction output changes
+PARSER_VERSION = "6"
+
+# Fields _extract_incremental fills page by page: the only ones streaming can wait for
+INCREMENTAL_FIELDS = ("name", "email", "phone", "skills", "exp_years")
+
+
+@contextmanager
+def _stage(timings: Optional[Dict[str, float]], name: str):
+    """Accumulate the wall time of a pipeline stage into timings (if given)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+def _record_ocr(timings: Optional[Dict[str, float]], analyzer: PyMuPDFLayoutAnalyzer):
+    """OCR time summed over pages (they run in parallel, inside the layout stage), page and OCR counters"""
+    if timings is not None and analyzer.ocr_results:
+        timings["ocr"] = timings.get("ocr", 0.0) + sum(
+            r.seconds for results in analyzer.ocr_results.values() for r in results)
+
+    for kind in analyzer.page_kinds.values():
+        metrics.inc("cvparser_pages_total", kind=kind)
+    ocr_cache = get_ocr_cache()
+    for page_num, results in analyzer.ocr_results.items():
+        target = "page" if analyzer.page_kinds.get(page_num) == "scanned" else "region"
+        for r in results:
+            metrics.inc("cvparser_ocr_total", target=target, backend=r.backend)
+            if ocr_cache is not None:
+                metrics.inc("cvparser_cache_requests_total", cache="ocr",
+                            result="hit" if r.backend == "cache" else "miss")
+
+
+def _record_document(timings: Dict[str, float], start: float, result: str,
+                     caller_timings: Optional[Dict[str, float]]):
+    """Stage and end to end latencies of one document; the caller's timings get the stage durations"""
+    for stage, seconds in timings.items():
+        metrics.observe("cvparser_stage_seconds", seconds, stage=stage)
+    metrics.observe("cvparser_parse_seconds", time.perf_counter() - start, result=result)
+    metrics.inc("cvparser_documents_total", result=result)
+    metrics.flush()
+    if caller_timings is not None:
+        for stage, seconds in timings.items():
+            caller_timings[stage] = caller_timings.get(stage, 0.0) + seconds
+
+
+def _cache_lookup(pdf_path, timings: Optional[Dict[str, float]], use_cache: bool):
+    """(cache, key, cached result or None); cache is None when disabled"""
+    cache = get_parse_cache() if use_cache else None
+    if cache is None:
+        return None, None, None
+    with _stage(timings, "cache"):
+        key = cache_key(pdf_path, PARSER_VERSION)
+        cached = cache.get(key)
+    metrics.inc("cvparser_cache_requests_total", cache="parse", result="miss" if cached is None else "hit")
+    if cached is not None:
+        logger.debug("parse cache hit", extra=log_fields(file=pdf_path))
+        cached["pdf_path"] = pdf_path
+    return cache, key, cached
+
+
+def parse_pdf_to_data(pdf_path, timings: Optional[Dict[str, float]] = None, use_cache: bool = True):
+    """
+    Parse a PDF resume; per-stage durations (seconds) are added to timings if provided.
+    Identical PDFs (same bytes, same config and parser version) are served from the parse cache.
+    """
+    start = time.perf_counter()
+    stage_timings: Dict[str, float] = {}
+    try:
+        cache, key, cached = _cache_lookup(pdf_path, stage_timings, use_cache)
+        if cached is not None:
+            _record_document(stage_timings, start, "cached", timings)
+            return cached
+
+        resume_data = _parse_pdf(pdf_path, stage_timings)
+        if cache is not None:
+            cache.put(key, resume_data)
+    except Exception:
+        _record_document(stage_timings, start, "error", timings)
+        raise
+    _record_document(stage_timings, start, "parsed", timings)
+    return resume_data
+
+
+def check_required_fields(required_fields: Optional[Iterable[str]]) -> List[str]:
+    """required_fields as a list; ValueError for a field that streaming never fills"""
+    required_fields = list(required_fields or [])
+    unknown = [f for f in required_fields if f not in INCREMENTAL_FIELDS]
+    if unknown:
+        raise ValueError(f"cannot wait for {', '.join(unknown)}: 'required' accepts {', '.join(INCREMENTAL_FIELDS)}")
+    return required_fields
+
+
+def stream_parse_pdf(pdf_path, required_fields: Optional[Iterable[str]] = None,
+                     timings: Optional[Dict[str, float]] = None, use_cache: bool = True) -> Iterator[dict]:
+    """
+    Parse a PDF resume page by page, yielding events as soon as results are known:
+
+        {"event": "page", "page": 1, "pages": 3, "fields": {...}}  fields found or changed by this page
+        {"event": "result", "complete": True, "data": {...}}        same data as parse_pdf_to_data
+
+    Name, email, phone, skills and exp_years are looked for on the text parsed so
+    far only until found, so a long CV is not rescanned after every page; the
+    result recomputes skills and exp_years over the whole text. With
+    required_fields, parsing stops after the first page where all of them are
+    known and the OCR of the remaining pages is cancelled: the result is then
+    partial (complete False) and holds only the incremental fields; it is not cached.
+    required_fields must be among INCREMENTAL_FIELDS (ValueError, raised right away).
+    """
+    return _timed_stream(pdf_path, check_required_fields(required_fields), timings, use_cache)
+
+
+def _timed_stream(pdf_path, required_fields: List[str], timings: Optional[Dict[str, float]],
+                  use_cache: bool) -> Iterator[dict]:
+    start = time.perf_counter()
+    stage_timings: Dict[str, float] = {}
+    try:
+        result = yield from _stream_parse(pdf_path, required_fields, stage_timings, use_cache)
+    except Exception:
+        _record_document(stage_timings, start, "error", timings)
+        raise
+    _record_document(stage_timings, start, result, timings)
+
+
+def _stream_parse(pdf_path, required_fields: List[str], timings: Dict[str, float],
+                  use_cache: bool) -> Iterator[dict]:
+    """Events of stream_parse_pdf; returns how the document ended (cached, partial or parsed)"""
+    cache, key, cached = _cache_lookup(pdf_path, timings, use_cache)
+    if cached is not None:
+        yield {"event": "result", "complete": True, "data": cached}
+        return "cached"
 
-def parse_pdf_to_data(pdf_path):
     analyzer = PyMuPDFLayoutAnalyzer(pdf_path)
-    text = analyzer.extract_with_layout_analysis()
-    
-    # Preprocess text
-    processed_text = helper.preprocess_text(text)
-    language = helper.detect_language(processed_text)
-    cities = [city.lower() for city in  helper.cities]
+    pages = len(analyzer.doc)
+    fields = {}
+    text = ""
+    # Fields still computed at the last page were computed on the full text
+    full_text_fields = set()
+    page_iter = analyzer.iter_pages()
+    try:
+        while True:
+            with _stage(timings, "layout"):
+                page = next(page_iter, None)
+            if page is None:
+                break
+            page_num, page_text = page
+            text += page_text + "\n\n"
+            updates, full_text_fields = _extract_incremental(text.strip(), analyzer, fields, timings)
+            fields.update(updates)
+            yield {"event": "page", "page": page_num + 1, "pages": pages, "fields": updates}
+
+            if required_fields and page_num + 1 < pages and all(fields.get(f) for f in required_fields):
+                # Closing the page generator cancels the OCR of the pages left
+                page_iter.close()
+                _record_ocr(None, analyzer)
+                yield {"event": "result", "complete": False, "data": {**fields, "pdf_path": pdf_path}}
+                return "partial"
+    finally:
+        page_iter.close()
+
+    _record_ocr(timings, analyzer)
+    resume_data = _extract_fields(pdf_path, text.strip(), analyzer, timings,
+                                  known={f: fields[f] for f in full_text_fields if f in fields})
+    if cache is not None:
+        cache.put(key, resume_data)
+    yield {"event": "result", "complete": True, "data": resume_data}
+    return "parsed"
+
+
+def _extract_incremental(text: str, analyzer: PyMuPDFLayoutAnalyzer, fields: dict,
+                         timings: Optional[Dict[str, float]] = None) -> Tuple[dict, Set[str]]:
+    """
+    Fields found in the text parsed so far (fields holds the previous values),
+    and which of skills and exp_years were computed on it: each is only
+    computed until found.
+    """
+    updates = {}
+    if not fields.get("name"):
+        with _stage(timings, "name"):
+            name = extract_name(text, analyzer)
+        if name:
+            updates["name"] = name
+    with _stage(timings, "email_phone"):
+        if not fields.get("email"):
+            email = extract_email(text)
+            if email:
+                updates["email"] = email
+        if not fields.get("phone"):
+            phone = extract_phone_number(text)
+            if phone:
+                updates["phone"] = phone
+
+    computed = {f for f in ("exp_years", "skills") if not fields.get(f)}
+    if not computed:
+        return updates, computed
+    with _stage(timings, "preprocess"):
+        sections = helper.build_section_index(text)
+    if "exp_years" in computed:
+        with _stage(timings, "experience"):
+            exp_years = extract_experience_years(sections.get("experience"))
+        if exp_years != fields.get("exp_years"):
+            updates["exp_years"] = exp_years
+    if "skills" in computed:
+        with _stage(timings, "skills"):
+            skills = extract_skills(text, sections=sections)
+        if skills != fields.get("skills"):
+            updates["skills"] = skills
+    return updates, computed
+
+
+def _parse_pdf(pdf_path, timings: Optional[Dict[str, float]] = None):
+    with _stage(timings, "layout"):
+        analyzer = PyMuPDFLayoutAnalyzer(pdf_path)
+        text = analyzer.extract_with_layout_analysis()
+    _record_ocr(timings, analyzer)
+    return _extract_fields(pdf_path, text, analyzer, timings)
+
+
+def _extract_fields(pdf_path, text: str, analyzer: PyMuPDFLayoutAnalyzer,
+                    timings: Optional[Dict[str, float]] = None, known: Optional[dict] = None):
+    """All resume fields from the full text; values in known (e.g. skills) are reused as is"""
+    known = known or {}
+    with _stage(timings, "preprocess"):
+        processed_text = helper.preprocess_text(text)
+        language = helper.detect_language(processed_text)
 
-    experience_section = helper.extract_section(
-        text,
-        section_names=helper.config.get("experience", []),
-        next_section_names=helper.config.get("next_section", [])
-    )
+        # Section boundaries located once, shared by the extractors below
+        sections = helper.build_section_index(text)
 
-    status, status_confidence, status_matches = extract_status(text, language)
-    occupation, occupation_level, occupation_confidence, occupation_matches = extract_occupation(text, language)
+    with _stage(timings, "status_occupation"):
+        hits = scan_status_occupation(text, language)
+        status, status_confidence, status_matches = extract_status(text, language, hits)
+        occupation, occupation_level, occupation_confidence, occupation_matches = extract_occupation(text, language, hits)
 
+    with _stage(timings, "name"):
+        name = extract_name(text, analyzer)
+    with _stage(timings, "email_phone"):
+        email = extract_email(text)
+        phone = extract_phone_number(text)
+    with _stage(timings, "city"):
+        city = extract_city(text)
+    with _stage(timings, "degrees"):
+        degrees = extract_degrees(text)
+    with _stage(timings, "experience"):
+        exp_years = known["exp_years"] if "exp_years" in known else extract_experience_years(sections.get("experience"))
+    with _stage(timings, "skills"):
+        skills = known["skills"] if "skills" in known else extract_skills(text, sections=sections)
 
     resume_data = {
-        "name": extract_name(text,analyzer),
-        "email": extract_email(text),
-        "phone": extract_phone_number(text),
-        "city": extract_city(text,cities),
+        "name": name,
+        "email": email,
+        "phone": phone,
+        "city": city,
         "status": status.value.replace('_',' ').title(),
-        "degrees": extract_degrees(text),
+        "degrees": degrees,
         "occupation": occupation.replace('_',' ').title(),
-        "exp_years": extract_experience_years(experience_section),
-        "skills": extract_skills(text, helper.skills, helper.skills_headers),
+        "exp_years": exp_years,
+        "skills": skills,
         "pdf_path": pdf_path,
 
     }
 
-    #debugging
-    print(f"======================================")
-    print(f"Text extracted from PDF:")
-    print(text)
-    print(f"======================================")
-    print(f"file:{pdf_path}")
-    print(f"Name: {resume_data['name']}")
-    print(f"Email: {resume_data['email']}")
-    print(f"Phone: {resume_data['phone']}")
-    print(f"City: {resume_data['city']}")
-    print(f"Status: {status.value} (Confidence: {status_confidence})")
-    print(f"Occupation: {occupation} (Level: {occupation_level}, Confidence: {occupation_confidence})")
-    print(f"Degrees: {resume_data['degrees']}")
-    print(f"Experience Years: {resume_data['exp_years']}")
-    print(f"Skills: {resume_data['skills']}")
+    logger.debug("resume parsed", extra=log_fields(
+        file=pdf_path, status_confidence=status_confidence, occupation_level=occupation_level,
+        occupation_confidence=occupation_confidence, **{k: v for k, v in resume_data.items() if k != "pdf_path"}))
 
     return resume_data
 
+def parse_cache_stats():
+    cache = get_parse_cache()
+    return cache.stats() if cache is not None else None
+
+
+def ocr_cache_stats():
+    cache = get_ocr_cache()
+    return cache.stats() if cache is not None else None
+
+
 # todo: implement error handling typshit and data verification ?
-def process_and_store_resume(pdf_path):
-    resume_data = parse_pdf_to_data(pdf_path)
-    print(f"[Debug] adding {resume_data['name']} resume to db..")
+def process_and_store_resume(pdf_path, profile: bool = False):
+    """
+    Parse and store a resume. With profile (or when picked by PROFILE_SAMPLE_RATE)
+    the work runs under cProfile: the result gets a "profile" entry with the
+    saved artifact and the hottest functions. A requested profile skips the
+    parse cache, so that it shows the actual parse.
+    """
+    reason = profile_reason(profile)
+    if reason is None:
+        return _process_and_store(pdf_path)
+    resume_data, summary = profile_call(_process_and_store, pdf_path, use_cache=reason != "requested",
+                                        pdf_path=pdf_path, reason=reason)
+    resume_data["profile"] = summary
+    return resume_data
+
+
+def _process_and_store(pdf_path, use_cache: bool = True):
+    resume_data = parse_pdf_to_data(pdf_path, use_cache=use_cache)
+    logger.debug("storing resume", extra=log_fields(file=pdf_path))
     resume_id = add_resume(resume_data)
     resume_data['id'] = resume_id
 
     return resume_data
 
 
+def stream_process_and_store_resume(pdf_path, required_fields: Optional[Iterable[str]] = None) -> Iterator[dict]:
+    """stream_parse_pdf events; a complete result is stored and its data gets the new id"""
+    for event in stream_parse_pdf(pdf_path, required_fields):
+        if event["event"] == "result" and event["complete"]:
+            resume_data = event["data"]
+            logger.debug("storing resume", extra=log_fields(file=pdf_path))
+            resume_data['id'] = add_resume(resume_data)
+        yield event
+
+
 # Main execution (testing)
 if __name__ == "__main__":
     pdf_path = os.path.join(os.path.dirname(__file__), ".." ,"pdfs", sys.argv[1]+ ".pdf" if len(sys.argv) > 1 else "youssef.pdf")
@@ -6,10 +6,10 @@ from unidecode import unidecode
 
 # Add parent directory to path for imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from layout_analyser import PyMuPDFLayoutAnalyzer
-from utils.helper import Helper
+from utils.degree_matcher import education_window_mask
+from utils.resources import get_degree_matcher, get_helper
 
-helper = Helper()
+helper = get_helper()
 
 FIELDS = helper.config.get("fields", [])
 
@@ -76,29 +76,39 @@ def extract_institution(lines: list[str], idx: int, window: int = 2) -> str | No
     return None
 
 def match_degrees_in_line(line: str) -> tuple[str, int]:
-    norm_line = helper.normalize_text(line)
-    best_match, best_score = None, 0
-    for degree, aliases in helper.config.get("degree_aliases", {}).items():
-        for alias in aliases:
-            score = fuzz.token_set_ratio(norm_line, helper.normalize_text(alias))
-            if score > 85 and score > best_score:
-                if helper.normalize_text(alias) in norm_line or fuzz.partial_ratio(norm_line, helper.normalize_text(alias)) > 90:
-                    best_match, best_score = degree, score
-    return best_match, best_score
-
-def scan_resume(lines: list[str], restrict_to_edu=True) -> list[dict]:
-    results = []
-    seen = set()
+    return get_degree_matcher().match_lines([helper.normalize_text(line)])[0]
+
+def score_resume_lines(lines: list[str]) -> dict:
+    """
+    Degree matches of every candidate line, scored in one batched pass, plus the
+    education-window mask. Shared by the restricted and unrestricted scans.
+    """
+    candidates = []
     for idx, line in enumerate(lines):
         if len(line) < 5:
             continue
         norm_line = helper.normalize_text(line)
         if any(x in norm_line for x in ['email', 'phone', 'linkedin', 'github', 'skills', 'projects', 'languages']):
             continue
-        if restrict_to_edu and not helper.is_education_section(lines, idx):
+        candidates.append((idx, norm_line))
+
+    matches = get_degree_matcher().match_lines([norm_line for _, norm_line in candidates])
+    return {
+        "matches": [(idx, degree, score) for (idx, _), (degree, score) in zip(candidates, matches) if degree],
+        "education_mask": education_window_mask(lines, helper.config.get("education_headers", [])),
+    }
+
+def scan_resume(lines: list[str], restrict_to_edu=True, scores: dict = None) -> list[dict]:
+    if scores is None:
+        scores = score_resume_lines(lines)
+    education_mask = scores["education_mask"]
+    results = []
+    seen = set()
+    for idx, degree, score in scores["matches"]:
+        line = lines[idx]
+        if restrict_to_edu and not education_mask[idx]:
             continue
-        degree, score = match_degrees_in_line(line)
-        if degree and score >= 85:
+        if score >= 85:
             context = ' '.join(lines[max(0, idx-2):min(len(lines), idx+3)])
             field = extract_clean_field(context, degree.lower())
             year = extract_year_range(context)
@@ -118,10 +128,11 @@ def scan_resume(lines: list[str], restrict_to_edu=True) -> list[dict]:
 
 def extract_degrees(text: str, debug=False) -> list:
     lines = [l.strip() for l in text.splitlines() if l.strip()]
-    results = scan_resume(lines, restrict_to_edu=True)
+    scores = score_resume_lines(lines)
+    results = scan_resume(lines, restrict_to_edu=True, scores=scores)
 
     if not results:
-        results = scan_resume(lines, restrict_to_edu=False)
+        results = scan_resume(lines, restrict_to_edu=False, scores=scores)
 
     if not results:
         for idx, line in enumerate(lines):
@@ -161,6 +172,8 @@ def extract_degrees(text: str, debug=False) -> list:
 
 
 if __name__ == "__main__":
+    from layout_analyser import PyMuPDFLayoutAnalyzer
+
     pdf_name = sys.argv[1] if len(sys.argv) > 1 else "youssef"
     pdf_path = os.path.join(os.path.dirname(__file__), "..", "pdfs", f"{pdf_name}.pdf")
     analyzer = PyMuPDFLayoutAnalyzer(pdf_path)
@@ -2,15 +2,12 @@ import sys
 import os
 import re
 from typing import Optional
-from rapidfuzz import process
-from typing import List
 
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils.helper import Helper
-from layout_analyser import PyMuPDFLayoutAnalyzer
+from utils.resources import get_helper
 
-helper = Helper()
+helper = get_helper()
 def extract_email(text: str) -> Optional[str]:
     """Extract email using regex"""
     text = re.sub(r'\s*@\s*', '@', text)  # removes spaces around @
@@ -41,6 +38,8 @@ def extract_phone_number(text: str) -> Optional[str]:
 
 # Main execution (testing)
 if __name__ == "__main__":
+    from layout_analyser import PyMuPDFLayoutAnalyzer
+
     pdf_path = os.path.join(os.path.dirname(__file__), ".." ,"pdfs", sys.argv[1]+ ".pdf" if len(sys.argv) > 1 else "youssef.pdf")
     analyzer = PyMuPDFLayoutAnalyzer(pdf_path)
     text = analyzer.extract_with_layout_analysis()
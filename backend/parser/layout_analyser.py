@@ -1,61 +1,223 @@
 import fitz  # PyMuPDF
-import pytesseract
-from PIL import Image
-from typing import List, Dict
-import spacy
+from dataclasses import dataclass
+from typing import List, Dict, Iterator, Tuple
 import os
-import io
 import re
 import sys
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils.helper import Helper
+from utils.logs import get_logger, log_fields
+from utils.ocr import OcrResult, get_ocr_pool, region_dpi
+from utils.resources import get_config, get_lookups, get_nlp
+
+logger = get_logger("layout_analyser")
+
+# A page is OCR'd whole when its text layer covers less than this share of the
+# page while images cover at least SCANNED_MIN_IMAGE_COVERAGE (or it has no text at all)
+SCANNED_MAX_TEXT_COVERAGE = 0.05
+SCANNED_MIN_IMAGE_COVERAGE = 0.5
+# Smaller embedded images (in points) are icons and logos, not worth OCR
+MIN_OCR_REGION_WIDTH = 60
+MIN_OCR_REGION_HEIGHT = 12
+# Images mostly covered by text-layer blocks, or filling most of a page that has a
+# text layer, are backgrounds: their text (if any) is already extracted
+MAX_IMAGE_TEXT_OVERLAP = 0.3
+MAX_REGION_PAGE_COVERAGE = 0.5
+
+
+@dataclass
+class TextBlock:
+    """A text block of a page, parsed once from MuPDF's dict output"""
+    page_num: int
+    bbox: Tuple[float, float, float, float]
+    text: str        # spans joined per line, one line per row
+    flat_text: str   # all spans joined by single spaces
+    font_sizes: List[float]
+
+    @property
+    def x0(self) -> float:
+        return self.bbox[0]
+
+    @property
+    def y0(self) -> float:
+        return self.bbox[1]
+
+    @property
+    def x1(self) -> float:
+        return self.bbox[2]
+
+    @property
+    def y1(self) -> float:
+        return self.bbox[3]
+
+    @property
+    def font_size(self) -> float:
+        return max(self.font_sizes) if self.font_sizes else 0
+
+
+@dataclass
+class ImageRegion:
+    """An image block of a page: where it is drawn and its size in pixels"""
+    page_num: int
+    bbox: Tuple[float, float, float, float]
+    width: int
+    height: int
+
+
+def _area(bbox: Tuple[float, float, float, float]) -> float:
+    return max(0.0, bbox[2] - bbox[0]) * max(0.0, bbox[3] - bbox[1])
+
+
+def _intersection(a: Tuple[float, float, float, float], b: Tuple[float, float, float, float]) -> float:
+    return _area((max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3])))
 
-hepler = Helper()
 
 class PyMuPDFLayoutAnalyzer:
-    def __init__(self, pdf_path: str, config: dict = hepler.config, lang="en"):
+    def __init__(self, pdf_path: str, config: dict = None, lang="en"):
         self.pdf_path = pdf_path
         self.doc = fitz.open(pdf_path)
 
-        # Load spaCy language model
-        if lang == "fr":
-            self.nlp = spacy.load("fr_core_news_sm")
-        else:
-            self.nlp = spacy.load("en_core_web_sm")
-
         self.lang = lang
         self.ocr_lang = "eng+fra"  # for pytesseract
 
-        self.config = config  
-        self.section_headers = [h.upper() for h in config.get("section_headers", [])]
-        self.blacklist_headers = set(config.get("blacklist_headers", []))
+        if config is None:
+            lookups = get_lookups()
+            self.config = get_config()
+            self.section_headers = lookups["section_headers"]
+            self.blacklist_headers = lookups["blacklist_headers"]
+        else:
+            self.config = config
+            self.section_headers = [h.upper() for h in config.get("section_headers", [])]
+            self.blacklist_headers = set(config.get("blacklist_headers", []))
+
+        # page_num -> parsed text / image blocks; get_text("dict") runs at most once per page
+        self._page_blocks: Dict[int, List[TextBlock]] = {}
+        self._page_images: Dict[int, List[ImageRegion]] = {}
+        # page_num -> "text", "mixed" (text layer + image regions to OCR) or "scanned"
+        self.page_kinds: Dict[int, str] = {}
+        # page_num -> OcrResults (text, latency, backend, dpi) of the page or of its image regions
+        self.ocr_results: Dict[int, List[OcrResult]] = {}
+
+    @property
+    def nlp(self):
+        """NER pipeline of the document language, shared process-wide and loaded on first use only"""
+        return get_nlp(self.lang)
 
     def extract_with_layout_analysis(self) -> str:
         """Main extraction loop with layout + OCR fallback"""
         full_text = ""
+        for _, structured_text in self.iter_pages():
+            full_text += structured_text + "\n\n"
+
+        return full_text.strip()
+
+    def iter_pages(self) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (page_num, structured text) in page order.
+        Scanned pages are OCR'd whole; on mixed pages only the embedded images
+        are OCR'd and their text is merged with the text layer in spatial order.
+        All OCR work is sent to the OCR pool up front, so a scanned CV takes
+        about as long as its slowest page rather than the sum of its pages.
+        Closing the generator early cancels the OCR jobs not started yet.
+        """
+        page_jobs = {}
+        region_jobs = {}
         for page_num in range(len(self.doc)):
-            page = self.doc.load_page(page_num)
-            print(f"Processing page {page_num + 1}...")
+            kind = self.classify_page(page_num)
+            if kind == "scanned":
+                logger.debug("no text layer, using OCR", extra=log_fields(page=page_num + 1))
+                page_jobs[page_num] = get_ocr_pool().submit(self.pdf_path, page_num, self.ocr_lang)
+            elif kind == "mixed":
+                region_jobs[page_num] = [
+                    (region, get_ocr_pool().submit(self.pdf_path, page_num, self.ocr_lang,
+                                                   dpi=region_dpi(region.bbox, region.width), clip=region.bbox))
+                    for region in self.ocr_regions(page_num)
+                ]
 
-            blocks = page.get_text("dict")
-            structured_text = self._process_blocks(blocks)
+        try:
+            for page_num in range(len(self.doc)):
+                logger.debug("processing page", extra=log_fields(page=page_num + 1))
+                if page_num in page_jobs:
+                    result = self._collect_ocr(page_num, page_jobs[page_num])
+                    structured_text = self._format_ocr_text(result.text)
+                else:
+                    for region, job in region_jobs.get(page_num, []):
+                        # The text layer is enough to parse a mixed page: a region that fails to OCR is skipped
+                        try:
+                            result = self._collect_ocr(page_num, job)
+                        except Exception as e:
+                            logger.warning("region OCR failed, skipped", extra=log_fields(
+                                page=page_num + 1, bbox=[round(v) for v in region.bbox], error=repr(e)))
+                            continue
+                        self._merge_region_text(region, result.text)
+                    structured_text = self._process_blocks(self.get_page_blocks(page_num))
+                yield page_num, structured_text
+        finally:
+            # Stopped early (enough fields found, or an error): don't OCR pages nobody will read
+            for job in [*page_jobs.values(), *(job for jobs in region_jobs.values() for _, job in jobs)]:
+                job.cancel()
 
-            if not structured_text.strip():
-                print("No text found, using OCR...")
-                structured_text = self._extract_text_with_ocr(page)
+    def _collect_ocr(self, page_num: int, job) -> OcrResult:
+        result = job.result()
+        self.ocr_results.setdefault(page_num, []).append(result)
+        logger.debug("OCR done", extra=log_fields(page=page_num + 1, seconds=round(result.seconds, 2),
+                                                  backend=result.backend, dpi=result.dpi))
+        return result
 
-            full_text += structured_text + "\n\n"
+    def _merge_region_text(self, region: ImageRegion, text: str):
+        """Add the text recognized in an image region to the page blocks, ignoring noise"""
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        if sum(c.isalnum() for line in lines for c in line) < 3:
+            return
+        self.get_page_blocks(region.page_num).append(TextBlock(
+            page_num=region.page_num,
+            bbox=region.bbox,
+            text="\n".join(lines),
+            flat_text=" ".join(lines),
+            font_sizes=[],
+        ))
 
-        return full_text.strip()
+    def classify_page(self, page_num: int) -> str:
+        """
+        "scanned" when the text layer is empty or covers almost nothing of a page
+        filled by images, "mixed" when it has a text layer plus images worth
+        OCR'ing (see ocr_regions), "text" otherwise.
+        """
+        kind = self.page_kinds.get(page_num)
+        if kind is None:
+            page_area = self._page_area(page_num)
+            blocks = self.get_page_blocks(page_num)
+            text_coverage = sum(_area(b.bbox) for b in blocks) / page_area
+            image_coverage = sum(_area(i.bbox) for i in self.get_page_images(page_num)) / page_area
+            if not blocks or (text_coverage < SCANNED_MAX_TEXT_COVERAGE
+                              and image_coverage >= SCANNED_MIN_IMAGE_COVERAGE):
+                kind = "scanned"
+            elif self.ocr_regions(page_num):
+                kind = "mixed"
+            else:
+                kind = "text"
+            self.page_kinds[page_num] = kind
+        return kind
 
-    def _extract_text_with_ocr(self, page) -> str:
-        """Fallback OCR using pytesseract"""
-        pix = page.get_pixmap(dpi=300)
-        img = Image.open(io.BytesIO(pix.tobytes("png")))
-        text = pytesseract.image_to_string(img, lang=self.ocr_lang)
+    def ocr_regions(self, page_num: int) -> List[ImageRegion]:
+        """Image blocks large enough to hold text and not already overlaid by the text layer"""
+        blocks = self.get_page_blocks(page_num)
+        page_area = self._page_area(page_num)
+        regions = []
+        for image in self.get_page_images(page_num):
+            x0, y0, x1, y1 = image.bbox
+            if x1 - x0 < MIN_OCR_REGION_WIDTH or y1 - y0 < MIN_OCR_REGION_HEIGHT:
+                continue
+            if _area(image.bbox) > MAX_REGION_PAGE_COVERAGE * page_area:
+                continue
+            covered = sum(_intersection(image.bbox, b.bbox) for b in blocks)
+            if covered > MAX_IMAGE_TEXT_OVERLAP * _area(image.bbox):
+                continue
+            regions.append(image)
+        return regions
 
-        # Heuristic cleanup
+    def _format_ocr_text(self, text: str) -> str:
+        """Heuristic cleanup of raw OCR output"""
         lines = text.splitlines()
         formatted = ""
         for line in lines:
@@ -65,35 +227,64 @@ class PyMuPDFLayoutAnalyzer:
                 formatted += f"{line.strip()}\n"
         return formatted
 
-    def _process_blocks(self, page_dict: Dict) -> str:
-        """Sort blocks spatially and detect headers"""
+    def _page_area(self, page_num: int) -> float:
+        rect = self.doc.load_page(page_num).rect
+        return _area((rect.x0, rect.y0, rect.x1, rect.y1)) or 1.0
+
+    def get_page_blocks(self, page_num: int) -> List[TextBlock]:
+        """Text blocks of one page, extracted from MuPDF on first access and cached"""
+        if page_num not in self._page_blocks:
+            self._load_page(page_num)
+        return self._page_blocks[page_num]
+
+    def get_page_images(self, page_num: int) -> List[ImageRegion]:
+        """Image blocks of one page, from the same get_text("dict") call as the text blocks"""
+        if page_num not in self._page_images:
+            self._load_page(page_num)
+        return self._page_images[page_num]
+
+    def _load_page(self, page_num: int):
+        page_dict = self.doc.load_page(page_num).get_text("dict")
+        self._page_blocks[page_num] = self._parse_blocks(page_dict, page_num)
+        self._page_images[page_num] = [
+            ImageRegion(page_num=page_num, bbox=tuple(block["bbox"]),
+                        width=block.get("width", 0), height=block.get("height", 0))
+            for block in page_dict.get("blocks", [])
+            if block.get("type") == 1
+        ]
+
+    def _parse_blocks(self, page_dict: Dict, page_num: int) -> List[TextBlock]:
+        """Turn MuPDF's dict output into TextBlocks, dropping empty ones"""
         text_blocks = []
         for block in page_dict.get("blocks", []):
             if "lines" in block:
-                block_text = ""
+                lines = []
+                spans = []
                 font_sizes = []
                 for line in block["lines"]:
-                    for span in line["spans"]:
-                        block_text += span["text"]
-                        font_sizes.append(span["size"])
-                    block_text += "\n"
-                if block_text.strip():
-                    text_blocks.append({
-                        "text": block_text.strip(),
-                        "bbox": block["bbox"],
-                        "x0": block["bbox"][0],
-                        "y0": block["bbox"][1],
-                        "x1": block["bbox"][2],
-                        "y1": block["bbox"][3],
-                        "font_size": max(font_sizes) if font_sizes else 0,
-                    })
+                    line_spans = [span["text"] for span in line["spans"]]
+                    font_sizes.extend(span["size"] for span in line["spans"])
+                    lines.append("".join(line_spans))
+                    spans.extend(line_spans)
+                text = "\n".join(lines).strip()
+                if text:
+                    text_blocks.append(TextBlock(
+                        page_num=page_num,
+                        bbox=tuple(block["bbox"]),
+                        text=text,
+                        flat_text=" ".join(spans).strip(),
+                        font_sizes=font_sizes,
+                    ))
+        return text_blocks
 
+    def _process_blocks(self, blocks: List[TextBlock]) -> str:
+        """Sort blocks spatially and detect headers"""
         # Sort top-to-bottom, left-to-right (improves columns handling)
-        text_blocks.sort(key=lambda b: (round(b["y0"] / 20), round(b["x0"] / 20)))
+        text_blocks = sorted(blocks, key=lambda b: (round(b.y0 / 20), round(b.x0 / 20)))
 
         formatted_text = ""
         for block in text_blocks:
-            text = block["text"]
+            text = block.text
             if self._is_likely_header(text):
                 formatted_text += f"\n{text.upper()}\n"
             else:
@@ -118,27 +309,12 @@ class PyMuPDFLayoutAnalyzer:
 
         return False
 
-    def get_text_blocks(self, raw_text: str) -> List[Dict]:
-        """Extract blocks with font size and positions"""
-        blocks_with_fonts = []
-        for page in self.doc:
-            page_dict = page.get_text("dict")
-            for block in page_dict.get("blocks", []):
-                if "lines" in block:
-                    block_text = ""
-                    font_sizes = []
-                    for line in block["lines"]:
-                        for span in line["spans"]:
-                            block_text += span["text"] + " "
-                            font_sizes.append(span["size"])
-                    if block_text.strip():
-                        blocks_with_fonts.append({
-                            "text": block_text.strip(),
-                            "y0": block["bbox"][1],
-                            "x0": block["bbox"][0],
-                            "font_size": max(font_sizes) if font_sizes else 0,
-                        })
-        return blocks_with_fonts
+    def get_text_blocks(self, raw_text: str = None) -> List[TextBlock]:
+        """All text blocks of the document (font sizes and positions), in page order"""
+        blocks = []
+        for page_num in range(len(self.doc)):
+            blocks.extend(self.get_page_blocks(page_num))
+        return blocks
 
     def __del__(self):
         if hasattr(self, 'doc'):
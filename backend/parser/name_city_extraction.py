@@ -2,35 +2,68 @@ import sys
 import os
 import re
 from typing import Optional
-from rapidfuzz import process
-from typing import List
-
-from unidecode import unidecode
+from typing import TYPE_CHECKING, List
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from parser.utils.helper import Helper
-from layout_analyser import PyMuPDFLayoutAnalyzer
-
-helper = Helper()
-
-def extract_name(text: str, analyzer: PyMuPDFLayoutAnalyzer) -> Optional[str]:
+from utils.gazetteer import CityGazetteer, normalize_place
+from utils.logs import get_logger, log_fields
+from utils.resources import get_city_gazetteer, get_helper
+
+if TYPE_CHECKING:
+    from layout_analyser import PyMuPDFLayoutAnalyzer
+
+helper = get_helper()
+logger = get_logger("name_city_extraction")
+
+# A name line: 2-4 words made of letters (accents, hyphens, apostrophes), each upper- or title-cased
+NAME_WORD_PATTERN = re.compile(r"^[^\W\d_]+(?:['-][^\W\d_]+)*$")
+NAME_KEYWORDS = ["etudiant", "student", "contact", "email", "tel", "phone"]
+# Document titles that look like names ("Curriculum Vitae") are left to spaCy
+DOCUMENT_TITLE_WORDS = {"curriculum", "vitae", "resume", "résumé", "cv"}
+
+
+def _confident_name(block_text: str, analyzer: "PyMuPDFLayoutAnalyzer") -> Optional[str]:
+    """The block as a name when it unambiguously looks like one, otherwise None"""
+    clean = block_text.strip()
+    words = clean.split()
+    if not 2 <= len(words) <= 4:
+        return None
+    if not all(NAME_WORD_PATTERN.match(w) and (w.isupper() or w.istitle()) for w in words):
+        return None
+    upper = clean.upper()
+    if upper in analyzer.blacklist_headers or any(h in upper for h in analyzer.section_headers):
+        return None
+    if any(kw in clean.lower() for kw in NAME_KEYWORDS):
+        return None
+    if any(w.lower() in DOCUMENT_TITLE_WORDS for w in words):
+        return None
+    name = _clean_name(clean)
+    # A job title in the line (e.g. "Data Engineer") makes it a heading, not a name
+    return name if name == clean else None
+
+
+def extract_name(text: str, analyzer: "PyMuPDFLayoutAnalyzer") -> Optional[str]:
     blocks = analyzer.get_text_blocks(text)
-    blocks = sorted(blocks, key=lambda b: (-b.get("font_size", 0), b["y0"]))
-    top_blocks = [b["text"] for b in blocks[:8] if b["text"]]
-
-
-
-    # 1. Try SpaCy NER on both original and title-cased text
-    for block_text in top_blocks:
-        for variant in (block_text, block_text.title()):
-            doc = analyzer.nlp(variant)
+    blocks = sorted(blocks, key=lambda b: (-b.font_size, b.y0))
+    top_blocks = [b.flat_text for b in blocks[:8] if b.flat_text]
+
+    # 1. Cheap check first: one of the largest blocks is clearly a name
+    for block_text in top_blocks[:3]:
+        name = _confident_name(block_text, analyzer)
+        if name:
+            return name
+
+    # 2. SpaCy NER on both original and title-cased text, all variants in one batch
+    variants = list(dict.fromkeys(v for b in top_blocks for v in (b, b.title())))
+    if variants:
+        for doc in analyzer.nlp.pipe(variants, batch_size=len(variants)):
             for ent in doc.ents:
                 if ent.label_ == "PERSON":
                     name = _clean_name(ent.text)
                     if name:
                         return name
 
-    # 2. Heuristic: first line with 2+ uppercase words (likely name in uppercase)
+    # 3. Heuristic: first line with 2+ uppercase words (likely name in uppercase)
     for block_text in top_blocks:
         words = block_text.strip().split()
 
@@ -40,11 +73,10 @@ def extract_name(text: str, analyzer: PyMuPDFLayoutAnalyzer) -> Optional[str]:
             if block_text.strip().upper() not in analyzer.blacklist_headers:
                 return _clean_name(probable_name)
 
-    # 3. Heuristic: first non-header line before keywords like "etudiant", "contact"
-    keywords = ["etudiant", "student", "contact", "email", "tel", "phone"]
+    # 4. Heuristic: first non-header line before keywords like "etudiant", "contact"
     for block_text in top_blocks:
         line_lower = block_text.lower()
-        if any(kw in line_lower for kw in keywords):
+        if any(kw in line_lower for kw in NAME_KEYWORDS):
             continue
         if any(char.isdigit() for char in block_text):
             continue
@@ -54,7 +86,7 @@ def extract_name(text: str, analyzer: PyMuPDFLayoutAnalyzer) -> Optional[str]:
         if 1 <= len(words) <= 6:
             return _clean_name(block_text.strip())
 
-    # 4. Regex fallback: allow uppercase names
+    # 5. Regex fallback: allow uppercase names
     regex_patterns = [
         r'^[A-Z][a-z]+(?:\s[A-Z][a-z]+){1,3}',         # Title case
         r'^[A-Z]{2,}(?:\s[A-Z]{2,}){1,3}',             # Uppercase (e.g. NIZAR KOURTI)
@@ -64,10 +96,8 @@ def extract_name(text: str, analyzer: PyMuPDFLayoutAnalyzer) -> Optional[str]:
         if name_match:
             return _clean_name(name_match.group().strip())
 
-    print("\n[WARNING] Candidate name could not be extracted.")
-    print("--- DEBUG: Top blocks ---")
-    for b in top_blocks:
-        print(f"> {b}")
+    logger.warning("candidate name could not be extracted", extra=log_fields(blocks=len(top_blocks)))
+    logger.debug("top blocks without a name", extra=log_fields(blocks=top_blocks))
     return None
 
 
@@ -84,46 +114,36 @@ def _clean_name(name: str) -> str:
         cleaned.append(token)
     return " ".join(cleaned)
 
-def extract_city(text: str, city_list: List[str], score_threshold: int = 88) -> Optional[str]:
-    """Extract Moroccan city from text with fuzzy matching ignoring accents and minor typos."""
-    norm_text = unidecode(text.lower())
-    words = norm_text.split()
-    candidates = set()
-    
-    # unigram + bigram (2-words city names)
+def extract_city(text: str, city_list: Optional[List[str]] = None, score_threshold: int = 88) -> Optional[str]:
+    """Extract Moroccan city from text with fuzzy matching ignoring accents and minor typos.
+    Uses the preloaded gazetteer (config cities, aliases and CITY_GAZETTEER_PATH)
+    unless a custom city_list is given."""
+    words = normalize_place(text).split()
+    candidates = []
+
+    # unigram + bigram (2-words city names), in text order
     for i in range(len(words)):
-        unigram = words[i].strip(",.;:()")
-        if unigram:
-            candidates.add(unigram)
+        candidates.append(words[i].strip(",.;:()"))
         if i + 1 < len(words):
-            bigram = f"{words[i]} {words[i+1]}".strip(",.;:()")
-            if bigram:
-                candidates.add(bigram)
-    
-    # filter short candidates
-    candidates = {c for c in candidates if len(c) >= 3}
+            candidates.append(f"{words[i]} {words[i+1]}".strip(",.;:()"))
 
-    # Create mapping normalized_city -> original city (to recover accented name)
-    norm_city_map = {unidecode(city.lower()): city for city in city_list}
+    # filter short candidates, drop duplicates
+    candidates = list(dict.fromkeys(c for c in candidates if len(c) >= 3))
 
-    best_match = None
-    best_score = 0
+    if city_list is None:
+        gazetteer = get_city_gazetteer()
+    else:
+        gazetteer = CityGazetteer((city, []) for city in city_list)
 
-    for candidate in candidates:
-        # rapidfuzz extractOne compares against keys (norm_city_map keys)
-        match = process.extractOne(candidate, norm_city_map.keys())
-        if match:
-            matched_norm_city, score = match[0], match[1]
-            if score > best_score and score >= score_threshold:
-                best_score = score
-                best_match = norm_city_map[matched_norm_city]  # return original accented city
-
-    return best_match
+    # Exact hits through the hash index, otherwise one batched fuzzy pass
+    return gazetteer.match(candidates, score_threshold)
 
 
 
 # Main execution (testing)
 if __name__ == "__main__":
+    from layout_analyser import PyMuPDFLayoutAnalyzer
+
     pdf_path = os.path.join(os.path.dirname(__file__), ".." ,"pdfs", sys.argv[1]+ ".pdf" if len(sys.argv) > 1 else "youssef.pdf")
     analyzer = PyMuPDFLayoutAnalyzer(pdf_path)
     text = analyzer.extract_with_layout_analysis()
@@ -132,7 +152,6 @@ if __name__ == "__main__":
     #print(text)
 
     name = extract_name(text, analyzer)
-    CITIES = [city.lower() for city in  helper.cities]
-    city = extract_city(text, CITIES)    
+    city = extract_city(text)
     print(f"Name: {name}")
     print(f"City: {city}")
\ No newline at end of file
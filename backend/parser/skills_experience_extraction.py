@@ -3,53 +3,57 @@ import sys
 import os
 import re
 import datetime
-from rapidfuzz import fuzz, process
-from typing import List, Set
-import unicodedata
+import logging
+from typing import List, Optional, Set
 
 # === Import layout analyzer and hlper classes ===
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from layout_analyser import PyMuPDFLayoutAnalyzer
-from utils.helper import Helper
+from utils.resources import build_skill_matcher, get_helper, get_skill_matcher
+from utils.section_index import SectionIndex
+from utils.logs import get_logger
 
-helper = Helper()
+helper = get_helper()
+logger = get_logger("skills_experience")
 
 
 
 
 def normalize_token(token: str) -> str:
     """Clean, lowercase and normalize accents for consistent comparison"""
-    token = token.strip().lower()
-    token = unicodedata.normalize('NFKD', token)
-    token = ''.join([c for c in token if not unicodedata.combining(c)])
-    return token
+    return helper.normalize_token(token)
 
 
-def extract_skills(text: str, known_skills: List[str], section_headers: List[str], threshold=85) -> List[str]:
-    skills_found: Set[str] = set()
-    normalized_skills = {normalize_token(skill): skill for skill in known_skills}
+def extract_skills(text: str, known_skills: Optional[List[str]] = None,
+                   section_headers: Optional[List[str]] = None, threshold=85,
+                   sections: Optional[SectionIndex] = None) -> List[str]:
+    """Match resume tokens against known skills (config skills and headers by default).
+    Reads the skills section from sections (see Helper.build_section_index) when given."""
+    if known_skills is None:
+        matcher = get_skill_matcher()
+    else:
+        matcher = build_skill_matcher(helper, known_skills)
 
     # First, attempt to extract a specific 'skills' section
-    skills_section = helper.extract_section(
-        text,
-        section_names=section_headers,
-        next_section_names=helper.config.get("next_section", [])
-    )
+    if sections is not None and section_headers is None:
+        skills_section = sections.get("skills")
+    else:
+        skills_section = helper.extract_section(
+            text,
+            section_names=section_headers if section_headers is not None else helper.skills_headers,
+            next_section_names=helper.config.get("next_section", [])
+        )
 
     source_text = skills_section if skills_section else text
     lines = source_text.lower().splitlines()
 
+    tokens = []
     for line in lines:
         line = normalize_token(line)
-        tokens = re.split(r'[:,•·\-\|;/]', line)
-        for token in tokens:
-            token = normalize_token(token)
+        tokens.extend(normalize_token(token) for token in re.split(r'[:,•·\-\|;/]', line))
 
-            # Try fuzzy matching against normalized known skills
-            match = process.extractOne(token, normalized_skills.keys(), score_cutoff=threshold)
-            if match:
-                original_skill = normalized_skills[match[0]]
-                skills_found.add(original_skill)
+    # Exact (multi-word) hits through the skill trie, batched fuzzy matching for the rest.
+    # Without a skills section, one-word skills must be list items, not words of a sentence
+    skills_found: Set[str] = matcher.match(tokens, threshold=threshold, embedded_single_words=bool(skills_section))
 
     return sorted(skills_found)
 
@@ -58,7 +62,7 @@ def extract_experience_years(text: str, debug: bool = False) -> int:
     """
     Extract years of experience from resume text.
     Returns the highest number of years found, or 0 if none found.
-    Logs detailed info if debug=True.
+    Logs detailed info if debug=True or LOG_LEVEL=DEBUG.
     """
     patterns = [
         r'(\d+)\s+years? of experience',
@@ -74,14 +78,15 @@ def extract_experience_years(text: str, debug: bool = False) -> int:
     extracted_years = []
 
     text_lower = text.lower()
+    debug = debug or logger.isEnabledFor(logging.DEBUG)
     if debug:
-        print("[DEBUG] Starting experience years extraction...")
+        logger.debug("starting experience years extraction")
 
     for pattern in patterns:
         matches = re.findall(pattern, text_lower)
         if matches:
             if debug:
-                print(f"[DEBUG] Pattern '{pattern}' found matches: {matches}")
+                logger.debug("pattern %r found matches: %s", pattern, matches)
             for match in matches:
                 try:
                     if isinstance(match, tuple):
@@ -98,46 +103,43 @@ def extract_experience_years(text: str, debug: bool = False) -> int:
                         if years_exp > 0:
                             extracted_years.append(years_exp)
                             if debug:
-                                print(f"[DEBUG] Extracted {years_exp} years from range {start} - {end}")
+                                logger.debug("extracted %d years from range %d - %d", years_exp, start, end)
                     else:
                         # Single number like "5 years"
                         years_exp = int(match)
                         if years_exp > 0:
                             extracted_years.append(years_exp)
                             if debug:
-                                print(f"[DEBUG] Extracted {years_exp} years from single value")
+                                logger.debug("extracted %d years from single value", years_exp)
                 except Exception as e:
                     if debug:
-                        print(f"[WARNING] Failed to parse experience from match {match}: {e}")
+                        logger.debug("failed to parse experience from match %s: %s", match, e)
                     continue
 
     if extracted_years:
         max_years = max(extracted_years)
         if debug:
-            print(f"[DEBUG] Maximum years of experience extracted: {max_years}")
+            logger.debug("maximum years of experience extracted: %d", max_years)
         return max_years
 
     if debug:
-        print("[DEBUG] No experience years found, returning 0")
+        logger.debug("no experience years found, returning 0")
     return 0
 
 
 # Main execution (testing)
 if __name__ == "__main__":
+    from layout_analyser import PyMuPDFLayoutAnalyzer
+
     pdf_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "pdfs", sys.argv[1] + ".pdf" if len(sys.argv) > 1 else "youssef.pdf"))
     analyzer = PyMuPDFLayoutAnalyzer(pdf_path)
     text = analyzer.extract_with_layout_analysis()
     print(f"file:{pdf_path}")
-     # Extract only the experience-related section
-    experience_section = helper.extract_section(
-        text,
-        section_names=helper.config.get("experience", []),
-        next_section_names=helper.config.get("next_section", [])
-    )
-
-    # Then extract experience years ONLY from this section
-    exp_years = extract_experience_years(experience_section)
-    skills = extract_skills(text, helper.skills, helper.skills_headers)
+    sections = helper.build_section_index(text)
+
+    # Extract experience years ONLY from the experience section
+    exp_years = extract_experience_years(sections.get("experience"))
+    skills = extract_skills(text, sections=sections)
     print(f"Text: {text}")
     print(f"Skills: {skills}")
     print(f"Experience years: {exp_years}")
@@ -7,10 +7,10 @@ import sys
 import os
 # === Import layout analyzer ===
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from layout_analyser import PyMuPDFLayoutAnalyzer
-from utils.helper import Helper
+from utils.resources import get_helper, registry
+from utils.pattern_bank import PatternBank
 
-helper = Helper()
+helper = get_helper()
 CONFIG = helper.config
         
 status_patterns = helper.status_patterns
@@ -18,6 +18,42 @@ occupation_patterns = helper.occupation_patterns
 education_levels = helper.education_levels
 language_indicators = helper.language_indicators
 
+# Education levels that make an occupation default to the student level
+STUDENT_EDUCATION_LEVELS = ('bachelor', 'master')
+
+
+def _build_pattern_banks() -> Dict[str, Dict[str, PatternBank]]:
+    """
+    One bank per language with every status and occupation pattern, and one
+    bank per occupation with its level patterns plus the student education ones.
+    """
+    languages = set()
+    for patterns in status_patterns.values():
+        languages.update(patterns)
+    for config in occupation_patterns.values():
+        languages.update(config['patterns'])
+
+    by_language = {}
+    for language in languages:
+        entries = []
+        for status_key, patterns in status_patterns.items():
+            entries += [(('status', status_key), p) for p in patterns.get(language, [])]
+        for occupation, config in occupation_patterns.items():
+            entries += [(('occupation', occupation), p) for p in config['patterns'].get(language, [])]
+        by_language[language] = PatternBank(entries)
+
+    by_occupation = {}
+    for occupation, config in occupation_patterns.items():
+        entries = [(('level', level), p) for level, patterns in config.get('levels', {}).items() for p in patterns]
+        entries += [(('education', level), p) for level in STUDENT_EDUCATION_LEVELS
+                    for p in education_levels.get(level, [])]
+        by_occupation[occupation] = PatternBank(entries)
+
+    return {"languages": by_language, "levels": by_occupation}
+
+
+registry.register("pattern_banks", _build_pattern_banks)
+
 
 
 
@@ -48,8 +84,20 @@ class ExtractionResult:
     raw_matches: Dict[str, List[str]]
 
 
-def extract_status( text: str, language: str) -> Tuple[StatusType, float, List[str]]:
-    """Extract employment status from text"""
+def scan_status_occupation(text: str, language: str) -> Dict[Tuple[str, str], List[str]]:
+    """
+    Every status and occupation pattern match for the language, computed once
+    for both extractors: substring checks on the literal each pattern requires
+    skip the patterns that cannot match, then findall runs for each remaining one.
+    """
+    bank = registry.get("pattern_banks")["languages"].get(language)
+    return bank.findall(text) if bank else {}
+
+
+def extract_status( text: str, language: str, hits: Optional[Dict] = None) -> Tuple[StatusType, float, List[str]]:
+    """Extract employment status from text (hits: precomputed scan_status_occupation result)"""
+    if hits is None:
+        hits = scan_status_occupation(text, language)
     matches = {}
     confidence_scores = {}
     
@@ -60,10 +108,7 @@ def extract_status( text: str, language: str) -> Tuple[StatusType, float, List[s
             continue
             
         if language in patterns:
-            status_matches = []
-            for pattern in patterns[language]:
-                found = re.findall(pattern, text, re.IGNORECASE)
-                status_matches.extend(found)
+            status_matches = hits.get(('status', status_key), [])
             
             if status_matches:
                 matches[status_type] = status_matches
@@ -78,17 +123,16 @@ def extract_status( text: str, language: str) -> Tuple[StatusType, float, List[s
     confidence = min(confidence_scores[best_status], 1.0)
     
     return best_status, confidence, matches.get(best_status, [])
-def extract_occupation( text: str, language: str) -> Tuple[str, OccupationLevel, float, Dict[str, List[str]]]:
-    """Extract occupation and level from text"""
+def extract_occupation( text: str, language: str, hits: Optional[Dict] = None) -> Tuple[str, OccupationLevel, float, Dict[str, List[str]]]:
+    """Extract occupation and level from text (hits: precomputed scan_status_occupation result)"""
+    if hits is None:
+        hits = scan_status_occupation(text, language)
     occupation_matches = {}
     occupation_scores = {}
     
     for occupation, config in occupation_patterns.items():
         if language in config['patterns']:
-            matches = []
-            for pattern in config['patterns'][language]:
-                found = re.findall(pattern, text, re.IGNORECASE)
-                matches.extend(found)
+            matches = hits.get(('occupation', occupation), [])
             
             if matches:
                 occupation_matches[occupation] = matches
@@ -112,21 +156,19 @@ def _extract_level( text: str, occupation: str) -> OccupationLevel:
         return OccupationLevel.UNKNOWN
     
     levels_config = occupation_patterns[occupation].get('levels', {})
+    found = registry.get("pattern_banks")["levels"][occupation].search_labels(text)
     
-    for level_name, patterns in levels_config.items():
-        for pattern in patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                try:
-                    return OccupationLevel(level_name)
-                except ValueError:
-                    continue
+    for level_name in levels_config:
+        if ('level', level_name) in found:
+            try:
+                return OccupationLevel(level_name)
+            except ValueError:
+                continue
     
     # Default level based on education indicators
-    for level_name, patterns in education_levels.items():
-        for pattern in patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                if level_name in ['bachelor', 'master']:
-                    return OccupationLevel.STUDENT
+    for level_name in STUDENT_EDUCATION_LEVELS:
+        if ('education', level_name) in found:
+            return OccupationLevel.STUDENT
     
     return OccupationLevel.UNKNOWN
 
@@ -138,11 +180,14 @@ def parce_status_and_occupation( cv_text: str) -> ExtractionResult:
     # Detect language
     language = helper.detect_language(processed_text)
     
+    # One pass for every status and occupation pattern
+    hits = scan_status_occupation(processed_text, language)
+
     # Extract status
-    status, status_confidence, status_matches = extract_status(processed_text, language)
+    status, status_confidence, status_matches = extract_status(processed_text, language, hits)
     
     # Extract occupation
-    occupation, occupation_level, occupation_confidence, occupation_matches = extract_occupation(processed_text, language)
+    occupation, occupation_level, occupation_confidence, occupation_matches = extract_occupation(processed_text, language, hits)
     
     # Calculate overall confidence
     overall_confidence = (status_confidence + occupation_confidence) / 2
@@ -162,6 +207,8 @@ def parce_status_and_occupation( cv_text: str) -> ExtractionResult:
 
 # Example usage and testing
 def test_parser():
+    from layout_analyser import PyMuPDFLayoutAnalyzer
+
     file = 'pdfs/karim.pdf'
     text = PyMuPDFLayoutAnalyzer(file).extract_with_layout_analysis()
     res = parce_status_and_occupation(text)
@@ -0,0 +1,96 @@
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from rapidfuzz import fuzz, process
+
+
+def education_window_mask(lines: List[str], indicators: List[str], window: int = 3) -> List[bool]:
+    """
+    For every line, whether Helper.is_education_section(lines, index, window)
+    would be true, computed in one pass over the document instead of joining
+    a window of lines for each index.
+
+    The lowercased lines are joined once; each indicator occurrence is mapped
+    back to the lines it spans, and marks (through a difference array) every
+    window [index - window, index + window) that fully contains those lines.
+    """
+    if not lines:
+        return []
+    lowered = [line.lower() for line in lines]
+    starts = []
+    offset = 0
+    for line in lowered:
+        starts.append(offset)
+        offset += len(line) + 1
+    joined = " ".join(lowered)
+
+    marks = [0] * (len(lines) + 1)
+    for indicator in set(indicators):
+        if not indicator:
+            continue
+        pos = joined.find(indicator)
+        while pos != -1:
+            last = pos + len(indicator) - 1
+            first_line = bisect_right(starts, pos) - 1
+            last_line = bisect_right(starts, last) - 1
+            if last == starts[last_line] + len(lowered[last_line]):
+                last_line += 1  # ends on the separator: needs the next line as well
+            lo = max(0, last_line - window + 1)
+            hi = min(len(lines) - 1, first_line + window)
+            if lo <= hi:
+                marks[lo] += 1
+                marks[hi + 1] -= 1
+            pos = joined.find(indicator, pos + 1)
+
+    mask = []
+    running = 0
+    for i in range(len(lines)):
+        running += marks[i]
+        mask.append(running > 0)
+    return mask
+
+
+class DegreeMatcher:
+    """
+    Degree aliases normalized once, flattened in config order, and scored
+    against many lines in a single rapidfuzz.process.cdist call.
+
+    A line matches an alias when token_set_ratio is above score_threshold and
+    the alias appears in the line (verbatim or with partial_ratio above
+    partial_threshold); the highest scoring alias wins, the first one on ties.
+    """
+
+    def __init__(self, degree_aliases: Dict[str, List[str]],
+                 score_threshold: float = 85, partial_threshold: float = 90):
+        self.score_threshold = score_threshold
+        self.partial_threshold = partial_threshold
+        self.aliases: List[str] = []
+        self.alias_degrees: List[str] = []
+        for degree, aliases in degree_aliases.items():
+            for alias in aliases:
+                self.aliases.append(alias)
+                self.alias_degrees.append(degree)
+
+    def match_lines(self, norm_lines: List[str], workers: int = -1) -> List[Tuple[Optional[str], float]]:
+        """(degree, score) for every already normalized line, (None, 0) without a match"""
+        results: List[Tuple[Optional[str], float]] = [(None, 0)] * len(norm_lines)
+        if not norm_lines or not self.aliases:
+            return results
+
+        import numpy as np  # imported on first use, keeps importing extractors cheap
+
+        scores = process.cdist(norm_lines, self.aliases, scorer=fuzz.token_set_ratio,
+                               dtype=np.float64, workers=workers)
+        rows, cols = np.nonzero(scores > self.score_threshold)
+        # Containment check only on the few pairs above the threshold
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            alias = self.aliases[col]
+            line = norm_lines[row]
+            if not (alias in line or fuzz.partial_ratio(line, alias) > self.partial_threshold):
+                scores[row, col] = 0
+
+        for row in set(rows.tolist()):
+            col = int(scores[row].argmax())
+            if scores[row, col] > self.score_threshold:
+                results[row] = (self.alias_degrees[col], float(scores[row, col]))
+        return results
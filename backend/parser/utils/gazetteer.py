@@ -0,0 +1,99 @@
+import os
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from rapidfuzz import fuzz, process
+from unidecode import unidecode
+
+
+def normalize_place(name: str) -> str:
+    return unidecode(name.lower()).strip()
+
+
+def load_gazetteer_file(path: str) -> List[Tuple[str, List[str]]]:
+    """
+    Read an external gazetteer: one place per line, aliases separated by '|'
+    (e.g. "Fès|Fez|Fes"). Blank lines and lines starting with '#' are skipped.
+    """
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            names = [n.strip() for n in line.split("|") if n.strip()]
+            entries.append((names[0], names[1:]))
+    return entries
+
+
+class CityGazetteer:
+    """
+    Normalized city names and aliases, indexed once.
+
+    Candidates are first looked up exactly in a hash index; only when none hits
+    are they scored against every name with batched rapidfuzz.process.cdist
+    calls, chunked so memory stays bounded for gazetteers of tens of thousands
+    of places. Below direct_max_pairs candidate x name comparisons (the config
+    cities against one CV), one process.extractOne per candidate is cheaper
+    than cdist's thread pool and score matrix.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, List[str]]],
+                 normalize: Callable[[str], str] = normalize_place, chunk_size: int = 64,
+                 direct_max_pairs: int = 50000):
+        self.normalize = normalize
+        self.chunk_size = chunk_size
+        self.direct_max_pairs = direct_max_pairs
+        self.index = {}
+        self.choices: List[str] = []
+        self.choice_cities: List[str] = []
+        for city, aliases in entries:
+            for name in (city, *aliases):
+                key = normalize(name)
+                if key and key not in self.index:
+                    self.index[key] = city
+                    self.choices.append(key)
+                    self.choice_cities.append(city)
+
+    def __len__(self):
+        return len(self.choices)
+
+    def match(self, candidates: List[str], score_threshold: float = 88, workers: int = -1) -> Optional[str]:
+        """Best city for already normalized candidates (earliest candidate wins ties)"""
+        for candidate in candidates:
+            city = self.index.get(candidate)
+            if city is not None:
+                return city
+        if not candidates or not self.choices:
+            return None
+
+        if len(candidates) * len(self.choices) <= self.direct_max_pairs:
+            best_score, best_city = 0, None
+            for candidate in candidates:
+                match = process.extractOne(candidate, self.choices, scorer=fuzz.WRatio,
+                                           score_cutoff=max(score_threshold, best_score + 1e-9))
+                if match is not None:
+                    best_score, best_city = match[1], self.choice_cities[match[2]]
+            return best_city
+
+        import numpy as np  # only needed on the fuzzy path, keeps importing extractors cheap
+
+        best_score, best_city = 0, None
+        for start in range(0, len(candidates), self.chunk_size):
+            chunk = candidates[start:start + self.chunk_size]
+            scores = process.cdist(chunk, self.choices, scorer=fuzz.WRatio,
+                                   score_cutoff=score_threshold, workers=workers)
+            row, col = np.unravel_index(scores.argmax(), scores.shape)
+            if scores[row, col] > best_score and scores[row, col] >= score_threshold:
+                best_score, best_city = scores[row, col], self.choice_cities[col]
+        return best_city
+
+
+def build_city_gazetteer(cities: List[str], aliases: dict, extra_path: Optional[str] = None) -> CityGazetteer:
+    """Config cities (lowercased, as stored in the database) plus an optional gazetteer file"""
+    entries = [
+        (city.lower(), [a.lower() for a in aliases.get(city, [])])
+        for city in cities
+    ]
+    if extra_path and os.path.exists(extra_path):
+        entries += [(city.lower(), [a.lower() for a in names]) for city, names in load_gazetteer_file(extra_path)]
+    return CityGazetteer(entries)
@@ -2,17 +2,19 @@ import re
 import sys
 import os
 import json
+import unicodedata
 from unidecode import unidecode
 from typing import List
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 #from layout_analyser import PyMuPDFLayoutAnalyzer
+from utils.section_index import SectionIndex
 
 
 
 class Helper:
-    def __init__(self):
-        self.config = self.load_config()
+    def __init__(self, config: dict = None):
+        self.config = config if config is not None else self.load_config()
         self.status_patterns = self.config.get('status_patterns', {})
         self.occupation_patterns = self.config.get('occupation_patterns', {})
         self.education_levels = self.config.get('education_levels', {})        
@@ -23,7 +25,8 @@ class Helper:
 
 
     
-    def load_config(self):
+    @staticmethod
+    def load_config():
         # Remonte jusqu’à `backend/` depuis ce fichier
         backend_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
         config_path = os.path.join(backend_root, 'parser', 'utils', 'constants', 'config.json')
@@ -53,6 +56,13 @@ class Helper:
         text = unidecode(text.lower().strip())
         text = re.sub(r'\s+', ' ', text)
         return text
+
+    def normalize_token(self, token: str) -> str:
+        """Clean, lowercase and normalize accents for consistent comparison"""
+        token = token.strip().lower()
+        token = unicodedata.normalize('NFKD', token)
+        token = ''.join([c for c in token if not unicodedata.combining(c)])
+        return token
     
 
     def detect_language(self, text: str) -> str:
@@ -94,15 +104,9 @@ class Helper:
         section_names_lower = [s.lower() for s in section_names]
         next_section_names_lower = [s.lower() for s in next_section_names]
 
-        # print("[Debug] Section start headers:", section_names)
-        # print("[Debug] Section stop headers:", next_section_names)
-
-
         for line in lines:
             line_clean = line.strip().lower()
 
-            # print(f"Line: '{line_clean}', In section: {is_in_section}")
-
             if not is_in_section:
                 # Start of section found
                 if any(sec in line_clean for sec in section_names_lower):
@@ -117,9 +121,18 @@ class Helper:
                 # Otherwise accumulate section lines
                 section_lines.append(line)
 
-        extracted_text = "\n".join(section_lines).strip()
-        # Debug print extracted section length and snippet
-        print(f"[DEBUG] Extracted section text (length {len(extracted_text)}):\n{extracted_text[:300]}")
-        return extracted_text
+        return "\n".join(section_lines).strip()
+
+    def build_section_index(self, text: str) -> SectionIndex:
+        """Experience, skills and education sections of a document, located in one pass"""
+        return SectionIndex(
+            text,
+            headers={
+                "experience": self.config.get("experience", []),
+                "skills": self.skills_headers,
+                "education": self.config.get("education_headers", []),
+            },
+            stop_headers=self.config.get("next_section", []),
+        )
 
 
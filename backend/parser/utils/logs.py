@@ -0,0 +1,73 @@
+import json
+import logging
+import os
+import sys
+import threading
+from typing import Any, Dict
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# DEBUG, INFO, WARNING or ERROR; CV content (text, extracted fields) is only logged at DEBUG
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# text (message then key=value pairs) or json (one object per line)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def _format_value(value: Any) -> str:
+    text = str(value)
+    return json.dumps(text, ensure_ascii=False) if not text or any(c in text for c in ' "=\n') else text
+
+
+class StructuredFormatter(logging.Formatter):
+    """One line per record: the message followed by its fields (see log_fields())"""
+
+    def __init__(self, json_lines: bool = False):
+        super().__init__()
+        self.json_lines = json_lines
+
+    def format(self, record: logging.LogRecord) -> str:
+        values: Dict[str, Any] = getattr(record, "fields", {})
+        if self.json_lines:
+            payload = {"time": self.formatTime(record), "level": record.levelname,
+                       "logger": record.name, "message": record.getMessage(), **values}
+            if record.exc_info:
+                payload["exception"] = self.formatException(record.exc_info)
+            return json.dumps(payload, ensure_ascii=False, default=str)
+
+        line = f"{self.formatTime(record)} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        if values:
+            line += " " + " ".join(f"{key}={_format_value(value)}" for key, value in values.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+def _configure():
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        root = logging.getLogger("cvparser")
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(StructuredFormatter(json_lines=LOG_FORMAT == "json"))
+        root.addHandler(handler)
+        root.setLevel(LOG_LEVEL)
+        root.propagate = False
+        _configured = True
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the "cvparser" hierarchy, level set by LOG_LEVEL"""
+    if not _configured:
+        _configure()
+    return logging.getLogger(f"cvparser.{name}")
+
+
+def log_fields(**values) -> Dict[str, Dict[str, Any]]:
+    """Structured fields of a record: logger.info("parsed", extra=log_fields(pages=3))"""
+    return {"fields": values}
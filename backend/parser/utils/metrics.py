@@ -0,0 +1,206 @@
+import atexit
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.logs import get_logger, log_fields
+
+load_dotenv()
+
+logger = get_logger("metrics")
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+METRICS_PATH = os.getenv(
+    "METRICS_PATH",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "metrics.sqlite3"))
+)
+# Recorded values are buffered in memory and written at most this often (and after every document)
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", 2))
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# name -> (type, help)
+METRICS = {
+    "cvparser_stage_seconds": ("histogram", "Duration of one parse pipeline stage for a document"),
+    "cvparser_parse_seconds": ("histogram", "End to end parse time of a document"),
+    "cvparser_documents_total": ("counter", "Documents parsed, by result (parsed, cached, partial, error)"),
+    "cvparser_pages_total": ("counter", "PDF pages parsed, by page kind (text, mixed, scanned)"),
+    "cvparser_ocr_total": ("counter", "Pages and image regions OCR'd, by target (page, region) and backend"),
+    "cvparser_cache_requests_total": ("counter", "Cache lookups, by cache (parse, ocr) and result (hit, miss)"),
+    "cvparser_db_query_seconds": ("histogram", "Duration of a MySQL query function"),
+    "cvparser_db_errors_total": ("counter", "MySQL query functions that failed"),
+    "cvparser_db_pool_wait_seconds": ("histogram", "Time spent getting a connection from the MySQL pool"),
+    "cvparser_db_pool_checkouts_total": ("counter",
+                                         "MySQL pool checkouts, by result (immediate, waited for a busy pool, "
+                                         "timeout, error)"),
+    "cvparser_db_pool_connections_total": ("counter",
+                                           "MySQL pool connection events (opened, closed, reconnected after "
+                                           "failing validation)"),
+    "cvparser_db_pool_size": ("gauge", "Connections the serving process's MySQL pool may open"),
+    "cvparser_db_pool_open_connections": ("gauge",
+                                          "Connections open in the serving process's MySQL pool, by state "
+                                          "(in_use, idle)"),
+}
+
+# Gauges are not stored: render() gets their current values, name -> [(labels, value)]
+Gauges = Dict[str, List[Tuple[Dict[str, str], float]]]
+
+# (name, labels as JSON, series) -> value; series is "" for counters, "le=<bound>", "sum" or "count" for histograms
+SeriesKey = Tuple[str, str, str]
+
+
+def _labels_key(labels: Dict[str, str]) -> str:
+    return json.dumps(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: List[Tuple[str, str]]) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}" if pairs else ""
+
+
+class MetricsRegistry:
+    """
+    Counters and latency histograms shared by every process on the host.
+
+    Each process adds to an in-memory buffer; buffered deltas are summed into
+    a SQLite file (like the parse cache counters) so the API process can expose
+    what the job and bulk ingest workers recorded. render() produces the
+    Prometheus text exposition format.
+    """
+
+    def __init__(self, path: str, enabled: bool = True, flush_seconds: float = METRICS_FLUSH_SECONDS):
+        self.path = path
+        self.enabled = enabled
+        self.flush_seconds = flush_seconds
+        self._pending: Dict[SeriesKey, float] = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._initialized = False
+        if enabled:
+            atexit.register(self.flush)
+            # A forked worker starts with the parent's buffer: drop it, the parent flushes it
+            os.register_at_fork(after_in_child=self._clear_pending)
+
+    def _clear_pending(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        if not self._initialized:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS metrics (
+                    name TEXT NOT NULL,
+                    labels TEXT NOT NULL,
+                    series TEXT NOT NULL,
+                    value REAL NOT NULL,
+                    PRIMARY KEY (name, labels, series)
+                )
+            """)
+            self._initialized = True
+        return db
+
+    def _add(self, key: SeriesKey, amount: float):
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0.0) + amount
+            due = time.monotonic() - self._last_flush >= self.flush_seconds
+        if due:
+            self.flush()
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        if self.enabled:
+            self._add((name, _labels_key(labels), ""), amount)
+
+    def observe(self, name: str, seconds: float, **labels):
+        if not self.enabled:
+            return
+        key = _labels_key(labels)
+        with self._lock:
+            for bound in LATENCY_BUCKETS:
+                if seconds <= bound:
+                    series = (name, key, f"le={bound}")
+                    self._pending[series] = self._pending.get(series, 0.0) + 1
+            for series, amount in (("sum", seconds), ("count", 1)):
+                self._pending[(name, key, series)] = self._pending.get((name, key, series), 0.0) + amount
+            due = time.monotonic() - self._last_flush >= self.flush_seconds
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Add the buffered values to the shared store"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending or not self.enabled:
+            return
+        try:
+            db = self._connect()
+            try:
+                db.execute("BEGIN IMMEDIATE")
+                db.executemany("""
+                    INSERT INTO metrics (name, labels, series, value) VALUES (?, ?, ?, ?)
+                    ON CONFLICT(name, labels, series) DO UPDATE SET value = value + excluded.value
+                """, [(name, labels, series, value) for (name, labels, series), value in pending.items()])
+                db.execute("COMMIT")
+            finally:
+                db.close()
+        except sqlite3.Error as e:
+            logger.warning("metrics flush failed", extra=log_fields(error=str(e), series=len(pending)))
+
+    def collect(self) -> Dict[SeriesKey, float]:
+        """Totals of every series over all processes"""
+        if not self.enabled:
+            return {}
+        self.flush()
+        db = self._connect()
+        try:
+            rows = db.execute("SELECT name, labels, series, value FROM metrics").fetchall()
+        finally:
+            db.close()
+        return {(name, labels, series): value for name, labels, series, value in rows}
+
+    def render(self, gauges: Optional[Gauges] = None) -> str:
+        """
+        All metrics in the Prometheus text exposition format (version 0.0.4),
+        with the gauge values of the calling process
+        """
+        values = self.collect()
+        by_name: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (name, labels, series), value in values.items():
+            by_name.setdefault(name, {}).setdefault(labels, {})[series] = value
+
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "gauge":
+                for labels, value in (gauges or {}).get(name, []):
+                    lines.append(f"{name}{_format_labels(sorted(labels.items()))} {value:g}")
+                continue
+            for labels, series in sorted(by_name.get(name, {}).items()):
+                pairs = [tuple(pair) for pair in json.loads(labels)]
+                if kind == "counter":
+                    lines.append(f"{name}{_format_labels(pairs)} {series.get('', 0):g}")
+                    continue
+                for bound in LATENCY_BUCKETS:
+                    count = series.get(f"le={bound}", 0)
+                    lines.append(f"{name}_bucket{_format_labels(pairs + [('le', str(bound))])} {count:g}")
+                lines.append(f"{name}_bucket{_format_labels(pairs + [('le', '+Inf')])} {series.get('count', 0):g}")
+                lines.append(f"{name}_sum{_format_labels(pairs)} {series.get('sum', 0):.6f}")
+                lines.append(f"{name}_count{_format_labels(pairs)} {series.get('count', 0):g}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry(METRICS_PATH, enabled=METRICS_ENABLED)
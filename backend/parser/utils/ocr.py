@@ -0,0 +1,297 @@
+import math
+import multiprocessing
+from abc import ABC, abstractmethod
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from utils.logs import get_logger, log_fields
+from utils.ocr_cache import get_ocr_cache, ocr_cache_key
+
+# PyMuPDF, PIL and pytesseract are imported where pages are rendered / OCR'd:
+# most documents never need OCR, and importing the analyzer stays cheap
+if TYPE_CHECKING:
+    from PIL import Image
+
+load_dotenv()
+
+logger = get_logger("ocr")
+
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", min(4, os.cpu_count() or 1)))
+OCR_MIN_DPI = int(os.getenv("OCR_MIN_DPI", 150))
+OCR_MAX_DPI = int(os.getenv("OCR_MAX_DPI", 300))
+# Pixel budget per page: an A4/Letter page at 300 dpi is ~8.7 MP
+OCR_MAX_PIXELS = int(os.getenv("OCR_MAX_PIXELS", 9_000_000))
+# rgb, gray or binary
+OCR_COLOR_MODE = os.getenv("OCR_COLOR_MODE", "gray")
+# auto (tesserocr when installed), tesserocr or pytesseract
+OCR_BACKEND = os.getenv("OCR_BACKEND", "auto")
+
+
+class OcrBackend(ABC):
+    """Turns a page image into text"""
+    name = "base"
+
+    @abstractmethod
+    def image_to_string(self, image: "Image.Image", lang: str) -> str:
+        ...
+
+
+class PytesseractBackend(OcrBackend):
+    """Runs the tesseract binary once per page (reloads the language data every time)"""
+    name = "pytesseract"
+
+    def image_to_string(self, image: "Image.Image", lang: str) -> str:
+        import pytesseract
+        return pytesseract.image_to_string(image, lang=lang)
+
+
+class TesserocrBackend(OcrBackend):
+    """
+    In-process Tesseract through tesserocr: one engine per thread and language,
+    loaded on first use and kept for the life of the worker, so the traineddata
+    is read once per worker instead of once per page.
+    """
+    name = "tesserocr"
+
+    def __init__(self):
+        import tesserocr
+        self._tesserocr = tesserocr
+        self._local = threading.local()
+
+    def _api(self, lang: str):
+        apis: Dict[str, object] = self._local.__dict__.setdefault("apis", {})
+        if lang not in apis:
+            apis[lang] = self._tesserocr.PyTessBaseAPI(lang=lang)
+        return apis[lang]
+
+    def image_to_string(self, image: "Image.Image", lang: str) -> str:
+        api = self._api(lang)
+        api.SetImage(image)
+        return api.GetUTF8Text()
+
+
+def make_ocr_backend(name: str = OCR_BACKEND) -> OcrBackend:
+    """The configured backend, falling back to pytesseract when tesserocr is unavailable"""
+    if name in ("auto", "tesserocr"):
+        try:
+            return TesserocrBackend()
+        except ImportError:
+            # tesserocr is in requirements.txt, but its wheel needs libtesseract at build time
+            logger.warning("tesserocr is not installed, OCR falls back to pytesseract "
+                           "(one tesseract process per page)", extra=log_fields(backend=name))
+    return PytesseractBackend()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_ocr_backend() -> OcrBackend:
+    """Backend of the current process (each pool worker builds and keeps its own)"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = make_ocr_backend()
+    return _backend
+
+
+@dataclass
+class OcrResult:
+    text: str
+    seconds: float  # render + recognition time of the page
+    backend: str
+    dpi: int
+
+
+def choose_dpi(page, min_dpi: int = OCR_MIN_DPI, max_dpi: int = OCR_MAX_DPI,
+               max_pixels: int = OCR_MAX_PIXELS) -> int:
+    """
+    Rendering resolution for one page: as high as max_dpi allows, lowered so
+    large pages stay within max_pixels, and never above the resolution of the
+    scanned image(s) on the page, since upsampling a scan adds no detail.
+    """
+    width_in, height_in = page.rect.width / 72, page.rect.height / 72
+    dpi = max_dpi
+    if width_in > 0 and height_in > 0:
+        dpi = min(dpi, int(math.sqrt(max_pixels / (width_in * height_in))))
+
+    scan_dpi = 0
+    for info in page.get_image_info():
+        x0, y0, x1, y1 = info["bbox"]
+        if x1 > x0 and info.get("width"):
+            scan_dpi = max(scan_dpi, int(info["width"] / ((x1 - x0) / 72)))
+    if scan_dpi:
+        dpi = min(dpi, scan_dpi)
+    return max(min_dpi, dpi)
+
+
+def region_dpi(bbox: Tuple[float, float, float, float], image_width: int,
+               min_dpi: int = OCR_MIN_DPI, max_dpi: int = OCR_MAX_DPI) -> int:
+    """Resolution for OCR'ing one embedded image: its own resolution, within [min_dpi, max_dpi]"""
+    width_in = (bbox[2] - bbox[0]) / 72
+    native = int(image_width / width_in) if width_in > 0 and image_width else max_dpi
+    return max(min_dpi, min(max_dpi, native))
+
+
+def _otsu_threshold(image: "Image.Image") -> int:
+    """Global threshold maximizing between-class variance of a grayscale histogram"""
+    histogram = image.histogram()
+    total = sum(histogram)
+    sum_all = sum(i * count for i, count in enumerate(histogram))
+    sum_background, weight_background = 0, 0
+    best_threshold, best_variance = 127, 0.0
+    for i, count in enumerate(histogram):
+        weight_background += count
+        if weight_background == 0:
+            continue
+        weight_foreground = total - weight_background
+        if weight_foreground == 0:
+            break
+        sum_background += i * count
+        mean_background = sum_background / weight_background
+        mean_foreground = (sum_all - sum_background) / weight_foreground
+        variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_threshold, best_variance = i, variance
+    return best_threshold
+
+
+def render_pixmap(page, dpi: int, mode: str = OCR_COLOR_MODE,
+                  clip: Optional[Tuple[float, float, float, float]] = None):
+    """Rasterize a page, or the clip region of it, in RGB or grayscale"""
+    import fitz  # PyMuPDF
+
+    colorspace = fitz.csRGB if mode == "rgb" else fitz.csGRAY
+    return page.get_pixmap(dpi=dpi, colorspace=colorspace, alpha=False,
+                           clip=fitz.Rect(clip) if clip is not None else None)
+
+
+def render_page(page, dpi: int, mode: str = OCR_COLOR_MODE,
+                clip: Optional[Tuple[float, float, float, float]] = None) -> "Image.Image":
+    """Rasterize a page (or the clip region of it) straight from the pixmap samples (no PNG encode/decode)"""
+    return pixmap_to_image(render_pixmap(page, dpi, mode, clip), mode)
+
+
+def pixmap_to_image(pix, mode: str = OCR_COLOR_MODE) -> "Image.Image":
+    from PIL import Image
+
+    pil_mode = "RGB" if mode == "rgb" else "L"
+    image = Image.frombuffer(pil_mode, (pix.width, pix.height), pix.samples, "raw", pil_mode, pix.stride, 1)
+    if mode == "binary":
+        threshold = _otsu_threshold(image)
+        image = image.point(lambda v: 255 if v > threshold else 0).convert("1")
+    return image
+
+
+def ocr_page(pdf_path: str, page_num: int, lang: str, dpi: Optional[int] = None,
+             mode: str = OCR_COLOR_MODE, clip: Optional[Tuple[float, float, float, float]] = None) -> OcrResult:
+    """
+    Render and OCR one page, or only its clip region. Runs in a pool worker: the
+    document is opened there, so only the path and page number cross the process boundary.
+    """
+    import fitz  # PyMuPDF
+
+    start = time.perf_counter()
+    with fitz.open(pdf_path) as doc:
+        page = doc.load_page(page_num)
+        dpi = dpi or choose_dpi(page)
+        pix = render_pixmap(page, dpi, mode, clip)
+
+    # Identical page images (templates, re-uploads) are only OCR'd once
+    cache = get_ocr_cache()
+    if cache is not None:
+        key = ocr_cache_key(pix.samples, pix.width, pix.height, dpi, mode, lang)
+        cached = cache.get(key)
+        if cached is not None:
+            cache.record_saved(len(pix.samples), cached["seconds"])
+            return OcrResult(text=cached["text"], seconds=time.perf_counter() - start, backend="cache", dpi=dpi)
+
+    image = pixmap_to_image(pix, mode)
+    backend = get_ocr_backend()
+    try:
+        text = backend.image_to_string(image, lang)
+    except RuntimeError as e:
+        # e.g. tesserocr cannot find the traineddata: keep OCR working through the CLI
+        if isinstance(backend, PytesseractBackend):
+            raise
+        logger.warning("OCR failed, using pytesseract", extra=log_fields(backend=backend.name, error=str(e)))
+        backend = PytesseractBackend()
+        text = backend.image_to_string(image, lang)
+    seconds = time.perf_counter() - start
+    if cache is not None:
+        cache.put(key, {"text": text, "seconds": seconds})
+    return OcrResult(text=text, seconds=seconds, backend=backend.name, dpi=dpi)
+
+
+class OcrPool:
+    """
+    Process pool OCR'ing pages in parallel, created on first use and reused.
+
+    Daemonic processes (the upload job workers) cannot have children; there the
+    pool falls back to threads, which still overlap since tesseract runs as a
+    subprocess outside the GIL. With a single worker pages are OCR'd inline.
+    """
+
+    def __init__(self, workers: int = OCR_WORKERS):
+        self.workers = max(1, workers)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if multiprocessing.current_process().daemon:
+                        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+                    else:
+                        # Long-lived workers: each keeps its OCR engine loaded between pages
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=get_ocr_backend)
+        return self._executor
+
+    def submit(self, pdf_path: str, page_num: int, lang: str, dpi: Optional[int] = None,
+               mode: str = OCR_COLOR_MODE, clip: Optional[Tuple[float, float, float, float]] = None
+               ) -> "Future[OcrResult]":
+        if self.workers == 1:
+            future = Future()
+            try:
+                future.set_result(ocr_page(pdf_path, page_num, lang, dpi, mode, clip))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return self._get_executor().submit(ocr_page, pdf_path, page_num, lang, dpi, mode, clip)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+_ocr_pool = None
+_ocr_pool_lock = threading.Lock()
+
+
+def get_ocr_pool() -> OcrPool:
+    """Process-wide OCR pool (OCR_WORKERS workers)"""
+    global _ocr_pool
+    if _ocr_pool is None:
+        with _ocr_pool_lock:
+            if _ocr_pool is None:
+                _ocr_pool = OcrPool()
+    return _ocr_pool
+
+
+def configure_ocr_pool(workers: int):
+    """Replace the process-wide pool, e.g. with 1 worker where documents already run in parallel"""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is not None:
+            _ocr_pool.shutdown()
+        _ocr_pool = OcrPool(workers)
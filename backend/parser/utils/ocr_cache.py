@@ -0,0 +1,70 @@
+import hashlib
+import os
+import sys
+import threading
+from typing import Dict, Optional
+from dotenv import load_dotenv
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.parse_cache import ParseCache
+
+load_dotenv()
+
+OCR_CACHE_ENABLED = os.getenv("OCR_CACHE_ENABLED", "1") == "1"
+OCR_CACHE_PATH = os.getenv(
+    "OCR_CACHE_PATH",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "ocr_cache.sqlite3"))
+)
+OCR_CACHE_MAX_MB = float(os.getenv("OCR_CACHE_MAX_MB", 64))
+OCR_CACHE_MEMORY_ENTRIES = int(os.getenv("OCR_CACHE_MEMORY_ENTRIES", 128))
+
+
+def ocr_cache_key(samples: bytes, width: int, height: int, dpi: int, mode: str, lang: str) -> str:
+    """Hash of the rendered pixels plus everything else that changes Tesseract's output"""
+    digest = hashlib.sha256(samples).hexdigest()
+    return f"{digest}:{width}x{height}:{dpi}:{mode}:{lang}"
+
+
+class OcrCache(ParseCache):
+    """
+    Recognized text per rendered page (or image region), in the same bounded
+    SQLite store as the parse cache, plus what the hits saved: image bytes
+    not sent to Tesseract and the OCR time recorded when the entry was made.
+    """
+
+    def record_saved(self, image_bytes: int, ocr_seconds: float):
+        self._count_later("bytes_saved", image_bytes)
+        self._count_later("ms_saved", int(ocr_seconds * 1000))
+
+    def stats(self) -> Dict[str, float]:
+        stats = super().stats()
+        db = self._connect()
+        try:
+            counters = dict(db.execute(
+                "SELECT name, value FROM counters WHERE name IN ('bytes_saved', 'ms_saved')"
+            ).fetchall())
+        finally:
+            db.close()
+        stats["bytes_saved"] = counters.get("bytes_saved", 0)
+        stats["seconds_saved"] = counters.get("ms_saved", 0) / 1000
+        return stats
+
+
+_ocr_cache = None
+_ocr_cache_lock = threading.Lock()
+
+
+def get_ocr_cache() -> Optional[OcrCache]:
+    """Process-wide OCR cache, or None when disabled with OCR_CACHE_ENABLED=0"""
+    global _ocr_cache
+    if not OCR_CACHE_ENABLED:
+        return None
+    if _ocr_cache is None:
+        with _ocr_cache_lock:
+            if _ocr_cache is None:
+                _ocr_cache = OcrCache(
+                    OCR_CACHE_PATH,
+                    max_bytes=int(OCR_CACHE_MAX_MB * 2**20),
+                    memory_entries=OCR_CACHE_MEMORY_ENTRIES,
+                )
+    return _ocr_cache
@@ -0,0 +1,245 @@
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from dotenv import load_dotenv
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.resources import get_config
+from utils.logs import get_logger, log_fields
+
+load_dotenv()
+
+logger = get_logger("parse_cache")
+
+PARSE_CACHE_ENABLED = os.getenv("PARSE_CACHE_ENABLED", "1") == "1"
+PARSE_CACHE_PATH = os.getenv(
+    "PARSE_CACHE_PATH",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "parse_cache.sqlite3"))
+)
+PARSE_CACHE_MAX_MB = float(os.getenv("PARSE_CACHE_MAX_MB", 256))
+PARSE_CACHE_MEMORY_ENTRIES = int(os.getenv("PARSE_CACHE_MEMORY_ENTRIES", 256))
+
+
+def hash_file(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def config_fingerprint(config: dict, version: str) -> str:
+    """Changes whenever the config or the parser version changes, invalidating old entries"""
+    payload = json.dumps(config, sort_keys=True, ensure_ascii=False) + "|" + str(version)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class ParseCache:
+    """
+    Two-tier cache of parse results keyed on the PDF content hash.
+
+    The front tier is a small in-process LRU; the back tier is a SQLite file
+    shared by every process on the host, bounded in bytes and evicted by
+    least recent access. Hit/miss counters are kept in the same file so they
+    cover all workers. Memory-tier hits never open the file: they are counted
+    in process and written with the next SQLite access, by stats() or at exit.
+    """
+
+    def __init__(self, path: str, max_bytes: int, memory_entries: int = 256):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Counter increments not yet written to the counters table
+        self._pending: Dict[str, int] = {}
+        self._init_db()
+        atexit.register(self.flush)
+        # A forked worker starts with the parent's counts: drop them, the parent writes them
+        os.register_at_fork(after_in_child=self._clear_pending)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _init_db(self):
+        db = self._connect()
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries (last_access)")
+            db.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        finally:
+            db.close()
+
+    def _count(self, db, name: str, amount: int = 1):
+        db.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount)
+        )
+
+    def _clear_pending(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def _count_later(self, name: str, amount: int = 1):
+        """Count without opening the file; written by the next _flush_pending"""
+        with self._lock:
+            self._pending[name] = self._pending.get(name, 0) + amount
+
+    def _flush_pending(self, db):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for name, amount in pending.items():
+            self._count(db, name, amount)
+
+    def flush(self):
+        """Write the counts buffered since the last SQLite access"""
+        if not self._pending:
+            return
+        db = self._connect()
+        try:
+            self._flush_pending(db)
+        except sqlite3.Error as e:
+            logger.warning("parse cache counters not written", extra=log_fields(error=str(e)))
+        finally:
+            db.close()
+
+    def _remember(self, key: str, payload: str):
+        with self._lock:
+            self._memory[key] = payload
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+                self._pending["memory_hits"] = self._pending.get("memory_hits", 0) + 1
+        if payload is not None:
+            return json.loads(payload)
+
+        db = self._connect()
+        try:
+            self._flush_pending(db)
+            row = db.execute("SELECT data FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._count(db, "misses")
+                return None
+            db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._count(db, "disk_hits")
+        finally:
+            db.close()
+
+        self._remember(key, row[0])
+        return json.loads(row[0])
+
+    def put(self, key: str, data: dict):
+        payload = json.dumps(data, ensure_ascii=False, default=str)
+        self._remember(key, payload)
+
+        db = self._connect()
+        try:
+            self._flush_pending(db)
+            db.execute("BEGIN IMMEDIATE")
+            db.execute(
+                "INSERT OR REPLACE INTO entries (key, data, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, payload, len(payload.encode("utf-8")), time.time())
+            )
+            self._evict(db)
+            db.execute("COMMIT")
+        except sqlite3.Error as e:
+            # BEGIN itself may have failed (database locked): there is nothing to roll back
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            logger.warning("parse cache write failed", extra=log_fields(error=str(e)))
+        finally:
+            db.close()
+
+    def _evict(self, db):
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used entries down to 90% of the budget
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        evicted = []
+        for key, size in db.execute("SELECT key, size FROM entries ORDER BY last_access"):
+            evicted.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        db.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        db.execute(
+            "INSERT INTO counters (name, value) VALUES ('evictions', ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (len(evicted),)
+        )
+
+    def stats(self) -> Dict[str, float]:
+        db = self._connect()
+        try:
+            self._flush_pending(db)
+            counters = dict(db.execute("SELECT name, value FROM counters").fetchall())
+            entries, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        finally:
+            db.close()
+        hits = counters.get("memory_hits", 0) + counters.get("disk_hits", 0)
+        lookups = hits + counters.get("misses", 0)
+        return {
+            "memory_hits": counters.get("memory_hits", 0),
+            "disk_hits": counters.get("disk_hits", 0),
+            "misses": counters.get("misses", 0),
+            "evictions": counters.get("evictions", 0),
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+        }
+
+
+_parse_cache = None
+_parse_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> Optional[ParseCache]:
+    """Process-wide cache instance, or None when disabled with PARSE_CACHE_ENABLED=0"""
+    global _parse_cache
+    if not PARSE_CACHE_ENABLED:
+        return None
+    if _parse_cache is None:
+        with _parse_cache_lock:
+            if _parse_cache is None:
+                _parse_cache = ParseCache(
+                    PARSE_CACHE_PATH,
+                    max_bytes=int(PARSE_CACHE_MAX_MB * 2**20),
+                    memory_entries=PARSE_CACHE_MEMORY_ENTRIES,
+                )
+    return _parse_cache
+
+
+_fingerprints: Dict[str, str] = {}
+
+
+def cache_key(pdf_path: str, version: str) -> str:
+    """SHA-256 of the PDF bytes plus the config/version fingerprint"""
+    fingerprint = _fingerprints.get(version)
+    if fingerprint is None:
+        fingerprint = _fingerprints[version] = config_fingerprint(get_config(), version)
+    return f"{hash_file(pdf_path)}:{fingerprint}"
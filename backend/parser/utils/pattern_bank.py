@@ -0,0 +1,139 @@
+import re
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+# Non-ASCII characters that re.IGNORECASE matches against an ASCII letter while
+# str.lower() maps them elsewhere; their presence disables the literal prefilter.
+_CASE_FOLD_EXCEPTIONS = frozenset("İıſ")  # İ ı ſ
+
+_MIN_LITERAL_LENGTH = 3
+
+# Escapes followed by a code (hex digits, a character name or octal digits)
+_ESCAPES_WITH_ARGUMENT = frozenset("xuUN")
+
+
+def required_literal(pattern: str) -> Optional[str]:
+    """
+    Longest lowercase ASCII substring that every match of pattern must contain,
+    or None when it cannot be determined safely (groups, alternations, short runs).
+    """
+    if any(c in pattern for c in "|()"):
+        return None
+
+    runs = []
+    current = ""
+    last_atom_in_current = False
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c in "*?{":
+            # The previous atom is optional: it cannot be part of a required run
+            if last_atom_in_current:
+                current = current[:-1]
+            runs.append(current)
+            current = ""
+            if c == "{":
+                close = pattern.find("}", i)
+                if close == -1:
+                    return None
+                i = close + 1
+            else:
+                i += 1
+            if i < len(pattern) and pattern[i] in "?+":  # lazy / possessive
+                i += 1
+            last_atom_in_current = False
+            continue
+        if c == "+":
+            # At least one occurrence: keep the atom but end the run
+            runs.append(current)
+            current = ""
+            i += 1
+            if i < len(pattern) and pattern[i] in "?+":
+                i += 1
+            last_atom_in_current = False
+            continue
+
+        literal = None
+        if c == "\\":
+            escaped = pattern[i + 1:i + 2]
+            if escaped in _ESCAPES_WITH_ARGUMENT or escaped.isdigit():
+                # \xNN, \uNNNN, \N{name}, octal: the characters after the letter are not literal text
+                return None
+            if escaped and not escaped.isalnum():
+                literal = escaped
+            i += 2
+        elif c == "[":
+            end = i + 1
+            if end < len(pattern) and pattern[end] == "^":
+                end += 1
+            if end < len(pattern) and pattern[end] == "]":
+                end += 1
+            while end < len(pattern) and pattern[end] != "]":
+                end += 2 if pattern[end] == "\\" else 1
+            i = end + 1
+        elif c in ".^$":
+            i += 1
+        else:
+            literal = c
+            i += 1
+
+        if literal is not None and literal.isascii():
+            current += literal.lower()
+            last_atom_in_current = True
+        else:
+            runs.append(current)
+            current = ""
+            last_atom_in_current = False
+    runs.append(current)
+
+    best = max(runs, key=len)
+    return best if len(best.strip()) >= _MIN_LITERAL_LENGTH else None
+
+
+class PatternBank:
+    """
+    A set of labelled regexes compiled once and scanned together.
+
+    Every pattern is compiled once and indexed by a literal it requires. A scan
+    lowercases the text once and uses plain substring checks to skip every
+    pattern whose literal is absent, so only the few patterns that can match
+    run the regex engine. Results are identical to running re.findall /
+    re.search with each pattern string.
+    """
+
+    def __init__(self, patterns: List[Tuple[Hashable, str]], flags=re.IGNORECASE):
+        self.labels = [label for label, _ in patterns]
+        self.compiled = [re.compile(pattern, flags) for _, pattern in patterns]
+        self.literals = [required_literal(pattern) for _, pattern in patterns]
+
+    def _candidates(self, text: str) -> List[int]:
+        """Indexes of the patterns that may match text, in pattern order"""
+        if _CASE_FOLD_EXCEPTIONS.intersection(text):
+            return list(range(len(self.compiled)))
+        lowered = text.lower()
+        present: Dict[str, bool] = {}
+        candidates = []
+        for i, literal in enumerate(self.literals):
+            if literal is not None:
+                if literal not in present:
+                    present[literal] = literal in lowered
+                if not present[literal]:
+                    continue
+            candidates.append(i)
+        return candidates
+
+    def findall(self, text: str) -> Dict[Hashable, List]:
+        """Matches per label, as re.findall(pattern, text) returns them, in pattern order"""
+        results: Dict[Hashable, List] = {}
+        for i in self._candidates(text):
+            found = self.compiled[i].findall(text)
+            if found:
+                results.setdefault(self.labels[i], []).extend(found)
+        return results
+
+    def search_labels(self, text: str) -> Set[Hashable]:
+        """Labels with at least one pattern matching somewhere in text (re.search semantics)"""
+        found: Set[Hashable] = set()
+        for i in self._candidates(text):
+            if self.labels[i] not in found and self.compiled[i].search(text):
+                found.add(self.labels[i])
+        return found
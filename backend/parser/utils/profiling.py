@@ -0,0 +1,93 @@
+import cProfile
+import json
+import os
+import pstats
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.logs import get_logger, log_fields
+from utils.parse_cache import hash_file
+
+load_dotenv()
+
+logger = get_logger("profiling")
+
+PROFILE_DIR = os.getenv(
+    "PROFILE_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "profiles"))
+)
+# Share of documents profiled without being asked for (0 disables sampling)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0))
+# Hot functions kept in the job result
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", 15))
+
+
+def profile_reason(requested: bool = False, sample_rate: float = PROFILE_SAMPLE_RATE) -> Optional[str]:
+    """"requested", "sampled" (with probability sample_rate) or None when the document is not profiled"""
+    if requested:
+        return "requested"
+    if sample_rate > 0 and random.random() < sample_rate:
+        return "sampled"
+    return None
+
+
+def _function_label(filename: str, line: int, name: str) -> str:
+    if filename == "~":  # built-in
+        return name
+    return f"{os.path.join(os.path.basename(os.path.dirname(filename)), os.path.basename(filename))}:{line}({name})"
+
+
+def top_functions(stats: pstats.Stats, n: int = PROFILE_TOP_N) -> List[Dict[str, Any]]:
+    """The n functions with the most self time, with their call count and cumulative time"""
+    rows = [
+        {
+            "function": _function_label(*func),
+            "calls": calls,
+            "self_seconds": round(self_time, 4),
+            "cumulative_seconds": round(cumulative, 4),
+        }
+        for func, (_, calls, self_time, cumulative, _) in stats.stats.items()
+    ]
+    rows.sort(key=lambda row: row["self_seconds"], reverse=True)
+    return rows[:n]
+
+
+def profile_call(func: Callable, *args, pdf_path: str, reason: str, top_n: int = PROFILE_TOP_N,
+                 **kwargs) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Run func(*args, **kwargs) under cProfile and save the profile as
+    PROFILE_DIR/<document hash>-<time>.pstats (readable by pstats, snakeviz,
+    flameprof or gprof2dot), plus a .json summary next to it.
+    Returns (func's result, summary); the profile is saved even when func raises.
+
+    Only the calling thread is profiled: OCR running in the pool shows up as
+    time spent waiting for its results.
+    """
+    document_hash = hash_file(pdf_path)
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        result = profiler.runcall(func, *args, **kwargs)
+    finally:
+        seconds = time.perf_counter() - start
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        base = os.path.join(PROFILE_DIR, f"{document_hash[:16]}-{int(time.time())}-{os.getpid()}")
+        profiler.dump_stats(base + ".pstats")
+        summary = {
+            "reason": reason,
+            "document_hash": document_hash,
+            "artifact": base + ".pstats",
+            "seconds": round(seconds, 3),
+            "top": top_functions(pstats.Stats(profiler), top_n),
+        }
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump({"pdf_path": pdf_path, **summary}, f, indent=2)
+        logger.info("profile saved", extra=log_fields(
+            file=pdf_path, reason=reason, seconds=summary["seconds"], artifact=summary["artifact"],
+            hottest=summary["top"][0]["function"] if summary["top"] else None))
+    return result, summary
@@ -0,0 +1,195 @@
+import os
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.helper import Helper
+from utils.logs import get_logger, log_fields
+
+# spaCy, numpy and rapidfuzz are imported by the loaders below, on first use:
+# importing this module (and every extractor) stays cheap
+if TYPE_CHECKING:
+    from utils.degree_matcher import DegreeMatcher
+    from utils.gazetteer import CityGazetteer
+    from utils.skill_matcher import SkillMatcher
+
+
+logger = get_logger("resources")
+
+SPACY_MODELS = {
+    "en": "en_core_web_sm",
+    "fr": "fr_core_news_sm",
+}
+# spaCy is only used for PERSON entities: everything but NER (and the tok2vec it
+# may listen to) is left out at load, which is faster to load and to run
+SPACY_EXCLUDE = ["tagger", "morphologizer", "parser", "attribute_ruler", "lemmatizer", "senter"]
+# Loaded by warm_up: what every parse needs. nlp_fr stays lazy, only French CVs load it
+WARM_UP = ["config", "helper", "lookups", "city_gazetteer", "degree_matcher", "skill_matcher", "nlp_en"]
+
+
+def _current_rss() -> int:
+    """Resident memory of the current process in bytes (0 if unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class ResourceRegistry:
+    """
+    Process-wide store for the heavy, read-only resources of the parser.
+
+    Each resource is loaded lazily on first access (or eagerly via warm_up),
+    exactly once per process, and then handed out by reference.
+    Load time and resident memory growth are recorded per resource.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Tuple[Callable[[], Any], Tuple[str, ...]]] = {}
+        self._resources: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, loader: Callable[[], Any], requires: Tuple[str, ...] = ()):
+        self._loaders[name] = (loader, requires)
+
+    def get(self, name: str) -> Any:
+        # Fast path: no locking once the resource exists
+        resource = self._resources.get(name)
+        if resource is not None:
+            return resource
+
+        with self._lock:
+            if name in self._resources:
+                return self._resources[name]
+            if name not in self._loaders:
+                raise KeyError(f"[ERROR] Unknown resource '{name}'.")
+
+            loader, requires = self._loaders[name]
+            # Load dependencies first so they are not counted in this resource's stats
+            for dependency in requires:
+                self.get(dependency)
+
+            rss_before = _current_rss()
+            start = time.perf_counter()
+            resource = loader()
+            load_time = time.perf_counter() - start
+            memory = max(_current_rss() - rss_before, 0)
+
+            self._stats[name] = {"load_time": load_time, "memory": memory}
+            self._resources[name] = resource
+            logger.debug("loaded resource", extra=log_fields(
+                resource=name, seconds=round(load_time, 3), memory_mb=round(memory / 2**20, 1)))
+            return resource
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._resources
+
+    def warm_up(self, names: List[str] = None):
+        """Eagerly load the given resources (all registered ones by default)"""
+        for name in names or list(self._loaders):
+            self.get(name)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": name, "load_time": s["load_time"], "memory": s["memory"]}
+            for name, s in self._stats.items()
+        ]
+
+    def report(self) -> str:
+        lines = [f"{'resource':<12} {'load (s)':>10} {'memory (MB)':>12}"]
+        for s in self.stats():
+            lines.append(f"{s['name']:<12} {s['load_time']:>10.3f} {s['memory'] / 2**20:>12.1f}")
+        return "\n".join(lines)
+
+
+def _build_lookups(helper: Helper) -> Dict[str, Any]:
+    """Tables derived from the config that extractors would otherwise rebuild per resume"""
+    config = helper.config
+    return {
+        "degree_aliases": {
+            degree: [helper.normalize_text(alias) for alias in aliases]
+            for degree, aliases in config.get("degree_aliases", {}).items()
+        },
+        "section_headers": [h.upper() for h in config.get("section_headers", [])],
+        "blacklist_headers": set(config.get("blacklist_headers", [])),
+    }
+
+
+def build_skill_matcher(helper: Helper, skills: List[str] = None) -> "SkillMatcher":
+    from utils.skill_matcher import SkillMatcher
+    return SkillMatcher(
+        helper.skills if skills is None else skills,
+        aliases=helper.config.get("skill_aliases", {}),
+        normalize=helper.normalize_token,
+    )
+
+
+def _build_city_gazetteer(helper: Helper) -> "CityGazetteer":
+    from utils.gazetteer import build_city_gazetteer
+    return build_city_gazetteer(
+        helper.cities,
+        helper.config.get("city_aliases", {}),
+        os.getenv("CITY_GAZETTEER_PATH"),  # optional extra places, see gazetteer.load_gazetteer_file
+    )
+
+
+def _build_degree_matcher(lookups: Dict[str, Any]) -> "DegreeMatcher":
+    from utils.degree_matcher import DegreeMatcher
+    return DegreeMatcher(lookups["degree_aliases"])
+
+
+def _load_spacy(model: str):
+    import spacy
+    return spacy.load(model, exclude=SPACY_EXCLUDE)
+
+
+registry = ResourceRegistry()
+registry.register("config", Helper.load_config)
+registry.register("helper", lambda: Helper(config=registry.get("config")), requires=("config",))
+registry.register("lookups", lambda: _build_lookups(registry.get("helper")), requires=("helper",))
+registry.register("city_gazetteer", lambda: _build_city_gazetteer(registry.get("helper")), requires=("helper",))
+registry.register("degree_matcher", lambda: _build_degree_matcher(registry.get("lookups")), requires=("lookups",))
+registry.register("skill_matcher", lambda: build_skill_matcher(registry.get("helper")), requires=("helper",))
+for _lang, _model in SPACY_MODELS.items():
+    registry.register(f"nlp_{_lang}", lambda model=_model: _load_spacy(model))
+
+
+def get_config() -> dict:
+    return registry.get("config")
+
+
+def get_helper() -> Helper:
+    return registry.get("helper")
+
+
+def get_lookups() -> Dict[str, Any]:
+    return registry.get("lookups")
+
+
+def get_city_gazetteer() -> "CityGazetteer":
+    return registry.get("city_gazetteer")
+
+
+def get_degree_matcher() -> "DegreeMatcher":
+    return registry.get("degree_matcher")
+
+
+def get_skill_matcher() -> "SkillMatcher":
+    return registry.get("skill_matcher")
+
+
+def get_nlp(lang: str = "en"):
+    return registry.get("nlp_fr" if lang == "fr" else "nlp_en")
+
+
+def warm_up():
+    registry.warm_up(WARM_UP)
+
+
+if __name__ == "__main__":
+    warm_up()
+    print(registry.report())
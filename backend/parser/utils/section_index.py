@@ -0,0 +1,42 @@
+from typing import Dict, List, Tuple
+
+
+class SectionIndex:
+    """
+    Section segmentation of one document, computed once and shared by the extractors.
+
+    Lines are lowercased once and tested once against every header list. A
+    section starts at the first line containing one of its headers and runs
+    until the next line containing a stop header (next_section), exactly like
+    Helper.extract_section. Sections may overlap (e.g. skills listed after
+    the experience header), so a line can belong to several of them.
+    """
+
+    def __init__(self, text: str, headers: Dict[str, List[str]], stop_headers: List[str]):
+        self.lines = text.splitlines()
+        lowered = [line.strip().lower() for line in self.lines]
+
+        stops = [s.lower() for s in stop_headers]
+        is_stop = [any(stop in line for stop in stops) for line in lowered]
+        # next_stop[i]: first stop line at or after i (len(lines) if none)
+        next_stop = [len(lowered)] * (len(lowered) + 1)
+        for i in range(len(lowered) - 1, -1, -1):
+            next_stop[i] = i if is_stop[i] else next_stop[i + 1]
+
+        # (first line, end line) of each section found, end exclusive
+        self.spans: Dict[str, Tuple[int, int]] = {}
+        for name, names in headers.items():
+            names = [n.lower() for n in names]
+            start = next((i for i, line in enumerate(lowered) if any(n in line for n in names)), None)
+            if start is not None:
+                # The header line itself is included even when it is also a stop header
+                self.spans[name] = (start, next_stop[start + 1])
+
+        self._texts: Dict[str, str] = {}
+
+    def get(self, name: str) -> str:
+        """Text of a section ('' when absent), same result as Helper.extract_section"""
+        if name not in self._texts:
+            span = self.spans.get(name)
+            self._texts[name] = "\n".join(self.lines[span[0]:span[1]]).strip() if span else ""
+        return self._texts[name]
@@ -0,0 +1,140 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from rapidfuzz import fuzz, process
+
+# Characters stripped around words; '+', '#' and inner dots belong to skill names (c++, c#, node.js)
+_WORD_STRIP = ".!?()[]{}\"'«»*"
+
+# Marks the end of a skill in the trie
+_END = ""
+
+
+def split_words(text: str) -> List[str]:
+    words = (w.strip(_WORD_STRIP) for w in text.split())
+    return [w for w in words if w]
+
+
+class SkillMatcher:
+    """
+    Two-phase skill matching engine built once from the skill taxonomy.
+
+    Exact phase: a word-level trie over normalized skill names and aliases finds
+    every (multi-word) skill occurring in a token, left to right, longest first.
+    Lookup cost depends on the token length, not on the taxonomy size.
+    Outside a skills section, a one-word skill only counts as a whole token (a
+    list item): in prose, common words such as "go", "word" or "access" are
+    not skills.
+
+    Fuzzy phase: tokens without any exact hit are scored against all skill names
+    in one batched rapidfuzz.process.cdist call (multithreaded), keeping for each
+    token the best skill above the threshold, like process.extractOne did.
+    Fuzzy outcomes are memoized per token, since headers and filler recur across CVs.
+    """
+
+    def __init__(self, skills: Iterable[str], aliases: Optional[Dict[str, List[str]]] = None,
+                 normalize: Callable[[str], str] = str.lower, fuzzy_cache_size: int = 50000):
+        self.normalize = normalize
+        self.fuzzy_cache_size = fuzzy_cache_size
+        self._fuzzy_cache: "OrderedDict[Tuple[str, float], Optional[str]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.trie: Dict = {}
+        self.max_words = 0
+
+        # Fuzzy choices: canonical skill names only, aliases are too short to fuzz safely
+        self.choices: List[str] = []
+        self.choice_skills: List[str] = []
+        seen = set()
+        for skill in skills:
+            name = normalize(skill)
+            if name not in seen:
+                seen.add(name)
+                self.choices.append(name)
+                self.choice_skills.append(skill)
+            self._add(name, skill)
+
+        for skill, skill_aliases in (aliases or {}).items():
+            for alias in skill_aliases:
+                self._add(normalize(alias), skill)
+
+    def _add(self, name: str, skill: str):
+        words = split_words(name)
+        if not words:
+            return
+        node = self.trie
+        for word in words:
+            node = node.setdefault(word, {})
+        node.setdefault(_END, skill)  # first skill registered for a name wins
+        self.max_words = max(self.max_words, len(words))
+
+    def find_exact(self, token: str, embedded_single_words: bool = True) -> List[str]:
+        """
+        Skills found in an already normalized token, longest match first, no overlaps.
+        With embedded_single_words False, a one-word skill must be the whole token.
+        """
+        words = split_words(token)
+        single_words = embedded_single_words or len(words) == 1
+        found = []
+        i = 0
+        while i < len(words):
+            node = self.trie
+            match, match_end = None, i
+            for j in range(i, min(len(words), i + self.max_words)):
+                node = node.get(words[j])
+                if node is None:
+                    break
+                if _END in node:
+                    match, match_end = node[_END], j + 1
+            if match is not None and (match_end - i > 1 or single_words):
+                found.append(match)
+                i = match_end
+            else:
+                i += 1
+        return found
+
+    def match_fuzzy(self, tokens: List[str], threshold: float = 85, workers: int = -1) -> Dict[str, str]:
+        """Best skill per token above threshold, unseen tokens scored in a single batched call"""
+        results: Dict[str, str] = {}
+        queries = []
+        with self._cache_lock:
+            for token in dict.fromkeys(t for t in tokens if t):
+                key = (token, threshold)
+                if key in self._fuzzy_cache:
+                    self._fuzzy_cache.move_to_end(key)
+                    if self._fuzzy_cache[key] is not None:
+                        results[token] = self._fuzzy_cache[key]
+                else:
+                    queries.append(token)
+        if not queries or not self.choices:
+            return results
+
+        scores = process.cdist(queries, self.choices, scorer=fuzz.WRatio,
+                               score_cutoff=threshold, workers=workers)
+        best = scores.argmax(axis=1)  # first best choice on ties, as extractOne
+        with self._cache_lock:
+            for row, query in enumerate(queries):
+                skill = self.choice_skills[best[row]] if scores[row, best[row]] >= threshold else None
+                if skill is not None:
+                    results[query] = skill
+                self._fuzzy_cache[(query, threshold)] = skill
+            while len(self._fuzzy_cache) > self.fuzzy_cache_size:
+                self._fuzzy_cache.popitem(last=False)
+        return results
+
+    def match(self, tokens: Iterable[str], threshold: float = 85, workers: int = -1,
+              embedded_single_words: bool = True) -> Set[str]:
+        """
+        All skills found in the normalized tokens: exact hits first, fuzzy for the rest.
+        Pass embedded_single_words=False for tokens that are not from a skills section.
+        """
+        found: Set[str] = set()
+        unmatched = []
+        for token in tokens:
+            exact = self.find_exact(token, embedded_single_words)
+            if exact:
+                found.update(exact)
+            else:
+                unmatched.append(token)
+        found.update(self.match_fuzzy(unmatched, threshold, workers).values())
+        return found
@@ -1,9 +1,10 @@
-from flask import Blueprint, jsonify, request, current_app, send_from_directory
+from flask import Blueprint, Response, jsonify, request, current_app, send_from_directory, stream_with_context
+from werkzeug.utils import secure_filename
+import json
 import sys
 import os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from parser.cv_parser import process_and_store_resume
 from models.resume import (
     get_all_resumes,
     get_resume_by_id,
@@ -11,15 +12,51 @@ from models.resume import (
     get_resumes_by_name,
     add_resume,
     delete_resume,
-    apply_filters
+    apply_filters,
+    get_skill_names,
+    decode_cursor,
+    parse_fields,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE
 )
+from models.filters import ResumeFilters
+from models.db import get_pool
+from models.jobs import enqueue_job, get_job, new_job_id
+from utils.metrics import metrics
+# parser.cv_parser (PyMuPDF, spaCy, OCR) is imported inside the routes that parse,
+# so importing the API stays fast
 
 resume_bp = Blueprint("resume", __name__, url_prefix="/resumes")
+metrics_bp = Blueprint("metrics", __name__)
+
+
+def _page_args():
+    """
+    limit, after, fields and include_total from ?limit=&cursor=&fields=&include_total=1.
+    Raises ValueError on invalid values.
+    """
+    try:
+        limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("'limit' must be an integer")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"'limit' must be between 1 and {MAX_PAGE_SIZE}")
+    cursor = request.args.get("cursor")
+    return {
+        "limit": limit,
+        "after": decode_cursor(cursor) if cursor else None,
+        "fields": parse_fields(request.args.get("fields")),
+        "include_total": request.args.get("include_total") == "1",
+    }
 
 
 @resume_bp.route("/", methods=["GET"])
 def get_all():
-    result = get_all_resumes()
+    try:
+        page = _page_args()
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    result = get_all_resumes(**page)
     return jsonify(result), 200 if result["status"] == "success" else 404
 
 
@@ -68,19 +105,58 @@ def delete(resume_id):
     return jsonify(result), 200
 
 
+def _list_arg(name):
+    """Values of a repeated or comma-separated query param: ?city=Rabat&city=Fès or ?city=Rabat,Fès"""
+    return [value.strip() for arg in request.args.getlist(name) for value in arg.split(",") if value.strip()]
+
+
+def _int_arg(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"'{name}' must be an integer")
+
+
 @resume_bp.route("/filter", methods=["GET"])
 def filter_resumes():
-    keyword = request.args.get("keyword")
-    city = request.args.get("city")
-    degree = request.args.get("degree")
-    skill = request.args.get("skill") 
-    min_exp = request.args.get("min_exp")
-
-    result = apply_filters(keyword, city, degree, skill, min_exp)
+    try:
+        page = _page_args()
+        skill_ids = _list_arg("skill_id")
+        if not all(skill_id.isdigit() for skill_id in skill_ids):
+            raise ValueError("'skill_id' must be an integer")
+        filters = ResumeFilters(
+            keyword=request.args.get("keyword"),
+            cities=_list_arg("city"),
+            degree=request.args.get("degree"),
+            degree_levels=_list_arg("degree_level"),
+            skills=_list_arg("skill"),
+            skill_ids=[int(skill_id) for skill_id in skill_ids],
+            skill_mode=request.args.get("skill_mode", "all"),
+            min_exp=_int_arg("min_exp"),
+            max_exp=_int_arg("max_exp"),
+        )
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    result = apply_filters(filters, **page)
     status = 200 if result["status"] == "success" else 404
     return jsonify(result), status
 
 
+@resume_bp.route("/skills", methods=["GET"])
+def list_skills():
+    try:
+        limit = min(int(request.args.get("limit", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"status": "error", "message": "'limit' must be an integer"}), 400
+    result = get_skill_names(request.args.get("q"), limit)
+    status = 200 if result["status"] == "success" else 500
+    return jsonify(result), status
+
+
 @resume_bp.route("/upload", methods=["POST"])
 def upload_resume():
     if 'file' not in request.files:
@@ -90,19 +166,87 @@ def upload_resume():
     if file.filename == '':
         return jsonify({"status": "error", "message": "No selected file"}), 400
 
-    # Save file temporarily
-    upload_path = os.path.join(current_app.config['UPLOAD_FOLDER'], file.filename)
+    stream = request.args.get("stream") == "1"
+    if stream:
+        from parser.cv_parser import check_required_fields
+        try:
+            required = check_required_fields(f for f in request.args.get("required", "").split(",") if f)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+    # Parsing runs later in a worker: each upload gets its own file, named after its job,
+    # so two uploads of "cv.pdf" don't overwrite each other
+    job_id = new_job_id()
+    upload_path = os.path.join(current_app.config['UPLOAD_FOLDER'],
+                               f"{job_id}_{secure_filename(file.filename) or 'upload.pdf'}")
     file.save(upload_path)
 
-    # Process and store resume
+    # ?stream=1: parse in this request and send page results as NDJSON, one event per line
+    if stream:
+        return Response(stream_with_context(_ndjson_events(upload_path, required)),
+                        mimetype="application/x-ndjson")
+
+    # Parsing happens in the background workers, poll /resumes/jobs/<job_id> for the result.
+    # ?profile=1 or X-Profile: 1 runs it under the profiler (see utils/profiling.py)
+    profile = request.args.get("profile") == "1" or request.headers.get("X-Profile") == "1"
+    result = enqueue_job(upload_path, profile=profile, job_id=job_id)
+    if result["status"] != "success":
+        os.remove(upload_path)
+    if result["status"] == "queue_full":
+        return jsonify(result), 503
+    status = 202 if result["status"] == "success" else 500
+    return jsonify(result), status
+
+
+def _ndjson_events(pdf_path, required_fields):
+    from parser.cv_parser import stream_process_and_store_resume
     try:
-        data = process_and_store_resume(upload_path)
-        #os.remove(upload_path)
-        return jsonify({"status": "success", "data": data}), 201
+        for event in stream_process_and_store_resume(pdf_path, required_fields):
+            yield json.dumps(event, ensure_ascii=False, default=str) + "\n"
     except Exception as e:
-        return jsonify({"status": "error", "message": str(e)}), 500
+        yield json.dumps({"event": "error", "message": str(e)}) + "\n"
+
+
+@resume_bp.route("/jobs/<job_id>", methods=["GET"])
+def get_upload_job(job_id):
+    result = get_job(job_id)
+    status = 200 if result["status"] == "success" else 404
+    return jsonify(result), status
+
+@resume_bp.route("/cache/stats", methods=["GET"])
+def get_parse_cache_stats():
+    from parser.cv_parser import parse_cache_stats
+    stats = parse_cache_stats()
+    if stats is None:
+        return jsonify({"status": "error", "message": "Parse cache is disabled"}), 404
+    return jsonify({"status": "success", "data": stats}), 200
+
+@resume_bp.route("/cache/ocr/stats", methods=["GET"])
+def get_ocr_cache_stats():
+    from parser.cv_parser import ocr_cache_stats
+    stats = ocr_cache_stats()
+    if stats is None:
+        return jsonify({"status": "error", "message": "OCR cache is disabled"}), 404
+    return jsonify({"status": "success", "data": stats}), 200
 
 # Serve the pdf folder as static files 
 @resume_bp.route("/pdfs/<path:filename>", methods=["GET"])
 def serve_pdf(filename):
-    return send_from_directory('pdfs', filename)
\ No newline at end of file
+    return send_from_directory('pdfs', filename)
+
+
+def _pool_gauges():
+    """Current state of this process's MySQL pool; the workers' pools are not visible from here"""
+    status = get_pool().status()
+    return {
+        "cvparser_db_pool_size": [({}, status["size"])],
+        "cvparser_db_pool_open_connections": [({"state": state}, status[state]) for state in ("in_use", "idle")],
+    }
+
+
+# Parse pipeline, cache and MySQL metrics of every process, for Prometheus
+@metrics_bp.route("/metrics", methods=["GET"])
+def get_metrics():
+    if not metrics.enabled:
+        return jsonify({"status": "error", "message": "Metrics are disabled"}), 404
+    return Response(metrics.render(gauges=_pool_gauges()), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Same flat imports as the app: backend/ for models and routes, backend/parser for utils.*
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(BACKEND)
+sys.path.append(os.path.join(BACKEND, 'parser'))
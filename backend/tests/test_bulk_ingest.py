@@ -0,0 +1,46 @@
+import json
+import os
+
+
+def _no_warm_up(verbose):
+    pass
+
+
+def _parse_or_crash(path, profile=False, profile_sample=0.0):
+    if os.path.basename(path).startswith("crash"):
+        os._exit(3)  # a worker killed by a segfault or the OOM killer
+    return path, {"pdf_path": path}, None, {"total": 0.01}, None
+
+
+def test_crashed_worker_fails_its_documents_and_the_run_goes_on(tmp_path):
+    from bulk_ingest import WORKER_CRASHED, BulkIngest, load_state
+    # One worker takes 4 documents at a time, in file order: the crash takes down the first 4
+    names = ["crash.pdf", "cv1.pdf", "cv2.pdf", "cv3.pdf", "cv4.pdf", "cv5.pdf", "cv6.pdf"]
+    for name in names:
+        (tmp_path / name).write_bytes(b"%PDF")
+    state_path = str(tmp_path / "state.jsonl")
+
+    ingest = BulkIngest(str(tmp_path), state_path, workers=1, batch_size=2, store=False,
+                        target=_parse_or_crash, initializer=_no_warm_up)
+    stats = ingest.run()
+
+    assert (stats.parsed, stats.failed) == (3, 4)
+    state = {os.path.basename(entry["path"]): entry for entry in load_state(state_path).values()}
+    assert {name: entry["status"] for name, entry in state.items()} == {
+        "crash.pdf": "failed", "cv1.pdf": "failed", "cv2.pdf": "failed", "cv3.pdf": "failed",
+        "cv4.pdf": "done", "cv5.pdf": "done", "cv6.pdf": "done",
+    }
+    assert all(state[name]["error"] == WORKER_CRASHED for name in names[:4])
+    with open(state_path, encoding="utf-8") as f:
+        assert len([json.loads(line) for line in f]) == len(names)
+
+
+def test_files_that_crashed_are_skipped_unless_retried(tmp_path):
+    from bulk_ingest import BulkIngest
+    (tmp_path / "crash.pdf").write_bytes(b"%PDF")
+    state_path = str(tmp_path / "state.jsonl")
+    options = dict(workers=1, batch_size=1, store=False, target=_parse_or_crash, initializer=_no_warm_up)
+
+    assert BulkIngest(str(tmp_path), state_path, **options).run().failed == 1
+    assert BulkIngest(str(tmp_path), state_path, **options).run().skipped == 1
+    assert BulkIngest(str(tmp_path), state_path, retry_failed=True, **options).run().failed == 1
@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+
+def _crash(poll_interval):
+    os._exit(3)  # a worker killed by a segfault or the OOM killer
+
+
+@pytest.fixture
+def jobs(tmp_path, monkeypatch):
+    import models.jobs
+    monkeypatch.setattr(models.jobs, "JOB_DB_PATH", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(models.jobs, "_initialized", False)
+    return models.jobs
+
+
+def test_dead_worker_is_replaced_and_its_job_requeued_then_failed(jobs):
+    from job_worker import JobWorkerPool
+    pool = JobWorkerPool(workers=1, target=_crash, supervise_interval=3600)
+    pool.start()
+    try:
+        job_id = jobs.enqueue_job("cv.pdf")["data"]["job_id"]
+        for attempt in range(1, jobs.JOB_MAX_ATTEMPTS + 1):
+            dead = pool.processes[0]
+            dead.join(10)
+            assert jobs.claim_next_job(worker=dead.pid)["id"] == job_id
+            pool.supervise_once()
+            assert pool.processes[0] is not dead
+            job = jobs.get_job(job_id)["data"]
+            assert job["attempts"] == attempt
+            assert job["state"] == (jobs.FAILED if attempt == jobs.JOB_MAX_ATTEMPTS else jobs.QUEUED)
+        assert "Worker process died" in job["error"]
+    finally:
+        pool.stop()
+
+
+def test_stale_jobs_are_requeued(jobs):
+    job_id = jobs.enqueue_job("cv.pdf")["data"]["job_id"]
+    jobs.claim_next_job(worker=1)
+    assert jobs.requeue_stale_jobs(timeout=-1) == (1, 0)
+    assert jobs.get_job(job_id)["data"]["state"] == jobs.QUEUED
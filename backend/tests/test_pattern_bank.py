@@ -0,0 +1,35 @@
+import re
+
+import pytest
+
+from utils.pattern_bank import PatternBank, required_literal
+
+PATTERNS = [
+    ("hex", r"\x41bcdef"),           # "Abcdef": the literal is not "41bcdef"
+    ("unicode", r"\u00e9cole normale"),
+    ("named", r"\N{LATIN SMALL LETTER E WITH ACUTE}tudiant"),
+    ("octal", r"\101gent"),
+    ("plain", r"software engineer"),
+]
+TEXTS = ["Abcdef Ltd", "École Normale Supérieure", "étudiant en master", "Agent commercial", "Software Engineer"]
+
+
+@pytest.mark.parametrize("pattern", [pattern for _, pattern in PATTERNS[:4]])
+def test_escapes_with_an_argument_disable_the_prefilter(pattern):
+    assert required_literal(pattern) is None
+
+
+def test_required_literal_of_plain_pattern():
+    assert required_literal(r"software\s+engineer") == "software"
+
+
+def test_findall_matches_re_for_escaped_patterns():
+    bank = PatternBank(PATTERNS)
+    for text in TEXTS:
+        expected = {}
+        for label, pattern in PATTERNS:
+            found = re.findall(pattern, text, re.IGNORECASE)
+            if found:
+                expected.setdefault(label, []).extend(found)
+        assert bank.findall(text) == expected
+        assert expected
@@ -0,0 +1,28 @@
+from skills_experience_extraction import extract_skills
+from utils.skill_matcher import SkillMatcher
+
+AMBIGUOUS = ["Go", "Word", "Access", "Excel", "Windows"]
+PROSE = ("I would like to go home and read a word about access to the windows.\n"
+         "Every day I go to work and open windows for some fresh air.")
+
+
+def test_single_word_skills_are_not_taken_from_prose():
+    assert extract_skills(PROSE) == []
+
+
+def test_single_word_skills_in_a_list_without_skills_section():
+    text = "Python, Excel, Go\n- Windows\nI go home early."
+    assert extract_skills(text) == ["excel", "go", "python", "windows"]
+
+
+def test_skills_section_accepts_embedded_single_words():
+    text = "SKILLS\nDaily use of Excel and Word\n\nEDUCATION\nMaster"
+    assert {"excel", "word"} <= set(extract_skills(text))
+
+
+def test_matcher_keeps_multi_word_skills_in_prose():
+    matcher = SkillMatcher(AMBIGUOUS + ["Machine Learning"])
+    assert matcher.match(["we go further with machine learning"], embedded_single_words=False) == {"Machine Learning"}
+    assert matcher.find_exact("go to word", embedded_single_words=False) == []
+    assert matcher.find_exact("go", embedded_single_words=False) == ["Go"]
+    assert matcher.find_exact("go to word") == ["Go", "Word"]
@@ -0,0 +1,64 @@
+import io
+import os
+
+import pytest
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    import app as app_module
+    import models.jobs
+    from app import app
+    monkeypatch.setattr(app_module, "_started", True)  # no MySQL nor job workers here
+    monkeypatch.setattr(models.jobs, "JOB_DB_PATH", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(models.jobs, "_initialized", False)
+    monkeypatch.setitem(app.config, "UPLOAD_FOLDER", str(tmp_path))
+    return app.test_client()
+
+
+def _upload(client, content):
+    return client.post("/resumes/upload", data={"file": (io.BytesIO(content), "cv.pdf")},
+                       content_type="multipart/form-data")
+
+
+def test_uploads_with_the_same_name_keep_their_own_file(client):
+    from models.jobs import get_job
+    first, second = _upload(client, b"%PDF first"), _upload(client, b"%PDF second")
+    assert first.status_code == second.status_code == 202
+
+    paths = [get_job(r.get_json()["data"]["job_id"])["data"]["pdf_path"] for r in (first, second)]
+    assert paths[0] != paths[1]
+    assert [open(p, "rb").read() for p in paths] == [b"%PDF first", b"%PDF second"]
+    assert all(os.path.basename(p).endswith("_cv.pdf") for p in paths)
+
+
+def test_streaming_rejects_fields_it_never_fills(client, tmp_path):
+    response = client.post("/resumes/upload?stream=1&required=email,city",
+                           data={"file": (io.BytesIO(b"%PDF"), "cv.pdf")}, content_type="multipart/form-data")
+    assert response.status_code == 400
+    assert "city" in response.get_json()["message"]
+    assert not list(tmp_path.glob("*.pdf"))
+
+
+def test_stream_parse_pdf_checks_required_fields_before_parsing():
+    from parser.cv_parser import INCREMENTAL_FIELDS, stream_parse_pdf
+    with pytest.raises(ValueError, match="degrees"):
+        stream_parse_pdf("missing.pdf", required_fields=["degrees"])
+    stream_parse_pdf("missing.pdf", required_fields=INCREMENTAL_FIELDS)  # nothing runs until iterated
+
+
+def test_metrics_exposes_the_pool_gauges(client, tmp_path, monkeypatch):
+    import models.db
+    import routes.router
+    from utils.metrics import MetricsRegistry
+    monkeypatch.setattr(routes.router, "metrics", MetricsRegistry(str(tmp_path / "metrics.sqlite3")))
+    pool = models.db.ConnectionPool(size=3, connect=lambda: None)
+    pool._open, pool._in_use = 2, 1
+    pool._idle.append(models.db._Slot(None))
+    monkeypatch.setattr(models.db, "_pool", pool)
+
+    body = client.get("/metrics").get_data(as_text=True)
+    assert "# TYPE cvparser_db_pool_size gauge" in body
+    assert "\ncvparser_db_pool_size 3\n" in body
+    assert 'cvparser_db_pool_open_connections{state="in_use"} 1\n' in body
+    assert 'cvparser_db_pool_open_connections{state="idle"} 1\n' in body
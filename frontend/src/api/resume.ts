@@ -3,11 +3,34 @@ import type { Resume } from '../types/resume';
 
 const API_BASE = import.meta.env.VITE_API_BASE;
 
-export async function fetchAllResumes(): Promise<Resume[]> {
-  const res = await fetch(`${API_BASE}/resumes/`);
+export interface PageOptions {
+  cursor?: string | null;
+  limit?: number;
+  fields?: (keyof Resume)[];
+  includeTotal?: boolean;
+}
+
+export interface ResumePage {
+  resumes: Resume[];
+  nextCursor: string | null;
+  total?: number;
+}
+
+function appendPageParams(params: URLSearchParams, page: PageOptions) {
+  if (page.cursor) params.append('cursor', page.cursor);
+  if (page.limit !== undefined) params.append('limit', String(page.limit));
+  if (page.fields) params.append('fields', page.fields.join(','));
+  if (page.includeTotal) params.append('include_total', '1');
+}
+
+// Lists are paginated: pass the previous page's nextCursor to get the next one
+export async function fetchResumePage(page: PageOptions = {}): Promise<ResumePage> {
+  const params = new URLSearchParams();
+  appendPageParams(params, page);
+  const res = await fetch(`${API_BASE}/resumes/?${params.toString()}`);
   const data = await res.json();
   if (data.status !== 'success') throw new Error(data.message);
-  return data.data;
+  return { resumes: data.data, nextCursor: data.next_cursor, total: data.total };
 }
 
 export async function fetchResumeById(id: number): Promise<Resume> {
@@ -50,27 +73,37 @@ export async function deleteResume(id: number): Promise<void> {
   if (data.status !== 'success') throw new Error(data.message);
 }
 
+// Lists are alternatives (any of these cities), except skills with skill_mode 'all' (every skill)
 export interface FilterOptions {
   keyword?: string;
-  city?: string;
+  city?: string | string[];
   degree?: string;
-  skill?: string;
+  degree_level?: string | string[];
+  skill?: string | string[];
+  skill_mode?: 'all' | 'any';
   min_exp?: number;
+  max_exp?: number;
 }
 
-export async function filterResumes(options: FilterOptions): Promise<Resume[]> {
+export async function filterResumes(options: FilterOptions, page: PageOptions = {}): Promise<ResumePage> {
   const params = new URLSearchParams();
+  const appendAll = (name: string, value?: string | string[]) =>
+    [value ?? []].flat().filter(Boolean).forEach(v => params.append(name, v));
   if (options.keyword) params.append('keyword', options.keyword);
-  if (options.city) params.append('city', options.city);
+  appendAll('city', options.city);
   if (options.degree) params.append('degree', options.degree);
-  if (options.skill) params.append('skill', options.skill);
+  appendAll('degree_level', options.degree_level);
+  appendAll('skill', options.skill);
+  if (options.skill_mode) params.append('skill_mode', options.skill_mode);
   if (options.min_exp !== undefined) params.append('min_exp', String(options.min_exp));
+  if (options.max_exp !== undefined) params.append('max_exp', String(options.max_exp));
+  appendPageParams(params, page);
 
   const res = await fetch(`${API_BASE}/resumes/filter?${params.toString()}`);
   const data = await res.json();
   console.log('[Debug] Filter response:', data);
   if (data.status !== 'success') throw new Error(data.message);
-  return data.data;
+  return { resumes: data.data, nextCursor: data.next_cursor, total: data.total };
 }
 
 export async function uploadResume(file: File): Promise<Resume> {
@@ -84,7 +117,35 @@ export async function uploadResume(file: File): Promise<Resume> {
 
   const data = await res.json();
   if (data.status !== 'success') throw new Error(data.message);
-  return data.data;
+  return waitForUploadJob(data.data.job_id);
+}
+
+// Uploads are parsed in the background: poll the job until it is done or failed,
+// giving up after maxWaitMs (no worker running, or a queue too deep to wait for)
+const UPLOAD_JOB_MAX_WAIT_MS = 5 * 60 * 1000;
+
+async function waitForUploadJob(
+  jobId: string,
+  intervalMs = 1000,
+  maxWaitMs = UPLOAD_JOB_MAX_WAIT_MS,
+): Promise<Resume> {
+  const deadline = Date.now() + maxWaitMs;
+  for (;;) {
+    const res = await fetch(`${API_BASE}/resumes/jobs/${encodeURIComponent(jobId)}`);
+    const data = await res.json();
+    if (data.status !== 'success') throw new Error(data.message);
+
+    const job = data.data;
+    if (job.state === 'done') return job.result;
+    if (job.state === 'failed') throw new Error(job.error);
+    if (Date.now() >= deadline) {
+      throw new Error(
+        `The resume is still ${job.state} after ${Math.round(maxWaitMs / 1000)}s; ` +
+          `check that the job workers are running (job ${jobId})`,
+      );
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
 }
 
 export function getPdfUrl(pdfFilename: string): string {
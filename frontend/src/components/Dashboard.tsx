@@ -1,6 +1,6 @@
 // Dashboard.tsx
 import { useEffect, useState } from 'react';
-import { fetchAllResumes, filterResumes } from '../api/resume';
+import { fetchResumePage, filterResumes } from '../api/resume';
 import type { Resume} from '../types/resume';
 import type{ FilterOptions } from '../api/resume';
 import ResumeCard from './ResumeCard';
@@ -10,36 +10,65 @@ import FilterBar from './FilterBar';
 const Dashboard = () => {
   const [resumes, setResumes] = useState<Resume[]>([]);
   const [allResumes, setAllResumes] = useState<Resume[]>([]);
+  // Pages are loaded on demand: the cursor of the next page of the current list and the totals
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [filters, setFilters] = useState<FilterOptions | null>(null);
+  const [total, setTotal] = useState(0);
+  const [filteredTotal, setFilteredTotal] = useState(0);
 
   useEffect(() => {
-    fetchAllResumes().then(data => {
-      setResumes(data);
-      setAllResumes(data);
+    fetchResumePage({ includeTotal: true }).then(page => {
+      setResumes(page.resumes);
+      setAllResumes(page.resumes);
+      setNextCursor(page.nextCursor);
+      setTotal(page.total ?? page.resumes.length);
+      setFilteredTotal(page.total ?? page.resumes.length);
     }).catch(console.error);
   }, []);
 
-  const handleFilter = async (filters: FilterOptions) => {
+  const handleFilter = async (options: FilterOptions) => {
     try {
-      const filtered = await filterResumes(filters);
-      setResumes(filtered);
+      const page = await filterResumes(options, { includeTotal: true });
+      setResumes(page.resumes);
+      setNextCursor(page.nextCursor);
+      setFilters(options);
+      setFilteredTotal(page.total ?? page.resumes.length);
     } catch (err) {
       console.error('Filter error:', err);
     }
   };
 
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    try {
+      const page = filters
+        ? await filterResumes(filters, { cursor: nextCursor })
+        : await fetchResumePage({ cursor: nextCursor });
+      setResumes(prev => [...prev, ...page.resumes]);
+      if (!filters) setAllResumes(prev => [...prev, ...page.resumes]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.error('Load more error:', err);
+    }
+  };
+
   const handleAddResume = (newResume: Resume) => {
     setResumes(prev => [newResume, ...prev]);
     setAllResumes(prev => [newResume, ...prev]);
+    setTotal(prev => prev + 1);
+    setFilteredTotal(prev => prev + 1);
   };
 
   const handleDeleteResume = (id: number) => {
     setResumes(prev => prev.filter(r => r.id !== id));
     setAllResumes(prev => prev.filter(r => r.id !== id));
+    setTotal(prev => prev - 1);
+    setFilteredTotal(prev => prev - 1);
   };
 
-  // Calculate stats
-  const totalResumes = allResumes.length;
-  const filteredCount = resumes.length;
+  // Calculate stats (cities and skills over the pages loaded so far)
+  const totalResumes = total;
+  const filteredCount = filteredTotal;
   const uniqueCities = new Set(allResumes.map(r => r.city).filter(Boolean)).size;
   const uniqueSkills = new Set(allResumes.flatMap(r => r.skills || [])).size;
 
@@ -73,6 +102,17 @@ const Dashboard = () => {
           <ResumeCard key={resume.id} resume={resume} onDelete={handleDeleteResume} />
         ))}
       </div>
+
+      {nextCursor && (
+        <div className="flex justify-center">
+          <button
+            onClick={handleLoadMore}
+            className="px-4 py-2 rounded-lg border border-blue-200 bg-blue-50 text-blue-700 hover:bg-blue-100"
+          >
+            Load more ({resumes.length} of {filteredCount})
+          </button>
+        </div>
+      )}
     </div>
   );
 };